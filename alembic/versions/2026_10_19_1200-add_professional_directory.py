@@ -0,0 +1,112 @@
+"""Add professional_directory read model
+
+Revision ID: c4d8e2f1a7b9
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f1a7b9'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mesmo cálculo de app.crud.directory.build_refresh_statement, congelado nesta revisão
+BACKFILL = """
+INSERT INTO professional_directory (
+    profile_id, user_id, name, email, phone, cep, uf, city, address, profile_image_url,
+    bio, category, profissional_identification, services, price, only_online,
+    only_presential, rating, num_reviews, available_days_of_week, start_hour, end_hour,
+    weekday_mask, tags, updated_at
+)
+SELECT
+    p.id, p.user_id, u.name, u.email, u.phone, u.cep, u.uf, u.city, u.address,
+    u.profile_image_url, p.bio, p.category, p.profissional_identification, p.services,
+    p.price, p.only_online, p.only_presential, p.rating, p.num_reviews,
+    p.available_days_of_week, p.start_hour, p.end_hour,
+    (
+        SELECT coalesce(sum(1 << (d.n::int - 1)), 0)::smallint
+        FROM unnest(ARRAY['monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+                          'saturday', 'sunday']) WITH ORDINALITY AS d(day, n)
+        WHERE strpos(
+            ',' || lower(replace(coalesce(p.available_days_of_week, ''), ' ', '')) || ',',
+            ',' || d.day || ','
+        ) > 0
+    ),
+    ARRAY(SELECT t.name FROM profile_tags t WHERE t.profile_id = p.id ORDER BY t.id),
+    greatest(p.updated_at, u.updated_at)
+FROM professional_profiles p
+JOIN users u ON u.id = p.user_id
+"""
+
+
+def _has_pg_trgm() -> bool:
+    bind = op.get_bind()
+    return bool(
+        bind.execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table('professional_directory',
+    sa.Column('profile_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('cep', sa.String(length=10), nullable=True),
+    sa.Column('uf', sa.String(length=2), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('address', sa.String(length=255), nullable=True),
+    sa.Column('profile_image_url', sa.String(length=500), nullable=True),
+    sa.Column('bio', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('profissional_identification', sa.String(length=50), nullable=False),
+    sa.Column('services', sa.Text(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('only_online', sa.Boolean(), nullable=False),
+    sa.Column('only_presential', sa.Boolean(), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('num_reviews', sa.Integer(), nullable=False),
+    sa.Column('available_days_of_week', sa.Text(), nullable=True),
+    sa.Column('start_hour', sa.String(length=5), nullable=True),
+    sa.Column('end_hour', sa.String(length=5), nullable=True),
+    sa.Column('weekday_mask', sa.SmallInteger(), nullable=False),
+    sa.Column('tags', postgresql.ARRAY(sa.String(length=50)), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['profile_id'], ['professional_profiles.id'], name=op.f('fk_professional_directory_profile_id_professional_profiles'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('profile_id', name=op.f('pk_professional_directory'))
+    )
+    op.create_index(op.f('ix_professional_directory_category'), 'professional_directory', ['category'], unique=False)
+    op.create_index(op.f('ix_professional_directory_user_id'), 'professional_directory', ['user_id'], unique=False)
+
+    # Um único índice GIN para tags e busca por nome; sem pg_trgm, só as tags
+    if _has_pg_trgm():
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            'CREATE INDEX ix_professional_directory_search ON professional_directory '
+            'USING gin (tags, name gin_trgm_ops)'
+        )
+    else:
+        op.create_index('ix_professional_directory_search', 'professional_directory', ['tags'], unique=False, postgresql_using='gin')
+
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_professional_directory_search', table_name='professional_directory')
+    op.drop_index(op.f('ix_professional_directory_user_id'), table_name='professional_directory')
+    op.drop_index(op.f('ix_professional_directory_category'), table_name='professional_directory')
+    op.drop_table('professional_directory')
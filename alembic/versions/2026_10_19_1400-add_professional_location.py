@@ -0,0 +1,71 @@
+"""Add geocoded location to users and professional_directory
+
+Revision ID: d7e1f0a9b3c2
+Revises: c4d8e2f1a7b9
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.cep_geo import prefix_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e1f0a9b3c2'
+down_revision: Union[str, None] = 'c4d8e2f1a7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Grade de 0.25 grau (1440 colunas), igual a app.utils.cep_geo.geo_cell
+BACKFILL_DIRECTORY = """
+UPDATE professional_directory AS d
+SET latitude = u.latitude,
+    longitude = u.longitude,
+    geo_cell = floor((u.latitude + 90) / 0.25)::int * 1440
+             + floor((u.longitude + 180) / 0.25)::int
+FROM users AS u
+WHERE u.id = d.user_id AND u.latitude IS NOT NULL
+"""
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.add_column('users', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('users', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('professional_directory', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('professional_directory', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('professional_directory', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_professional_directory_geo_cell'), 'professional_directory', ['geo_cell'], unique=False)
+
+    # Geocodifica os CEPs existentes com a tabela de prefixos embarcada
+    size, rows = prefix_table()
+    prefixes = sa.values(
+        sa.column('prefix', sa.String),
+        sa.column('latitude', sa.Float),
+        sa.column('longitude', sa.Float),
+        name='cep_prefixes',
+    ).data(rows)
+    users = sa.table(
+        'users', sa.column('cep', sa.String), sa.column('latitude', sa.Float), sa.column('longitude', sa.Float)
+    )
+    digits = sa.func.regexp_replace(sa.func.coalesce(users.c.cep, ''), r'\D', '', 'g')
+    op.execute(
+        users.update()
+        .values(latitude=prefixes.c.latitude, longitude=prefixes.c.longitude)
+        .where(sa.func.length(digits) == 8, sa.func.left(digits, size) == prefixes.c.prefix)
+    )
+    op.execute(BACKFILL_DIRECTORY)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index(op.f('ix_professional_directory_geo_cell'), table_name='professional_directory')
+    op.drop_column('professional_directory', 'geo_cell')
+    op.drop_column('professional_directory', 'longitude')
+    op.drop_column('professional_directory', 'latitude')
+    op.drop_column('users', 'longitude')
+    op.drop_column('users', 'latitude')
@@ -0,0 +1,122 @@
+"""Add tag dictionary and tag_ids to professional_directory
+
+Revision ID: e2b6c9d4f8a1
+Revises: d7e1f0a9b3c2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.validators import normalize_tag
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6c9d4f8a1'
+down_revision: Union[str, None] = 'd7e1f0a9b3c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_DIRECTORY = """
+UPDATE professional_directory AS d
+SET tag_ids = ARRAY(
+    SELECT t.tag_id FROM profile_tags t WHERE t.profile_id = d.profile_id ORDER BY t.id
+)
+"""
+
+
+def _has_pg_trgm() -> bool:
+    bind = op.get_bind()
+    return bool(
+        bind.execute(
+            sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    tags = op.create_table('tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('normalized', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_tags'))
+    )
+    op.create_index(op.f('ix_tags_normalized'), 'tags', ['normalized'], unique=True)
+    op.add_column('profile_tags', sa.Column('tag_id', sa.Integer(), nullable=True))
+
+    # Dicionário a partir dos nomes existentes (primeira grafia de cada forma normalizada)
+    bind = op.get_bind()
+    names = bind.execute(
+        sa.text('SELECT name FROM profile_tags GROUP BY name ORDER BY min(id)')
+    ).scalars().all()
+    dictionary: dict[str, str] = {}
+    for name in names:
+        dictionary.setdefault(normalize_tag(name), name.strip())
+    dictionary.pop('', None)
+
+    if dictionary:
+        op.bulk_insert(
+            tags,
+            [
+                {'id': tag_id, 'name': name, 'normalized': normalized}
+                for tag_id, (normalized, name) in enumerate(dictionary.items(), start=1)
+            ],
+        )
+        op.execute(
+            sa.text("SELECT setval(pg_get_serial_sequence('tags', 'id'), :last)").bindparams(
+                last=len(dictionary)
+            )
+        )
+        ids = {normalized: tag_id for tag_id, normalized in enumerate(dictionary, start=1)}
+        mapping = sa.values(
+            sa.column('name', sa.String), sa.column('tag_id', sa.Integer), name='tag_mapping'
+        ).data([(name, ids[normalize_tag(name)]) for name in names if normalize_tag(name)])
+        profile_tags = sa.table('profile_tags', sa.column('name', sa.String), sa.column('tag_id', sa.Integer))
+        op.execute(
+            profile_tags.update()
+            .values(tag_id=mapping.c.tag_id)
+            .where(profile_tags.c.name == mapping.c.name)
+        )
+
+    # Tags sem nome útil (só espaços) não têm entrada no dicionário
+    op.execute('DELETE FROM profile_tags WHERE tag_id IS NULL')
+    op.alter_column('profile_tags', 'tag_id', nullable=False)
+    op.create_index(op.f('ix_profile_tags_tag_id'), 'profile_tags', ['tag_id'], unique=False)
+    op.create_foreign_key(op.f('fk_profile_tags_tag_id_tags'), 'profile_tags', 'tags', ['tag_id'], ['id'])
+
+    # O índice de busca passa a cobrir os ids das tags
+    op.drop_index('ix_professional_directory_search', table_name='professional_directory')
+    op.add_column('professional_directory', sa.Column('tag_ids', postgresql.ARRAY(sa.Integer()), server_default='{}', nullable=False))
+    op.alter_column('professional_directory', 'tag_ids', server_default=None)
+    op.execute(BACKFILL_DIRECTORY)
+    if _has_pg_trgm():
+        op.execute(
+            'CREATE INDEX ix_professional_directory_search ON professional_directory '
+            'USING gin (tag_ids, name gin_trgm_ops)'
+        )
+    else:
+        op.create_index('ix_professional_directory_search', 'professional_directory', ['tag_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_professional_directory_search', table_name='professional_directory')
+    op.drop_column('professional_directory', 'tag_ids')
+    if _has_pg_trgm():
+        op.execute(
+            'CREATE INDEX ix_professional_directory_search ON professional_directory '
+            'USING gin (tags, name gin_trgm_ops)'
+        )
+    else:
+        op.create_index('ix_professional_directory_search', 'professional_directory', ['tags'], unique=False, postgresql_using='gin')
+
+    op.drop_constraint(op.f('fk_profile_tags_tag_id_tags'), 'profile_tags', type_='foreignkey')
+    op.drop_index(op.f('ix_profile_tags_tag_id'), table_name='profile_tags')
+    op.drop_column('profile_tags', 'tag_id')
+    op.drop_index(op.f('ix_tags_normalized'), table_name='tags')
+    op.drop_table('tags')
@@ -0,0 +1,48 @@
+"""Add jobs outbox table
+
+Revision ID: f3a7d2c8e5b4
+Revises: e2b6c9d4f8a1
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7d2c8e5b4'
+down_revision: Union[str, None] = 'e2b6c9d4f8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=True),
+    sa.Column('key', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_jobs'))
+    )
+    op.create_index('ix_jobs_queue', 'jobs', ['run_at'], unique=False, postgresql_where=sa.text("status IN ('pending', 'running')"))
+    op.create_index('uq_jobs_pending_key', 'jobs', ['key'], unique=True, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('uq_jobs_pending_key', table_name='jobs', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index('ix_jobs_queue', table_name='jobs', postgresql_where=sa.text("status IN ('pending', 'running')"))
+    op.drop_table('jobs')
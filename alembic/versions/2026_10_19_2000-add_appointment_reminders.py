@@ -0,0 +1,37 @@
+"""Add reminder state to appointments
+
+Revision ID: a8c3e6f1d2b7
+Revises: f3a7d2c8e5b4
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c3e6f1d2b7'
+down_revision: Union[str, None] = 'f3a7d2c8e5b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.add_column('appointments', sa.Column('reminder_status', sa.String(length=20), nullable=True))
+    op.add_column('appointments', sa.Column('reminder_sent_at', sa.DateTime(), nullable=True))
+    # Consultas que já começaram não recebem lembrete retroativo
+    op.execute(
+        "UPDATE appointments SET reminder_status = 'skipped' "
+        "WHERE start_time <= localtimestamp AND status IN ('pending', 'confirmed')"
+    )
+    op.create_index('ix_appointments_reminder_due', 'appointments', ['start_time'], unique=False, postgresql_where=sa.text("status IN ('pending', 'confirmed') AND reminder_status IS NULL"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_appointments_reminder_due', table_name='appointments', postgresql_where=sa.text("status IN ('pending', 'confirmed') AND reminder_status IS NULL"))
+    op.drop_column('appointments', 'reminder_sent_at')
+    op.drop_column('appointments', 'reminder_status')
@@ -0,0 +1,31 @@
+"""Add partial index for closing past appointments
+
+Revision ID: b5d9f2a6c1e8
+Revises: a8c3e6f1d2b7
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d9f2a6c1e8'
+down_revision: Union[str, None] = 'a8c3e6f1d2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # As consultas já vencidas são encerradas pelo AppointmentTransitionScheduler, em lotes
+    op.create_index('ix_appointments_open_end_time', 'appointments', ['end_time'], unique=False, postgresql_where=sa.text("status IN ('pending', 'confirmed')"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    # Consultas expiradas voltam a ficar pendentes, único status anterior possível
+    op.execute("UPDATE appointments SET status = 'pending' WHERE status = 'expired'")
+    op.drop_index('ix_appointments_open_end_time', table_name='appointments', postgresql_where=sa.text("status IN ('pending', 'confirmed')"))
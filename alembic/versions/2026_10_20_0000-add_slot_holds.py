@@ -0,0 +1,44 @@
+"""Add unlogged slot_holds table
+
+Revision ID: c7e2a9d4f6b1
+Revises: b5d9f2a6c1e8
+Create Date: 2026-10-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9d4f6b1'
+down_revision: Union[str, None] = 'b5d9f2a6c1e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table('slot_holds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(length=64), nullable=False),
+    sa.Column('professional_id', sa.Integer(), nullable=False),
+    sa.Column('patient_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['users.id'], name=op.f('fk_slot_holds_patient_id_users'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['professional_id'], ['professional_profiles.id'], name=op.f('fk_slot_holds_professional_id_professional_profiles'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_slot_holds')),
+    sa.UniqueConstraint('token', name=op.f('uq_slot_holds_token')),
+    prefixes=['UNLOGGED']
+    )
+    op.create_index('ix_slot_holds_professional_start', 'slot_holds', ['professional_id', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_slot_holds_professional_start', table_name='slot_holds')
+    op.drop_table('slot_holds')
@@ -5,7 +5,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_readonly_db
 from app.core.security import decode_access_token
 from app.crud.user import user_crud
 from app.models.user import User
@@ -13,10 +13,7 @@ from app.models.user import User
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+async def _authenticate(credentials: HTTPAuthorizationCredentials, db: AsyncSession) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -41,4 +38,20 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    return await _authenticate(credentials, db)
+
+
+async def get_current_user_readonly(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+) -> User:
+    """Usuário carregado pela sessão somente leitura, para rotas ``GET``."""
+    return await _authenticate(credentials, db)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
+ReadOnlyUser = Annotated[User, Depends(get_current_user_readonly)]
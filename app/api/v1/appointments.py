@@ -1,21 +1,34 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import CurrentUser
-from app.core.database import get_db
+from app.api.deps import CurrentUser, ReadOnlyUser
+from app.core.config import settings
+from app.core.database import SessionRoute, get_db, get_readonly_db
 from app.models.enums import Role
 from app.schemas.appointment import (
     AppointmentCreate,
     AppointmentResponse,
+    AppointmentSeriesCreate,
+    AppointmentSeriesResponse,
     AppointmentUpdate,
+    SlotHoldCreate,
+    SlotHoldResponse,
 )
 from app.services import appointment as appointment_service
+from app.services import calendar as calendar_service
 from app.services import professional as professional_service
 from app.utils.exceptions import ForbiddenException
+from app.utils.http_cache import (
+    conditional_response,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from app.utils.responses import fast_json_response
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 @router.post("/", response_model=AppointmentResponse, status_code=201)
@@ -47,45 +60,173 @@ async def create_appointment(
     )
 
 
+@router.post("/recurring", response_model=AppointmentSeriesResponse, status_code=201)
+async def create_appointment_series(
+    series_in: AppointmentSeriesCreate,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Book a recurring series (e.g. weekly sessions) in a single transaction.
+
+    With skip_conflicts=false the whole series is rejected when any occurrence
+    conflicts; with skip_conflicts=true the free occurrences are booked and the
+    conflicting ones are reported in `conflicts`.
+    """
+    if current_user.role != Role.PATIENT:
+        raise ForbiddenException("Only patients can create appointments")
+
+    appointments, conflicts = await appointment_service.create_appointment_series(
+        db, current_user.id, series_in
+    )
+
+    return AppointmentSeriesResponse(
+        created=[
+            AppointmentResponse(
+                id=appointment.id,
+                patient_id=appointment.patient_id,
+                patient_name=current_user.name,
+                patient_image_url=current_user.profile_image_url,
+                professional_id=appointment.professional_id,
+                professional_name=None,
+                professional_image_url=None,
+                start_time=appointment.start_time,
+                end_time=appointment.end_time,
+                status=appointment.status,
+                created_at=appointment.created_at,
+                updated_at=appointment.updated_at,
+            )
+            for appointment in appointments
+        ],
+        conflicts=conflicts,
+    )
+
+
+@router.post("/hold", response_model=SlotHoldResponse, status_code=201)
+async def hold_slot(
+    hold_in: SlotHoldCreate,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Reserve a slot for a few minutes while the patient completes the booking.
+
+    The slot disappears from available-slots for other patients until the hold
+    expires. Send the returned token as `hold_token` in `POST /` to confirm it.
+    Holding another slot with the same professional replaces the previous hold.
+    """
+    if current_user.role != Role.PATIENT:
+        raise ForbiddenException("Only patients can hold slots")
+
+    hold = await appointment_service.hold_slot(db, current_user.id, hold_in)
+    return SlotHoldResponse(
+        **hold._mapping, ttl_seconds=settings.slot_hold_ttl_seconds
+    )
+
+
+@router.delete("/hold/{token}", status_code=204)
+async def release_hold(
+    token: str,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Release a slot hold before it expires."""
+    await appointment_service.release_hold(db, current_user.id, token)
+
+
 @router.get("/my-appointments", response_model=list[AppointmentResponse])
 @router.get("/my", response_model=list[AppointmentResponse])
 async def get_my_appointments(
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
 ):
     if current_user.role == Role.PATIENT:
-        return await appointment_service.get_patient_appointments(
+        validator = await appointment_service.get_appointments_validator(
+            db, patient_id=current_user.id, skip=skip, limit=limit
+        )
+        if not_modified := conditional_response(request, response, validator):
+            return not_modified
+
+        appointments = await appointment_service.get_patient_appointments(
             db, current_user.id, skip=skip, limit=limit
         )
+        return fast_json_response(appointments, response=response)
 
     profile = await professional_service.get_professional_profile_by_user(
         db, current_user.id
     )
-    return await appointment_service.get_professional_appointments(
+    validator = await appointment_service.get_appointments_validator(
+        db, professional_id=profile.id, skip=skip, limit=limit
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
+    appointments = await appointment_service.get_professional_appointments(
         db, profile.id, skip=skip, limit=limit
     )
+    return fast_json_response(appointments, response=response)
+
+
+@router.get("/my/calendar.ics", response_class=Response)
+async def get_my_calendar(
+    request: Request,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+):
+    """
+    iCalendar feed with the current user's appointments.
+
+    Supports If-None-Match/If-Modified-Since: unchanged calendars are answered
+    with 304 from an aggregate query, without building the feed.
+    """
+    owner: dict[str, int] = {"patient_id": current_user.id}
+    if current_user.role != Role.PATIENT:
+        profile = await professional_service.get_professional_profile_by_user(
+            db, current_user.id
+        )
+        owner = {"professional_id": profile.id}
+
+    validator = await calendar_service.get_calendar_validator(db, **owner)
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+
+    body = await calendar_service.build_calendar(db, **owner)
+    return Response(
+        content=body,
+        media_type="text/calendar",
+        headers=validator_headers(validator),
+    )
 
 
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
 async def get_appointment(
     appointment_id: int,
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
 ):
-    appointment = await appointment_service.get_appointment(db, appointment_id)
+    version = await appointment_service.get_appointment_version(db, appointment_id)
 
     if current_user.role == Role.PATIENT:
-        if appointment.patient_id != current_user.id:
+        if version.patient_id != current_user.id:
             raise ForbiddenException("Not authorized to view this appointment")
     else:
         profile = await professional_service.get_professional_profile_by_user(
             db, current_user.id
         )
-        if appointment.professional_id != profile.id:
+        if version.professional_id != profile.id:
             raise ForbiddenException("Not authorized to view this appointment")
 
+    validator = appointment_service.get_appointment_validator(version)
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
+    appointment = await appointment_service.get_appointment(db, appointment_id)
     return AppointmentResponse(
         id=appointment.id,
         patient_id=appointment.patient_id,
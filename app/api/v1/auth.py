@@ -1,16 +1,19 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Form
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.deps import CurrentUser, security
+from app.core.database import SessionRoute, get_db, get_readonly_db
+from app.core.security import public_jwks
 from app.models.enums import Role
 from app.schemas.auth import LoginResponse
 from app.schemas.user import UserCreate, UserResponse
 from app.services import auth as auth_service
 from app.services import user as user_service
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 @router.post("/register", response_model=UserResponse, status_code=201)
@@ -53,6 +56,25 @@ async def register(
 async def login(
     email: Annotated[str, Form()],
     password: Annotated[str, Form()],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
 ):
     return await auth_service.login(db, email, password)
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    current_user: CurrentUser,
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Revogar o token usado na requisição até ele expirar."""
+    await auth_service.logout(db, credentials.credentials)
+
+
+@router.get("/jwks")
+async def jwks():
+    """
+    Chave pública dos tokens (JWKS) para outros serviços verificarem sem consultar
+    a API. Vazia com algoritmos HMAC (``HS256``), cujo segredo não é publicado.
+    """
+    return public_jwks()
@@ -1,26 +1,31 @@
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import CurrentUser
-from app.core.database import get_db
-from app.models.enums import Role
+from app.api.deps import CurrentUser, ReadOnlyUser
+from app.core.database import SessionRoute, get_db, get_read_db, get_readonly_db
+from app.models.enums import Role, TagMatch
 from app.schemas.appointment import AppointmentResponse
 from app.schemas.professional import (
     AvailableSlotsResponse,
+    ProfessionalFacetsResponse,
     ProfessionalProfileCreate,
     ProfessionalProfileResponse,
     ProfessionalProfileUpdate,
+    ProfessionalSearchResponse,
 )
 from app.schemas.review import ReviewList, ReviewResponse, ReviewStats
 from app.services import appointment as appointment_service
 from app.services import professional as professional_service
 from app.services.review import review_service
 from app.utils.exceptions import ForbiddenException
+from app.utils.http_cache import conditional_response
+from app.utils.responses import fast_json_response
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 @router.post("/", response_model=ProfessionalProfileResponse, status_code=201)
@@ -36,71 +41,35 @@ async def create_professional_profile(
         db, current_user.id, profile_in
     )
 
-    return ProfessionalProfileResponse(
-        id=profile.id,
-        profile_image_url=profile.user.profile_image_url if profile.user else None,
-        user_id=profile.user_id,
-        bio=profile.bio,
-        category=profile.category,
-        profissional_identification=profile.profissional_identification,
-        services=profile.services,
-        price=profile.price,
-        only_online=profile.only_online,
-        only_presential=profile.only_presential,
-        rating=profile.rating,
-        num_reviews=profile.num_reviews,
-        available_days_of_week=profile.available_days_of_week,
-        start_hour=profile.start_hour,
-        end_hour=profile.end_hour,
-        user_name=current_user.name,
-        email=current_user.email,
-        phone=current_user.phone,
-        cep=current_user.cep,
-        uf=current_user.uf,
-        city=current_user.city,
-        address=current_user.address,
-        tags=[],
-        unavailable_dates=[],
+    return fast_json_response(
+        professional_service.build_profile_payload(
+            profile, user=current_user, tags=profile_in.tags or []
+        ),
+        status_code=201,
     )
 
 
 @router.get("/me", response_model=ProfessionalProfileResponse)
 async def get_my_professional_profile(
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
 ):
     if current_user.role != Role.PROFESSIONAL:
         raise ForbiddenException("Only professionals have profiles")
 
+    validator = await professional_service.get_profile_validator(db, user_id=current_user.id)
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     profile = await professional_service.get_professional_profile_by_user(
         db, current_user.id
     )
 
-    return ProfessionalProfileResponse(
-        id=profile.id,
-        user_id=profile.user_id,
-        bio=profile.bio,
-        category=profile.category,
-        profissional_identification=profile.profissional_identification,
-        services=profile.services,
-        price=profile.price,
-        only_online=profile.only_online,
-        only_presential=profile.only_presential,
-        rating=profile.rating,
-        num_reviews=profile.num_reviews,
-        available_days_of_week=profile.available_days_of_week,
-        start_hour=profile.start_hour,
-        end_hour=profile.end_hour,
-        user_name=profile.user.name if profile.user else None,
-        email=profile.user.email if profile.user else None,
-        phone=profile.user.phone if profile.user else None,
-        cep=profile.user.cep if profile.user else None,
-        uf=profile.user.uf if profile.user else None,
-        city=profile.user.city if profile.user else None,
-        address=profile.user.address if profile.user else None,
-        profile_image_url=profile.user.profile_image_url if profile.user else None,
-        tags=[tag.name for tag in profile.tags],
-        unavailable_dates=[],
+    return fast_json_response(
+        professional_service.build_profile_payload(profile),
+        response=response,
     )
 
 
@@ -120,101 +89,134 @@ async def update_my_professional_profile(
         db, current_user.id, profile.id, profile_in
     )
 
-    return ProfessionalProfileResponse(
-        id=updated_profile.id,
-        user_id=updated_profile.user_id,
-        bio=updated_profile.bio,
-        category=updated_profile.category,
-        profissional_identification=updated_profile.profissional_identification,
-        services=updated_profile.services,
-        price=updated_profile.price,
-        only_online=updated_profile.only_online,
-        only_presential=updated_profile.only_presential,
-        rating=updated_profile.rating,
-        num_reviews=updated_profile.num_reviews,
-        available_days_of_week=updated_profile.available_days_of_week,
-        start_hour=updated_profile.start_hour,
-        end_hour=updated_profile.end_hour,
-        user_name=current_user.name,
-        email=current_user.email,
-        phone=current_user.phone,
-        cep=current_user.cep,
-        uf=current_user.uf,
-        city=current_user.city,
-        address=current_user.address,
-        profile_image_url=current_user.profile_image_url,
-        tags=[],
-        unavailable_dates=[],
+    return fast_json_response(
+        professional_service.build_profile_payload(
+            updated_profile, user=current_user, tags=[tag.name for tag in updated_profile.tags]
+        ),
     )
 
 
-@router.get("/", response_model=list[ProfessionalProfileResponse])
-async def list_professionals(
-    db: Annotated[AsyncSession, Depends(get_db)],
+async def professional_filters(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     category: Annotated[str | None, Query()] = None,
     name: Annotated[str | None, Query()] = None,
     tags: Annotated[list[str] | None, Query()] = None,
+    match: Annotated[
+        TagMatch, Query(description="any: alguma das tags; all: todas as tags")
+    ] = TagMatch.ANY,
     only_online: Annotated[bool | None, Query()] = None,
     only_presential: Annotated[bool | None, Query()] = None,
-    skip: Annotated[int, Query(ge=0)] = 0,
-    limit: Annotated[int, Query(ge=1, le=100)] = 100,
-):
+    near: Annotated[
+        str | None,
+        Query(description="CEP ou 'latitude,longitude'; ordena pela distância"),
+    ] = None,
+    radius_km: Annotated[float, Query(gt=0, le=200)] = 10,
+) -> dict:
+    """Filtros comuns à listagem e à busca, já convertidos para o formato do diretório."""
     # Converter strings vazias em None
     category = category if category and category.strip() else None
     name = name if name and name.strip() else None
     tags = [t for t in (tags or []) if t and t.strip()] or None
+    point = professional_service.resolve_near(near) if near and near.strip() else None
 
-    return await professional_service.list_professionals(
-        db,
-        category=category,
-        name=name,
-        tags=tags,
-        only_online=only_online,
-        only_presential=only_presential,
-        skip=skip,
-        limit=limit,
+    return {
+        "category": category,
+        "name": name,
+        "tag_ids": await professional_service.resolve_tag_filter(db, tags, match),
+        "match": match,
+        "only_online": only_online,
+        "only_presential": only_presential,
+        "near": point,
+        "radius_km": radius_km if point else None,
+    }
+
+
+@router.get("/", response_model=list[ProfessionalProfileResponse])
+async def list_professionals(
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    filters: Annotated[dict, Depends(professional_filters)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 100,
+):
+    validator = await professional_service.get_professionals_list_validator(
+        db, **filters, skip=skip, limit=limit
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
+    profiles = await professional_service.list_professionals(
+        db, **filters, skip=skip, limit=limit
     )
+    return fast_json_response(profiles, response=response)
+
+
+@router.get("/search", response_model=ProfessionalSearchResponse)
+async def search_professionals(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    filters: Annotated[dict, Depends(professional_filters)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    facet_limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """
+    Mesmos filtros da listagem, com o total de resultados e a contagem de perfis por
+    tag (``tag_facets``) calculados sobre todos os resultados, não só a página.
+    """
+    result = await professional_service.search_professionals(
+        db, **filters, skip=skip, limit=limit, facet_limit=facet_limit
+    )
+    return fast_json_response(result)
+
+
+@router.get("/facets", response_model=ProfessionalFacetsResponse)
+async def get_professional_facets(
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    filters: Annotated[dict, Depends(professional_filters)],
+    tag_limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """
+    Contagens por categoria, atendimento online/presencial e tags mais frequentes para
+    os mesmos filtros da listagem, calculadas numa única consulta.
+    """
+    validator = await professional_service.get_facets_validator(
+        db, **filters, tag_limit=tag_limit
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
+    facets = await professional_service.get_facets(db, **filters, tag_limit=tag_limit)
+    return fast_json_response(facets, response=response)
 
 
 @router.get("/user/{user_id}", response_model=ProfessionalProfileResponse)
 async def get_professional_profile_by_user_id(
     user_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ):
+    validator = await professional_service.get_profile_validator(db, user_id=user_id)
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     profile = await professional_service.get_professional_profile_by_user(db, user_id)
 
-    return ProfessionalProfileResponse(
-        id=profile.id,
-        user_id=profile.user_id,
-        bio=profile.bio,
-        category=profile.category,
-        profissional_identification=profile.profissional_identification,
-        services=profile.services,
-        price=profile.price,
-        only_online=profile.only_online,
-        only_presential=profile.only_presential,
-        rating=profile.rating,
-        num_reviews=profile.num_reviews,
-        available_days_of_week=profile.available_days_of_week,
-        start_hour=profile.start_hour,
-        end_hour=profile.end_hour,
-        user_name=profile.user.name if profile.user else None,
-        email=profile.user.email if profile.user else None,
-        phone=profile.user.phone if profile.user else None,
-        cep=profile.user.cep if profile.user else None,
-        uf=profile.user.uf if profile.user else None,
-        city=profile.user.city if profile.user else None,
-        address=profile.user.address if profile.user else None,
-        profile_image_url=profile.user.profile_image_url if profile.user else None,
-        tags=[tag.name for tag in profile.tags],
-        unavailable_dates=[],
+    return fast_json_response(
+        professional_service.build_profile_payload(profile),
+        response=response,
     )
 
 
 @router.get("/{profile_id}", response_model=ProfessionalProfileResponse)
 async def get_professional_profile(
     profile_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     include_reviews: Annotated[bool, Query()] = True,
     limit_reviews: Annotated[int, Query(ge=1, le=20)] = 5,
 ):
@@ -224,41 +226,20 @@ async def get_professional_profile(
     By default includes the 5 most recent reviews.
     Set include_reviews=false to exclude reviews.
     """
-    profile = await professional_service.get_professional_profile(db, profile_id)
-
-    if include_reviews:
-        response_data = await professional_service.build_professional_response_with_reviews(
-            profile, limit_reviews=limit_reviews
-        )
-        return ProfessionalProfileResponse(**response_data)
-
-    return ProfessionalProfileResponse(
-        id=profile.id,
-        user_id=profile.user_id,
-        bio=profile.bio,
-        category=profile.category,
-        profissional_identification=profile.profissional_identification,
-        services=profile.services,
-        price=profile.price,
-        only_online=profile.only_online,
-        only_presential=profile.only_presential,
-        rating=profile.rating,
-        num_reviews=profile.num_reviews,
-        available_days_of_week=profile.available_days_of_week,
-        start_hour=profile.start_hour,
-        end_hour=profile.end_hour,
-        user_name=profile.user.name if profile.user else None,
-        email=profile.user.email if profile.user else None,
-        phone=profile.user.phone if profile.user else None,
-        cep=profile.user.cep if profile.user else None,
-        uf=profile.user.uf if profile.user else None,
-        city=profile.user.city if profile.user else None,
-        address=profile.user.address if profile.user else None,
-        profile_image_url=profile.user.profile_image_url if profile.user else None,
-        tags=[tag.name for tag in profile.tags],
-        unavailable_dates=[],
-        reviews=[],
+    validator = await professional_service.get_profile_validator(
+        db, profile_id=profile_id, include_reviews=include_reviews
     )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
+    payload = await professional_service.get_profile_payload(
+        db,
+        profile_id,
+        include_reviews=include_reviews,
+        limit_reviews=limit_reviews,
+        etag=validator.etag if validator else None,
+    )
+    return fast_json_response(payload, response=response)
 
 
 @router.put("/{profile_id}", response_model=ProfessionalProfileResponse)
@@ -272,31 +253,10 @@ async def update_professional_profile(
         db, current_user.id, profile_id, profile_in
     )
 
-    return ProfessionalProfileResponse(
-        id=updated_profile.id,
-        user_id=updated_profile.user_id,
-        bio=updated_profile.bio,
-        category=updated_profile.category,
-        profissional_identification=updated_profile.profissional_identification,
-        services=updated_profile.services,
-        price=updated_profile.price,
-        only_online=updated_profile.only_online,
-        only_presential=updated_profile.only_presential,
-        rating=updated_profile.rating,
-        num_reviews=updated_profile.num_reviews,
-        available_days_of_week=updated_profile.available_days_of_week,
-        start_hour=updated_profile.start_hour,
-        end_hour=updated_profile.end_hour,
-        user_name=current_user.name,
-        email=current_user.email,
-        phone=current_user.phone,
-        cep=current_user.cep,
-        uf=current_user.uf,
-        city=current_user.city,
-        address=current_user.address,
-        profile_image_url=current_user.profile_image_url,
-        tags=[],
-        unavailable_dates=[],
+    return fast_json_response(
+        professional_service.build_profile_payload(
+            updated_profile, user=current_user, tags=[tag.name for tag in updated_profile.tags]
+        ),
     )
 
 
@@ -314,22 +274,72 @@ async def delete_professional_profile(
 @router.get("/{profile_id}/appointments", response_model=list[AppointmentResponse])
 async def get_professional_appointments(
     profile_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
     start_date: Annotated[date | None, Query()] = None,
     end_date: Annotated[date | None, Query()] = None,
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
 ):
     """Listar agendamentos de um profissional específico."""
-    return await appointment_service.get_professional_appointments_by_date(
+    validator = await appointment_service.get_appointments_validator(
+        db,
+        professional_id=profile_id,
+        start_date=start_date,
+        end_date=end_date,
+        skip=skip,
+        limit=limit,
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
+    appointments = await appointment_service.get_professional_appointments_by_date(
         db, profile_id, start_date=start_date, end_date=end_date, skip=skip, limit=limit
     )
+    return fast_json_response(appointments, response=response)
+
+
+@router.get("/{profile_id}/appointments/export")
+async def export_professional_appointments(
+    profile_id: int,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+    export_format: Annotated[Literal["csv", "ndjson"], Query(alias="format")] = "csv",
+    start_date: Annotated[date | None, Query()] = None,
+    end_date: Annotated[date | None, Query()] = None,
+):
+    """
+    Export the full appointment history of the logged professional.
+
+    Streams CSV or NDJSON rows straight from a server-side cursor, so memory
+    stays constant regardless of the history size.
+    """
+    if current_user.role != Role.PROFESSIONAL:
+        raise ForbiddenException("Only professionals can export appointments")
+
+    profile = await professional_service.get_professional_profile_by_user(
+        db, current_user.id
+    )
+    if profile.id != profile_id:
+        raise ForbiddenException("Not authorized to export these appointments")
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    filename = f"appointments_{profile_id}.{export_format}"
+    return StreamingResponse(
+        appointment_service.export_professional_appointments(
+            profile_id, export_format, start_date=start_date, end_date=end_date
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{profile_id}/available-slots", response_model=AvailableSlotsResponse)
 async def get_available_slots(
     profile_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    # Primário: as reservas (slot_holds) são UNLOGGED e não existem nas réplicas
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
     target_date: Annotated[date, Query()],
     duration_minutes: Annotated[int, Query(ge=15, le=480)] = 60,
 ):
@@ -342,7 +352,9 @@ async def get_available_slots(
 @router.get("/{profile_id}/reviews", response_model=ReviewList)
 async def get_professional_reviews(
     profile_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
 ):
@@ -351,6 +363,12 @@ async def get_professional_reviews(
 
     Returns list of reviews with patient information (unless anonymous).
     """
+    validator = await review_service.get_professional_reviews_validator(
+        db, professional_id=profile_id, skip=skip, limit=limit
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     reviews, total = await review_service.get_professional_reviews(
         db, professional_id=profile_id, skip=skip, limit=limit
     )
@@ -364,7 +382,9 @@ async def get_professional_reviews(
 @router.get("/{profile_id}/reviews/stats", response_model=ReviewStats)
 async def get_professional_review_stats(
     profile_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ):
     """
     Get review statistics for a professional.
@@ -374,8 +394,14 @@ async def get_professional_review_stats(
     - Total number of reviews
     - Distribution of ratings (1-5 stars)
     """
+    validator = await review_service.get_professional_reviews_validator(
+        db, professional_id=profile_id, scope="review-stats"
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     stats = await review_service.get_professional_stats(
-        db, professional_id=profile_id
+        db, professional_id=profile_id, etag=validator.etag if validator else None
     )
 
     return ReviewStats(**stats)
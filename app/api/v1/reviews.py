@@ -1,11 +1,11 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import CurrentUser
-from app.core.database import get_db
+from app.api.deps import CurrentUser, ReadOnlyUser
+from app.core.database import SessionRoute, get_db, get_readonly_db
 from app.crud.review import review as review_crud
 from app.models.enums import Role
 from app.schemas.review import (
@@ -15,8 +15,9 @@ from app.schemas.review import (
 )
 from app.services.review import review_service
 from app.utils.exceptions import ForbiddenException
+from app.utils.http_cache import conditional_response
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 @router.post(
@@ -55,17 +56,25 @@ async def create_review(
     summary="Get my reviews",
 )
 async def get_my_reviews(
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-) -> list[ReviewResponse]:
+) -> list[ReviewResponse] | Response:
     """
     Get all reviews created by the current patient.
     """
     if current_user.role != Role.PATIENT:
         raise ForbiddenException("Only patients can view their reviews")
 
+    validator = await review_service.get_patient_reviews_validator(
+        db, patient_id=current_user.id, skip=skip, limit=limit
+    )
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     reviews = await review_service.get_patient_reviews(
         db, patient_id=current_user.id, skip=skip, limit=limit
     )
@@ -80,12 +89,18 @@ async def get_my_reviews(
 )
 async def get_review(
     review_id: int,
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> ReviewResponse:
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
+) -> ReviewResponse | Response:
     """
     Get a specific review by ID.
     """
+    validator = await review_service.get_review_validator(db, review_id=review_id)
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     review = await review_crud.get_with_patient(db, review_id=review_id)
     if not review:
         from app.utils.exceptions import NotFoundException
@@ -147,8 +162,8 @@ async def delete_review(
 )
 async def get_appointment_review(
     appointment_id: int,
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
 ) -> ReviewResponse | None:
     """
     Get the review for a specific appointment (if exists).
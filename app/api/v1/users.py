@@ -1,21 +1,28 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import CurrentUser
-from app.core.database import get_db
+from app.api.deps import CurrentUser, ReadOnlyUser
+from app.core.database import SessionRoute, get_db, get_readonly_db
 from app.schemas.user import UserResponse, UserUpdate
 from app.services import user as user_service
 from app.utils.exceptions import ForbiddenException
+from app.utils.http_cache import conditional_response, entity_validator
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: CurrentUser,
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
 ):
+    validator = entity_validator("user", (current_user.id, current_user.updated_at))
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     return UserResponse.model_validate(current_user)
 
 
@@ -40,20 +47,27 @@ async def delete_current_user(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    response: Response,
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
 ):
     if current_user.id != user_id:
         raise ForbiddenException("Not authorized to view this user")
 
+    # Só o próprio usuário pode consultar: current_user já é a versão atual
+    validator = entity_validator("user", (current_user.id, current_user.updated_at))
+    if not_modified := conditional_response(request, response, validator):
+        return not_modified
+
     user = await user_service.get_user(db, user_id)
     return UserResponse.model_validate(user)
 
 
 @router.get("/", response_model=list[UserResponse])
 async def list_users(
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: ReadOnlyUser,
+    db: Annotated[AsyncSession, Depends(get_readonly_db)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
 ):
@@ -87,13 +101,18 @@ async def delete_user(
     await user_service.delete_user(db, user_id)
 
 
-@router.post("/me/profile-image", response_model=UserResponse)
+@router.post("/me/profile-image", response_model=UserResponse, status_code=202)
 async def upload_my_profile_image(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
     file: UploadFile = File(...),
 ):
-    """Upload profile image for the current user."""
+    """
+    Upload profile image for the current user.
+
+    202: the image is sent to S3 in the background; ``profile_image_url`` still
+    points to the previous image until the upload finishes.
+    """
     import logging
     logger = logging.getLogger(__name__)
     
@@ -1,7 +1,24 @@
+import math
+import os
+from pathlib import Path
+
 from pydantic import PostgresDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+def available_cpus() -> int:
+    """CPUs que o processo pode usar: afinidade (cpuset) e cota do cgroup v2."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    cpus = cpus or 1
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
 class Settings(BaseSettings):
 
     app_name: str = "VittaAqui"
@@ -9,10 +26,36 @@ class Settings(BaseSettings):
     debug: bool = False
 
     database_url: PostgresDsn
+    # Réplicas de leitura (URLs separadas por vírgula); vazio = tudo no primário
+    database_replica_urls: str = ""
+    database_replica_strategy: str = "round_robin"  # ou "least_connections"
+    read_your_writes_seconds: int = 5  # leituras no primário após uma escrita
+    database_query_cache_size: int = 1200  # SQL compilado pelo SQLAlchemy, por engine
+    # Prepared statements por conexão; 0 desliga (PgBouncer em modo transaction)
+    database_prepared_statement_cache_size: int = 500
+    database_pool_size: int = 5  # conexões mantidas abertas, por processo
+    database_max_overflow: int = 10  # conexões extras sob pico, por processo
+    # Teto de conexões somando todos os processos (por banco); 0 = sem teto.
+    # Dividido por WEB_CONCURRENCY em pool_size + max_overflow de cada processo
+    database_connection_budget: int = 0
+
+    # Servidor de produção (scripts/serve.py)
+    web_concurrency: int = 0  # processos da API; 0 = um por CPU disponível
+    server_max_requests: int = 10_000  # recicla o processo após N requisições; 0 = nunca
+    server_max_requests_jitter: int = 1_000  # evita que todos reciclem juntos
+    server_graceful_timeout: int = 30  # segundos para terminar requisições ao parar
+    server_keep_alive: int = 5
 
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440
+    # ES256/RS256...: chaves PEM (com "\n" literais numa linha só, se preciso). Só
+    # a pública basta para um serviço que apenas verifica; EdDSA não é suportado
+    jwt_private_key: str = ""
+    jwt_public_key: str = ""
+    jwt_cache_size: int = 10_000  # tokens já verificados em memória, por processo; 0 desliga
+    token_revocation_sync_enabled: bool = True
+    token_revocation_sync_interval: float = 30.0  # recarga da lista de revogação
 
     cors_origins: str = "*"
 
@@ -22,6 +65,54 @@ class Settings(BaseSettings):
     aws_region: str = "sa-east-1"
     aws_s3_bucket: str = "vitta-image-profile"
 
+    # Aquecimento na subida do processo (app.services.warmup)
+    warmup_enabled: bool = True
+    warmup_timeout_seconds: float = 30.0  # espera máxima antes de aceitar requisições
+    warmup_retry_seconds: float = 5.0
+    warmup_connections: int = 5  # conexões abertas por engine (até o pool_size)
+    warmup_profiles: int = 5  # primeiros perfis da listagem lidos no aquecimento
+
+    # Reserva temporária de horários (POST /api/appointments/hold)
+    slot_hold_ttl_seconds: int = 300
+
+    # Tarefas em segundo plano (app.jobs)
+    job_worker_enabled: bool = True  # worker dentro do processo da API
+    job_concurrency: int = 4
+    job_poll_interval: float = 1.0
+    job_batch_size: int = 20
+    job_lock_timeout_seconds: int = 300
+    job_retry_base_seconds: float = 2.0
+    job_retry_max_seconds: float = 600.0
+    # Arquivos enviados aguardando o worker (compartilhado com workers à parte)
+    upload_spool_dir: str = "/tmp/vittaaqui/uploads"
+
+    # Lembretes de consulta (app.jobs.reminders)
+    reminder_scheduler_enabled: bool = True  # agendador dentro do processo da API
+    reminder_lead_minutes: int = 1440  # antecedência do lembrete
+    reminder_poll_interval: float = 60.0
+    reminder_batch_size: int = 100
+
+    # Encerramento de consultas passadas (app.jobs.transitions)
+    appointment_transition_enabled: bool = True
+    appointment_transition_interval: float = 300.0
+    appointment_transition_batch_size: int = 500
+    appointment_transition_grace_minutes: int = 0  # espera após o fim da consulta
+
+    # Limite de requisições (app.utils.rate_limit)
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # "memory" ou "redis" (vários workers)
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_ip_capacity: int = 60
+    rate_limit_ip_refill_per_second: float = 1.0
+    rate_limit_user_capacity: int = 120
+    rate_limit_user_refill_per_second: float = 2.0
+    rate_limit_max_keys: int = 100_000  # baldes em memória, por processo
+    rate_limit_shards: int = 16
+
+    # Canal de notificações (app.services.notifier)
+    notifier_backend: str = "log"  # "log" ou "file"
+    notifier_file_path: str = "notifications.jsonl"
+
     @computed_field
     @property
     def cors_origins_list(self) -> list[str]:
@@ -29,6 +120,28 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.cors_origins.split(",")]
         return self.cors_origins
 
+    @computed_field
+    @property
+    def database_replica_urls_list(self) -> list[str]:
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
+    @computed_field
+    @property
+    def worker_count(self) -> int:
+        if self.web_concurrency > 0:
+            return self.web_concurrency
+        return available_cpus()
+
+    @computed_field
+    @property
+    def database_pool_limits(self) -> tuple[int, int]:
+        """``(pool_size, max_overflow)`` de cada engine neste processo."""
+        if self.database_connection_budget <= 0:
+            return self.database_pool_size, self.database_max_overflow
+        per_worker = max(1, self.database_connection_budget // self.worker_count)
+        pool_size = min(self.database_pool_size, per_worker)
+        return pool_size, per_worker - pool_size
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
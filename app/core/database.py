@@ -1,26 +1,112 @@
-from collections.abc import AsyncGenerator
+import functools
+import inspect
+import itertools
+import time
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
 
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy import MetaData, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session, SessionTransaction
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
-engine = create_async_engine(
-    str(settings.database_url),
-    echo=settings.debug,
-    future=True,
-    pool_pre_ping=True,
-)
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+def _create_engine(url: str) -> AsyncEngine:
+    pool_size, max_overflow = settings.database_pool_limits
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        future=True,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        # SQL compilado por statement (chave do lambda_stmt ou da árvore do select)
+        query_cache_size=settings.database_query_cache_size,
+        # Prepared statements do asyncpg por conexão, reaproveitados pelo texto do SQL
+        connect_args={
+            "prepared_statement_cache_size": settings.database_prepared_statement_cache_size
+        },
+    )
+
+
+def _sessionmaker(bind: AsyncEngine, **kwargs: Any) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+        **kwargs,
+    )
+
+
+def _read_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # AUTOCOMMIT: cada SELECT roda sozinho, sem BEGIN/COMMIT em volta
+    return _sessionmaker(
+        bind.execution_options(isolation_level="AUTOCOMMIT"), info={"read_only": True}
+    )
+
+
+engine = _create_engine(str(settings.database_url))
+
+AsyncSessionLocal = _sessionmaker(engine)
+ReadSessionLocal = _read_sessionmaker(engine)
+
+
+class ReplicaRouter:
+    """
+    Escolhe a réplica de leitura de cada requisição: ``round_robin`` alterna entre
+    elas; ``least_connections`` pega a que tem menos conexões em uso no pool deste
+    processo. Sem réplicas configuradas, ``pick`` retorna ``None`` (primário).
+    """
+
+    STRATEGIES = ("round_robin", "least_connections")
+
+    def __init__(self, urls: list[str], strategy: str = "round_robin"):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy: {strategy!r}")
+        self.strategy = strategy
+        self.engines = [_create_engine(url) for url in urls]
+        self._session_factories = [_read_sessionmaker(replica) for replica in self.engines]
+        self._turn = itertools.count()
+
+    def pick(self) -> async_sessionmaker[AsyncSession] | None:
+        if not self.engines:
+            return None
+        if self.strategy == "least_connections":
+            index = min(
+                range(len(self.engines)),
+                key=lambda i: self.engines[i].pool.checkedout(),  # type: ignore[attr-defined]
+            )
+        else:
+            index = next(self._turn) % len(self.engines)
+        return self._session_factories[index]
+
+    @property
+    def session_factories(self) -> list[async_sessionmaker[AsyncSession]]:
+        return list(self._session_factories)
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replica_router = ReplicaRouter(
+    settings.database_replica_urls_list, settings.database_replica_strategy
 )
 
+# Depois de uma escrita, o cliente lê do primário até o instante gravado no cookie
+PRIMARY_COOKIE = "vitta_primary_until"
+
 
 convention = {
     "ix": "ix_%(column_0_label)s",
@@ -36,13 +122,165 @@ class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=convention)
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+class SessionReleasedError(RuntimeError):
+    """A sessão da requisição foi usada depois de devolver a conexão ao pool."""
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _forbid_use_after_release(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None and session.info.get("released"):
+        raise SessionReleasedError(
+            "Request session used after the endpoint returned; its connection was "
+            "already released. Load everything the response needs inside the endpoint."
+        )
+
+
+def _track(request: Request, session: AsyncSession) -> None:
+    # Finalizada por SessionRoute assim que o endpoint retorna
+    request.state.__dict__.setdefault("db_sessions", []).append(session)
+
+
+async def release_sessions(request: Request) -> None:
+    """
+    Confirmar as sessões de escrita da requisição e devolver ao pool as conexões
+    de todas elas. Qualquer uso posterior levanta ``SessionReleasedError``.
+    """
+    sessions = request.state.__dict__.get("db_sessions", [])
+    # Escritas primeiro: se o commit falhar, nada foi liberado ainda
+    for session in sorted(sessions, key=lambda s: s.info.get("read_only", False)):
+        if session.info.get("released"):
+            continue
+        if not session.info.get("read_only"):
+            await session.commit()
+        await session.close()
+        session.info["released"] = True
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
+        _track(request, session)
         try:
             yield session
-            await session.commit()
+            if not session.info.get("released"):
+                await session.commit()
         except Exception:
-            await session.rollback()
+            if not session.info.get("released"):
+                await session.rollback()
             raise
         finally:
             await session.close()
+
+
+def _prefers_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_readonly_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sessão somente leitura no primário, em AUTOCOMMIT: sem ``BEGIN``/``COMMIT``
+    por requisição e nunca confirmada. Cada consulta vê o próprio snapshot; como o
+    validador (ETag) é lido antes dos dados, o corpo nunca é mais antigo que ele.
+    """
+    async with ReadSessionLocal() as session:
+        _track(request, session)
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Como ``get_readonly_db``, mas numa réplica, exceto para o cliente que acabou
+    de escrever (cookie de ``ReadYourWritesMiddleware``), que continua no
+    primário até a réplica alcançá-lo.
+    """
+    session_factory = None if _prefers_primary(request) else replica_router.pick()
+    async with (session_factory or ReadSessionLocal)() as session:
+        _track(request, session)
+        yield session
+
+
+_REQUEST_PARAM = "_session_route_request"
+
+
+def _release_after(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    signature = inspect.signature(endpoint)
+    # O FastAPI injeta o Request num único parâmetro: reaproveita o do endpoint
+    declared = next(
+        (name for name, p in signature.parameters.items() if p.annotation is Request),
+        None,
+    )
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        request = kwargs[declared] if declared else kwargs.pop(_REQUEST_PARAM)
+        result = await endpoint(*args, **kwargs)
+        await release_sessions(request)
+        return result
+
+    if declared is None:
+        request_param = inspect.Parameter(
+            _REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+        )
+        signature = signature.replace(
+            parameters=[*signature.parameters.values(), request_param]
+        )
+    wrapper.__signature__ = signature  # type: ignore[attr-defined]
+    wrapper._releases_sessions = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+class SessionRoute(APIRoute):
+    """
+    Rota que encerra as sessões da requisição (commit das de escrita) assim que o
+    endpoint retorna, antes da serialização da resposta e do envio ao cliente,
+    quando as dependências com ``yield`` terminariam. A conexão fica fora do pool
+    só durante o trabalho de banco. Se o endpoint falhar, nada é liberado aqui e
+    ``get_db`` faz o rollback como antes.
+
+    Endpoints que usam a sessão da requisição dentro de um ``StreamingResponse``
+    não podem usar esta rota.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        # include_router recria as rotas com o endpoint já envolvido
+        if inspect.iscoroutinefunction(endpoint) and not getattr(
+            endpoint, "_releases_sessions", False
+        ):
+            endpoint = _release_after(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marca com um cookie curto (``READ_YOUR_WRITES_SECONDS``) toda resposta de
+    sucesso a métodos de escrita, para que as leituras seguintes do mesmo cliente
+    não caiam numa réplica atrasada.
+    """
+
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp, ttl_seconds: int | None = None):
+        self.app = app
+        self.ttl_seconds = ttl_seconds or settings.read_your_writes_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time()) + self.ttl_seconds
+                cookie = (
+                    f"{PRIMARY_COOKIE}={until}; Max-Age={self.ttl_seconds}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,14 +1,138 @@
-
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from jose import jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.utils.metrics import Counter
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+token_verifications_total = Counter(
+    "token_verifications_total",
+    "Verificações de JWT: do cache, verificadas na hora ou recusadas",
+    labels=("result",),
+)
+
+# HMAC usa JWT_SECRET; os demais, o par de chaves PEM de JWT_PRIVATE_KEY / JWT_PUBLIC_KEY
+HMAC_ALGORITHMS = frozenset({"HS256", "HS384", "HS512"})
+ASYMMETRIC_ALGORITHMS = frozenset(
+    {"ES256", "ES384", "ES512", "RS256", "RS384", "RS512", "PS256", "PS384", "PS512"}
+)
+
+
+def _pem(value: str) -> str:
+    # Variáveis de ambiente costumam trazer a chave numa linha, com "\n" literais
+    return value.replace("\\n", "\n").strip()
+
+
+def _load_keys() -> tuple[Any, Any]:
+    """``(chave de assinatura, chave de verificação)`` para ``JWT_ALGORITHM``."""
+    algorithm = settings.jwt_algorithm
+    if algorithm in HMAC_ALGORITHMS:
+        return settings.jwt_secret, settings.jwt_secret
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        # EdDSA inclusive: o python-jose não implementa Ed25519
+        raise ValueError(f"Unsupported JWT algorithm: {algorithm!r}")
+
+    signing = None
+    if settings.jwt_private_key:
+        signing = jwk.construct(_pem(settings.jwt_private_key), algorithm)
+    if settings.jwt_public_key:
+        verifying = jwk.construct(_pem(settings.jwt_public_key), algorithm)
+    elif signing is not None:
+        verifying = signing.public_key()
+    else:
+        raise ValueError(f"JWT_ALGORITHM={algorithm} requires JWT_PRIVATE_KEY or JWT_PUBLIC_KEY")
+    return signing, verifying
+
+
+_signing_key, _verifying_key = _load_keys()
+
+
+class VerifiedTokenCache:
+    """
+    LRU dos tokens cuja assinatura já foi conferida: hash do token -> claims. Uma
+    entrada só vale até o ``exp`` do próprio token; tokens sem ``exp`` não entram.
+    Guarda no máximo ``max_size`` tokens por processo (0 desliga).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        if not self.max_size:
+            return None
+        key = self._key(token)
+        claims = self._entries.get(key)
+        if claims is None:
+            return None
+        if claims["exp"] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        if not self.max_size or not isinstance(claims.get("exp"), int | float):
+            return
+        self._entries[self._key(token)] = claims
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RevocationList:
+    """
+    ``jti`` dos tokens revogados que ainda não expiraram, como inteiros de 64 bits
+    num ``frozenset``. Recarregada do banco periodicamente (``TokenRevocationSync``);
+    cada recarga descarta os que já expiraram, então o conjunto não cresce.
+    """
+
+    def __init__(self) -> None:
+        self._revoked: frozenset[int] = frozenset()
+
+    @staticmethod
+    def _key(jti: Any) -> int | None:
+        try:
+            return int(jti, 16)
+        except (TypeError, ValueError):
+            return None
+
+    def __contains__(self, jti: Any) -> bool:
+        return self._key(jti) in self._revoked
+
+    def add(self, jti: str) -> None:
+        if (key := self._key(jti)) is not None:
+            self._revoked = self._revoked | {key}
+
+    def replace(self, jtis: Iterable[str]) -> None:
+        keys = (self._key(jti) for jti in jtis)
+        self._revoked = frozenset(key for key in keys if key is not None)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+token_cache = VerifiedTokenCache(settings.jwt_cache_size)
+revocation_list = RevocationList()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -19,6 +143,9 @@ def get_password_hash(password: str) -> str:
 
 
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
+    if _signing_key is None:
+        raise RuntimeError("JWT_PRIVATE_KEY is required to issue tokens")
+
     to_encode = data.copy()
 
     if expires_delta:
@@ -28,9 +155,40 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
             minutes=settings.access_token_expire_minutes
         )
 
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    # jti: 64 bits em hex, identifica o token na lista de revogação
+    to_encode.update({"exp": expire, "jti": secrets.token_hex(8)})
+    return jwt.encode(to_encode, _signing_key, algorithm=settings.jwt_algorithm)
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
-    return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    """
+    Claims de um token válido. Tokens já verificados saem do cache sem refazer a
+    assinatura; a revogação é conferida sempre. O dicionário é compartilhado com
+    o cache e não deve ser alterado.
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        try:
+            claims = jwt.decode(token, _verifying_key, algorithms=[settings.jwt_algorithm])
+        except JWTError:
+            token_verifications_total.inc(result="rejected")
+            raise
+        token_cache.put(token, claims)
+        result = "verified"
+    else:
+        result = "cached"
+
+    if claims.get("jti") in revocation_list:
+        token_verifications_total.inc(result="revoked")
+        raise JWTError("Token has been revoked")
+    token_verifications_total.inc(result=result)
+    return claims
+
+
+def public_jwks() -> dict[str, list[dict[str, Any]]]:
+    """Chave pública em formato JWKS, para outros serviços verificarem os tokens."""
+    if settings.jwt_algorithm in HMAC_ALGORITHMS:
+        return {"keys": []}
+    key = _verifying_key.to_dict()
+    key.update({"use": "sig", "alg": settings.jwt_algorithm})
+    return {"keys": [key]}
@@ -1,12 +1,20 @@
 
 from app.crud.appointment import appointment_crud
+from app.crud.directory import directory_crud
+from app.crud.job import job_crud
 from app.crud.professional import professional_crud
 from app.crud.review import review
+from app.crud.slot_hold import slot_hold_crud
+from app.crud.tag import tag_crud
 from app.crud.user import user_crud
 
 __all__ = [
     "user_crud",
     "professional_crud",
     "appointment_crud",
+    "directory_crud",
+    "tag_crud",
+    "job_crud",
+    "slot_hold_crud",
     "review",
 ]
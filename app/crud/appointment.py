@@ -1,16 +1,24 @@
 
-from datetime import date, datetime
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, func, insert, literal, null, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload
 
+from app.crud import statements
 from app.crud.base import CRUDBase
 from app.models.appointment import Appointment
-from app.models.enums import AppointmentStatus
+from app.models.enums import AppointmentStatus, ReminderStatus
 from app.models.professional import ProfessionalProfile
+from app.models.user import User
 from app.schemas.appointment import AppointmentCreate, AppointmentUpdate
 
+# Predicado literal de ``ix_appointments_reminder_due``: com parâmetros, num plano
+# genérico (prepared statement reutilizado) o Postgres não prova que o índice serve
+REMINDER_DUE_WHERE = text("status IN ('pending', 'confirmed') AND reminder_status IS NULL")
+
 
 class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate]):
 
@@ -29,33 +37,71 @@ class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate
         )
         return result.scalar_one_or_none()
 
-    async def get_by_patient(
-        self, db: AsyncSession, *, patient_id: int, skip: int = 0, limit: int = 100
-    ) -> list[Appointment]:
-        result = await db.execute(
-            select(Appointment)
-            .where(Appointment.patient_id == patient_id)
-            .options(
-                joinedload(Appointment.professional).joinedload(
-                    ProfessionalProfile.user
-                )
-            )
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(result.scalars().all())
+    async def list_response_rows(
+        self,
+        db: AsyncSession,
+        *,
+        patient_id: int | None = None,
+        professional_id: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        include_professional: bool = True,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """
+        Projeta só as colunas de ``AppointmentResponse``, com os nomes do schema.
 
-    async def get_by_professional(
-        self, db: AsyncSession, *, professional_id: int, skip: int = 0, limit: int = 100
-    ) -> list[Appointment]:
-        result = await db.execute(
-            select(Appointment)
-            .where(Appointment.professional_id == professional_id)
-            .options(joinedload(Appointment.patient))
-            .offset(skip)
-            .limit(limit)
-        )
-        return list(result.scalars().all())
+        Os nomes de paciente/profissional vêm de joins no próprio SQL, sem
+        carregar entidades (nem colunas como ``password``) no identity map.
+        """
+        patient = aliased(User)
+        professional_user = aliased(User)
+        columns = [
+            Appointment.id,
+            Appointment.patient_id,
+            patient.name.label("patient_name"),
+            patient.profile_image_url.label("patient_image_url"),
+            Appointment.professional_id,
+        ]
+        if include_professional:
+            columns += [
+                professional_user.name.label("professional_name"),
+                professional_user.profile_image_url.label("professional_image_url"),
+            ]
+        else:
+            columns += [
+                null().label("professional_name"),
+                null().label("professional_image_url"),
+            ]
+        columns += [
+            Appointment.start_time,
+            Appointment.end_time,
+            Appointment.status,
+            Appointment.created_at,
+            Appointment.updated_at,
+        ]
+
+        query = select(*columns).join(patient, patient.id == Appointment.patient_id)
+        if include_professional:
+            query = query.join(
+                ProfessionalProfile, ProfessionalProfile.id == Appointment.professional_id
+            ).join(professional_user, professional_user.id == ProfessionalProfile.user_id)
+
+        if patient_id is not None:
+            query = query.where(Appointment.patient_id == patient_id)
+        if professional_id is not None:
+            query = query.where(Appointment.professional_id == professional_id)
+        if start_date:
+            start_datetime = datetime.combine(start_date, datetime.min.time())
+            query = query.where(Appointment.start_time >= start_datetime)
+        if end_date:
+            end_datetime = datetime.combine(end_date, datetime.max.time())
+            query = query.where(Appointment.start_time <= end_datetime)
+
+        query = query.offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.all()
 
     async def find_conflicts(
         self,
@@ -66,17 +112,11 @@ class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate
         end_time: datetime,
         exclude_id: int | None = None,
     ) -> list[Appointment]:
-        query = select(Appointment).where(
-            Appointment.professional_id == professional_id,
-            Appointment.start_time < end_time,
-            Appointment.end_time > start_time,
-            Appointment.status != AppointmentStatus.CANCELLED,
+        result = await db.execute(
+            statements.appointment_conflicts(
+                professional_id, start_time, end_time, exclude_id
+            )
         )
-
-        if exclude_id:
-            query = query.where(Appointment.id != exclude_id)
-
-        result = await db.execute(query)
         return list(result.scalars().all())
 
     async def find_cancelled(
@@ -99,36 +139,308 @@ class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate
         )
         return result.scalar_one_or_none()
 
-    async def get_by_professional_and_date(
+    async def find_overlapping_any(
+        self,
+        db: AsyncSession,
+        *,
+        professional_id: int,
+        windows: list[tuple[datetime, datetime]],
+    ) -> list[Appointment]:
+        """Busca, em uma única consulta, agendamentos que sobrepõem qualquer janela.
+
+        Inclui cancelados para que o chamador possa reaproveitá-los.
+        """
+        range_start = min(start for start, _ in windows)
+        range_end = max(end for _, end in windows)
+        result = await db.execute(
+            select(Appointment).where(
+                Appointment.professional_id == professional_id,
+                Appointment.start_time < range_end,
+                Appointment.end_time > range_start,
+                or_(
+                    *(
+                        and_(Appointment.start_time < end, Appointment.end_time > start)
+                        for start, end in windows
+                    )
+                ),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def create_many(
+        self, db: AsyncSession, *, rows: list[dict[str, Any]]
+    ) -> list[Appointment]:
+        if not rows:
+            return []
+        result = await db.scalars(insert(Appointment).returning(Appointment), rows)
+        return list(result.all())
+
+    async def get_booked_windows(
+        self, db: AsyncSession, *, professional_id: int, target_date: date
+    ) -> Sequence[Row]:
+        """``(start_time, end_time)`` das consultas não canceladas que começam no dia."""
+        day_start = datetime.combine(target_date, datetime.min.time())
+        result = await db.execute(
+            statements.booked_windows(
+                professional_id, day_start, day_start + timedelta(days=1)
+            )
+        )
+        return result.all()
+
+    async def stream_history(
         self,
         db: AsyncSession,
         *,
         professional_id: int,
         start_date: date | None = None,
         end_date: date | None = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> list[Appointment]:
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Percorre o histórico do profissional com cursor no servidor, em lotes.
+
+        Projeta apenas as colunas exportadas, sem carregar entidades ORM.
+        """
         query = (
-            select(Appointment)
-            .where(Appointment.professional_id == professional_id)
-            .options(
-                joinedload(Appointment.patient),
-                joinedload(Appointment.professional).joinedload(ProfessionalProfile.user),
+            select(
+                Appointment.id,
+                Appointment.start_time,
+                Appointment.end_time,
+                Appointment.status,
+                Appointment.patient_id,
+                User.name.label("patient_name"),
+                Appointment.created_at,
+                Appointment.updated_at,
             )
+            .join(User, User.id == Appointment.patient_id)
+            .where(Appointment.professional_id == professional_id)
+            .order_by(Appointment.start_time, Appointment.id)
+            .execution_options(yield_per=batch_size)
         )
 
         if start_date:
-            start_datetime = datetime.combine(start_date, datetime.min.time())
-            query = query.where(Appointment.start_time >= start_datetime)
+            query = query.where(
+                Appointment.start_time >= datetime.combine(start_date, datetime.min.time())
+            )
 
         if end_date:
-            end_datetime = datetime.combine(end_date, datetime.max.time())
-            query = query.where(Appointment.start_time <= end_datetime)
+            query = query.where(
+                Appointment.start_time <= datetime.combine(end_date, datetime.max.time())
+            )
+
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    def _owner_filter(
+        self, *, patient_id: int | None, professional_id: int | None
+    ):
+        if patient_id is not None:
+            return Appointment.patient_id == patient_id
+        return Appointment.professional_id == professional_id
+
+    async def get_version(
+        self,
+        db: AsyncSession,
+        *,
+        patient_id: int | None = None,
+        professional_id: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> tuple[datetime | None, int]:
+        """Retorna ``(max(updated_at), count)`` da agenda, usados como validador HTTP.
+
+        Como em ``get_item_version``, o ``updated_at`` de cada linha inclui o do
+        paciente e o do profissional exibidos junto com o agendamento.
+        """
+        patient = aliased(User)
+        professional_user = aliased(User)
+        query = (
+            select(
+                func.max(
+                    func.greatest(
+                        Appointment.updated_at,
+                        patient.updated_at,
+                        professional_user.updated_at,
+                    )
+                ),
+                func.count(Appointment.id),
+            )
+            .join(patient, patient.id == Appointment.patient_id)
+            .join(ProfessionalProfile, ProfessionalProfile.id == Appointment.professional_id)
+            .join(professional_user, professional_user.id == ProfessionalProfile.user_id)
+            .where(self._owner_filter(patient_id=patient_id, professional_id=professional_id))
+        )
+
+        if since:
+            query = query.where(Appointment.start_time >= since)
+
+        if until:
+            query = query.where(Appointment.start_time <= until)
 
-        query = query.offset(skip).limit(limit)
         result = await db.execute(query)
+        last_modified, count = result.one()
+        return last_modified, count
+
+    async def get_item_version(
+        self, db: AsyncSession, *, appointment_id: int
+    ) -> Row | None:
+        """Donos e ``updated_at`` do agendamento e dos usuários exibidos na resposta."""
+        patient = aliased(User)
+        professional_user = aliased(User)
+        result = await db.execute(
+            select(
+                Appointment.id,
+                Appointment.patient_id,
+                Appointment.professional_id,
+                func.greatest(
+                    Appointment.updated_at,
+                    patient.updated_at,
+                    professional_user.updated_at,
+                ).label("updated_at"),
+            )
+            .join(patient, patient.id == Appointment.patient_id)
+            .join(ProfessionalProfile, ProfessionalProfile.id == Appointment.professional_id)
+            .join(professional_user, professional_user.id == ProfessionalProfile.user_id)
+            .where(Appointment.id == appointment_id)
+        )
+        return result.one_or_none()
+
+    async def get_calendar_rows(
+        self,
+        db: AsyncSession,
+        *,
+        patient_id: int | None = None,
+        professional_id: int | None = None,
+        since: datetime,
+    ) -> Sequence[Row]:
+        """Projeta só as colunas usadas no feed iCalendar, com o nome da contraparte."""
+        query = select(
+            Appointment.id,
+            Appointment.start_time,
+            Appointment.end_time,
+            Appointment.status,
+            Appointment.updated_at,
+            User.name.label("counterpart_name"),
+        ).where(
+            self._owner_filter(patient_id=patient_id, professional_id=professional_id),
+            Appointment.start_time >= since,
+        )
+
+        if patient_id is not None:
+            query = query.join(
+                ProfessionalProfile, ProfessionalProfile.id == Appointment.professional_id
+            ).join(User, User.id == ProfessionalProfile.user_id)
+        else:
+            query = query.join(User, User.id == Appointment.patient_id)
+
+        result = await db.execute(query.order_by(Appointment.start_time))
+        return result.all()
+
+    async def claim_due_reminders(
+        self, db: AsyncSession, *, lead: timedelta, limit: int
+    ) -> list[int]:
+        """
+        Reservar até ``limit`` consultas que começam dentro de ``lead`` e ainda não
+        têm lembrete, marcando-as como ``queued``. A busca usa o índice parcial
+        ``ix_appointments_reminder_due`` (mesmo predicado) e ``SKIP LOCKED``, então
+        vários agendadores podem rodar ao mesmo tempo sem repetir consultas.
+        """
+        now = func.localtimestamp()
+        due = (
+            select(Appointment.id)
+            .where(
+                REMINDER_DUE_WHERE,
+                Appointment.start_time > now,
+                Appointment.start_time <= now + lead,
+            )
+            .order_by(Appointment.start_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(Appointment)
+            .where(Appointment.id.in_(due.scalar_subquery()))
+            .values(
+                reminder_status=ReminderStatus.QUEUED.value,
+                # Mantém updated_at (onupdate): o lembrete não muda a versão da consulta
+                updated_at=Appointment.updated_at,
+            )
+            .returning(Appointment.id)
+        )
+        return list(result.scalars().all())
+
+    async def get_notification_row(
+        self, db: AsyncSession, *, appointment_id: int
+    ) -> Row | None:
+        """Colunas usadas nas notificações, com nome/e-mail do paciente e do profissional."""
+        patient = aliased(User)
+        professional_user = aliased(User)
+        result = await db.execute(
+            select(
+                Appointment.id,
+                Appointment.start_time,
+                Appointment.end_time,
+                Appointment.status,
+                Appointment.reminder_status,
+                patient.name.label("patient_name"),
+                patient.email.label("patient_email"),
+                professional_user.name.label("professional_name"),
+            )
+            .join(patient, patient.id == Appointment.patient_id)
+            .join(ProfessionalProfile, ProfessionalProfile.id == Appointment.professional_id)
+            .join(professional_user, professional_user.id == ProfessionalProfile.user_id)
+            .where(Appointment.id == appointment_id)
+        )
+        return result.one_or_none()
+
+    async def transition_past(
+        self,
+        db: AsyncSession,
+        *,
+        from_status: AppointmentStatus,
+        to_status: AppointmentStatus,
+        grace: timedelta,
+        limit: int,
+    ) -> list[int]:
+        """
+        Mover até ``limit`` consultas em ``from_status`` que terminaram há mais de
+        ``grace`` para ``to_status``, num único UPDATE. A busca usa o índice parcial
+        ``ix_appointments_open_end_time``; ``SKIP LOCKED`` evita esperar por linhas
+        que outra transação está alterando.
+        """
+        stale = (
+            select(Appointment.id)
+            .where(
+                # Literal no SQL, como em REMINDER_DUE_WHERE: o plano genérico usa o índice
+                Appointment.status == literal(from_status.value, literal_execute=True),
+                Appointment.end_time < func.localtimestamp() - grace,
+            )
+            .order_by(Appointment.end_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(Appointment)
+            .where(Appointment.id.in_(stale.scalar_subquery()))
+            .values(status=to_status.value)
+            .returning(Appointment.id)
+        )
         return list(result.scalars().all())
 
+    async def set_reminder_status(
+        self, db: AsyncSession, *, appointment_id: int, status: ReminderStatus
+    ) -> None:
+        await db.execute(
+            update(Appointment)
+            .where(Appointment.id == appointment_id)
+            .values(
+                reminder_status=status.value,
+                reminder_sent_at=(
+                    func.localtimestamp() if status == ReminderStatus.SENT else None
+                ),
+                updated_at=Appointment.updated_at,
+            )
+        )
+
 
 appointment_crud = CRUDAppointment(Appointment)
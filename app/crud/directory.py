@@ -0,0 +1,478 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Insert,
+    Integer,
+    Row,
+    Select,
+    SmallInteger,
+    String,
+    case,
+    cast,
+    delete,
+    false,
+    func,
+    literal,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.directory import ProfessionalDirectory
+from app.models.enums import TagMatch
+from app.models.professional import ProfessionalProfile, ProfileTag, Tag
+from app.models.user import User
+from app.utils.cep_geo import (
+    EARTH_RADIUS_KM,
+    GRID_COLUMNS,
+    GRID_DEGREES,
+    cells_within,
+)
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def _weekday_mask() -> Any:
+    """Máscara de bits calculada no SQL a partir do CSV ``available_days_of_week``."""
+    days = (
+        literal(",")
+        + func.lower(
+            func.replace(func.coalesce(ProfessionalProfile.available_days_of_week, ""), " ", "")
+        )
+        + literal(",")
+    )
+    mask = sum(
+        (
+            case((func.strpos(days, f",{day},") > 0, 1 << bit), else_=0)
+            for bit, day in enumerate(WEEKDAYS)
+        ),
+        start=literal(0),
+    )
+    return cast(mask, SmallInteger)
+
+
+def _profile_tags(column: Any, type_: Any) -> Any:
+    values = (
+        select(column)
+        .where(ProfileTag.profile_id == ProfessionalProfile.id)
+        .order_by(ProfileTag.id)
+        .correlate(ProfessionalProfile)
+        .scalar_subquery()
+    )
+    return func.array(values, type_=ARRAY(type_))
+
+
+def _geo_cell() -> Any:
+    """Mesmo cálculo de ``app.utils.cep_geo.geo_cell``; nulo sem coordenadas."""
+    row = cast(func.floor((User.latitude + 90) / GRID_DEGREES), Integer)
+    column = cast(func.floor((User.longitude + 180) / GRID_DEGREES), Integer)
+    return row * GRID_COLUMNS + column
+
+
+def _distance_km(latitude: float, longitude: float) -> ColumnElement[float]:
+    """Distância pelo haversine entre o ponto e o endereço do profissional."""
+    lat1, lat2 = func.radians(latitude), func.radians(ProfessionalDirectory.latitude)
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = (func.radians(ProfessionalDirectory.longitude) - func.radians(longitude)) / 2
+    a = func.power(func.sin(half_dlat), 2) + func.cos(lat1) * func.cos(lat2) * func.power(
+        func.sin(half_dlon), 2
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(func.sqrt(a), 1.0))
+
+
+def build_refresh_statement(
+    *, profile_ids: Sequence[int] | None = None, user_ids: Sequence[int] | None = None
+) -> Insert:
+    """
+    ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` que recalcula as linhas do
+    diretório a partir das tabelas de origem (todas, se nenhum filtro for dado).
+    """
+    source = {
+        "profile_id": ProfessionalProfile.id,
+        "user_id": ProfessionalProfile.user_id,
+        "name": User.name,
+        "email": User.email,
+        "phone": User.phone,
+        "cep": User.cep,
+        "uf": User.uf,
+        "city": User.city,
+        "address": User.address,
+        "profile_image_url": User.profile_image_url,
+        "latitude": User.latitude,
+        "longitude": User.longitude,
+        "geo_cell": _geo_cell(),
+        "bio": ProfessionalProfile.bio,
+        "category": ProfessionalProfile.category,
+        "profissional_identification": ProfessionalProfile.profissional_identification,
+        "services": ProfessionalProfile.services,
+        "price": ProfessionalProfile.price,
+        "only_online": ProfessionalProfile.only_online,
+        "only_presential": ProfessionalProfile.only_presential,
+        "rating": ProfessionalProfile.rating,
+        "num_reviews": ProfessionalProfile.num_reviews,
+        "available_days_of_week": ProfessionalProfile.available_days_of_week,
+        "start_hour": ProfessionalProfile.start_hour,
+        "end_hour": ProfessionalProfile.end_hour,
+        "weekday_mask": _weekday_mask(),
+        "tags": _profile_tags(ProfileTag.name, String),
+        "tag_ids": _profile_tags(ProfileTag.tag_id, Integer),
+        "updated_at": func.greatest(ProfessionalProfile.updated_at, User.updated_at),
+    }
+    query = select(*source.values()).join(User, User.id == ProfessionalProfile.user_id)
+    if profile_ids is not None:
+        query = query.where(ProfessionalProfile.id.in_(profile_ids))
+    if user_ids is not None:
+        query = query.where(ProfessionalProfile.user_id.in_(user_ids))
+
+    stmt = insert(ProfessionalDirectory).from_select(list(source), query)
+    return stmt.on_conflict_do_update(
+        index_elements=[ProfessionalDirectory.profile_id],
+        set_={column: stmt.excluded[column] for column in source if column != "profile_id"},
+    )
+
+
+class CRUDProfessionalDirectory:
+
+    async def refresh(
+        self,
+        db: AsyncSession,
+        *,
+        profile_ids: Sequence[int] | None = None,
+        user_ids: Sequence[int] | None = None,
+    ) -> None:
+        """Recalcular as linhas dos perfis informados na transação corrente."""
+        # A sessão não usa autoflush: as alterações pendentes precisam estar no banco
+        await db.flush()
+        await db.execute(build_refresh_statement(profile_ids=profile_ids, user_ids=user_ids))
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        """Reconstruir o diretório inteiro (sem commit)."""
+        await db.execute(delete(ProfessionalDirectory))
+        await db.execute(build_refresh_statement())
+
+    def _filter(
+        self,
+        query: Select,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+    ) -> Select:
+        if category:
+            query = query.where(ProfessionalDirectory.category == category)
+
+        if name:
+            query = query.where(ProfessionalDirectory.name.ilike(f"%{name}%"))
+
+        if only_online:
+            query = query.where(ProfessionalDirectory.only_online.is_(True))
+
+        if only_presential:
+            query = query.where(ProfessionalDirectory.only_presential.is_(True))
+
+        if tag_ids is not None:
+            # && (alguma) ou @> (todas) sobre o array de ids, ambos servidos pelo índice GIN;
+            # lista vazia = nenhuma das tags pedidas existe no dicionário
+            if not tag_ids:
+                query = query.where(false())
+            elif match == TagMatch.ALL:
+                query = query.where(ProfessionalDirectory.tag_ids.contains(tag_ids))
+            else:
+                query = query.where(ProfessionalDirectory.tag_ids.overlap(tag_ids))
+
+        if near is not None and radius_km is not None:
+            # As células da grade restringem o índice; o haversine corta o raio exato.
+            # Perfis só online não têm atendimento presencial a ser medido.
+            latitude, longitude = near
+            query = query.where(
+                ProfessionalDirectory.geo_cell.in_(cells_within(latitude, longitude, radius_km)),
+                _distance_km(latitude, longitude) <= radius_km,
+                ProfessionalDirectory.only_online.is_(False),
+            )
+
+        return query
+
+    def _order(self, query: Select, near: tuple[float, float] | None) -> Select:
+        if near is not None:
+            query = query.order_by(_distance_km(*near))
+        return query.order_by(ProfessionalDirectory.profile_id)
+
+    async def list_professionals(
+        self,
+        db: AsyncSession,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Sequence[Row]:
+        """
+        Colunas de ``ProfessionalProfileResponse``, na ordem e com os nomes do schema
+        (mais ``distance_km`` na busca por proximidade).
+        """
+        columns = [
+            ProfessionalDirectory.bio,
+            ProfessionalDirectory.category,
+            ProfessionalDirectory.profissional_identification,
+            ProfessionalDirectory.services,
+            ProfessionalDirectory.price,
+            ProfessionalDirectory.only_online,
+            ProfessionalDirectory.only_presential,
+            ProfessionalDirectory.available_days_of_week,
+            ProfessionalDirectory.start_hour,
+            ProfessionalDirectory.end_hour,
+            ProfessionalDirectory.profile_id.label("id"),
+            ProfessionalDirectory.user_id,
+            ProfessionalDirectory.rating,
+            ProfessionalDirectory.num_reviews,
+            ProfessionalDirectory.name.label("user_name"),
+            ProfessionalDirectory.email,
+            ProfessionalDirectory.phone,
+            ProfessionalDirectory.cep,
+            ProfessionalDirectory.uf,
+            ProfessionalDirectory.city,
+            ProfessionalDirectory.address,
+            ProfessionalDirectory.profile_image_url,
+            ProfessionalDirectory.tags,
+        ]
+        if near is not None:
+            columns.append(_distance_km(*near).label("distance_km"))
+
+        query = self._filter(
+            select(*columns),
+            category=category,
+            name=name,
+            tag_ids=tag_ids,
+            match=match,
+            only_online=only_online,
+            only_presential=only_presential,
+            near=near,
+            radius_km=radius_km,
+        )
+
+        query = self._order(query, near).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.all()
+
+    async def list_versions(
+        self,
+        db: AsyncSession,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[tuple[int, datetime]]:
+        """``(profile_id, updated_at)`` da página, para o validador HTTP."""
+        query = select(ProfessionalDirectory.profile_id, ProfessionalDirectory.updated_at)
+        query = self._filter(
+            query,
+            category=category,
+            name=name,
+            tag_ids=tag_ids,
+            match=match,
+            only_online=only_online,
+            only_presential=only_presential,
+            near=near,
+            radius_km=radius_km,
+        )
+
+        query = self._order(query, near).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return [(row[0], row[1]) for row in result.all()]
+
+
+    async def count(
+        self,
+        db: AsyncSession,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+    ) -> int:
+        query = self._filter(
+            select(func.count()).select_from(ProfessionalDirectory),
+            category=category,
+            name=name,
+            tag_ids=tag_ids,
+            match=match,
+            only_online=only_online,
+            only_presential=only_presential,
+            near=near,
+            radius_km=radius_km,
+        )
+        return await db.scalar(query) or 0
+
+    async def tag_facets(
+        self,
+        db: AsyncSession,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        limit: int = 20,
+    ) -> list[tuple[str, int]]:
+        """``(tag, perfis)`` das tags mais frequentes entre todos os perfis filtrados."""
+        matches = self._filter(
+            select(func.unnest(ProfessionalDirectory.tag_ids).label("tag_id")),
+            category=category,
+            name=name,
+            tag_ids=tag_ids,
+            match=match,
+            only_online=only_online,
+            only_presential=only_presential,
+            near=near,
+            radius_km=radius_km,
+        ).subquery()
+
+        total = func.count().label("count")
+        query = (
+            select(Tag.name, total)
+            .select_from(matches)
+            .join(Tag, Tag.id == matches.c.tag_id)
+            .group_by(Tag.id, Tag.name)
+            .order_by(total.desc(), Tag.name)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return [(row[0], row[1]) for row in result.all()]
+
+    async def get_version(
+        self,
+        db: AsyncSession,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+    ) -> Row:
+        """``count(*)`` e ``max(updated_at)`` dos perfis filtrados (validador das facetas)."""
+        query = self._filter(
+            select(
+                func.count().label("count"),
+                func.max(ProfessionalDirectory.updated_at).label("updated_at"),
+            ),
+            category=category,
+            name=name,
+            tag_ids=tag_ids,
+            match=match,
+            only_online=only_online,
+            only_presential=only_presential,
+            near=near,
+            radius_km=radius_km,
+        )
+        result = await db.execute(query)
+        return result.one()
+
+    async def facets(
+        self,
+        db: AsyncSession,
+        *,
+        category: str | None = None,
+        name: str | None = None,
+        tag_ids: list[int] | None = None,
+        match: TagMatch = TagMatch.ANY,
+        only_online: bool | None = None,
+        only_presential: bool | None = None,
+        near: tuple[float, float] | None = None,
+        radius_km: float | None = None,
+        tag_limit: int = 20,
+    ) -> list[tuple[str, str | None, int]]:
+        """
+        Linhas ``(faceta, valor, perfis)`` de uma única consulta: ``GROUPING SETS`` sobre
+        categoria, online e presencial (mais o total, com faceta ``"total"``), unido às
+        tags mais frequentes. Os perfis filtrados são lidos uma só vez, numa CTE.
+        """
+        matches = self._filter(
+            select(
+                ProfessionalDirectory.category,
+                ProfessionalDirectory.only_online,
+                ProfessionalDirectory.only_presential,
+                ProfessionalDirectory.tag_ids,
+            ),
+            category=category,
+            name=name,
+            tag_ids=tag_ids,
+            match=match,
+            only_online=only_online,
+            only_presential=only_presential,
+            near=near,
+            radius_km=radius_km,
+        ).cte("matches")
+
+        facet = case(
+            (func.grouping(matches.c.category) == 0, "category"),
+            (func.grouping(matches.c.only_online) == 0, "only_online"),
+            (func.grouping(matches.c.only_presential) == 0, "only_presential"),
+            else_="total",
+        )
+        # Fora do próprio grupo as demais colunas vêm nulas; o coalesce pega o valor do grupo
+        value = func.coalesce(
+            matches.c.category,
+            cast(matches.c.only_online, String),
+            cast(matches.c.only_presential, String),
+        )
+        grouped = select(
+            facet.label("facet"), value.label("value"), func.count().label("count")
+        ).group_by(
+            func.grouping_sets(
+                tuple_(matches.c.category),
+                tuple_(matches.c.only_online),
+                tuple_(matches.c.only_presential),
+                tuple_(),
+            )
+        )
+
+        tag_id = select(func.unnest(matches.c.tag_ids).label("tag_id")).subquery()
+        top_tags = (
+            select(Tag.name.label("value"), func.count().label("count"))
+            .select_from(tag_id)
+            .join(Tag, Tag.id == tag_id.c.tag_id)
+            .group_by(Tag.id, Tag.name)
+            .order_by(func.count().desc(), Tag.name)
+            .limit(tag_limit)
+            .subquery()
+        )
+        tags = select(literal("tags").label("facet"), top_tags.c.value, top_tags.c.count)
+
+        result = await db.execute(union_all(grouped, tags))
+        return [(row[0], row[1], row[2]) for row in result.all()]
+
+directory_crud = CRUDProfessionalDirectory()
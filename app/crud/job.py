@@ -0,0 +1,202 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Row, and_, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.enums import JobKind, JobStatus
+from app.models.job import Job
+
+pending_job = aliased(Job)
+# Predicado literal de ``uq_jobs_pending_key``: com parâmetro o Postgres não infere o índice
+PENDING_KEY_WHERE = text("status = 'pending'")
+
+
+class CRUDJob:
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        kind: JobKind,
+        payload: dict[str, Any] | None = None,
+        data: bytes | None = None,
+        key: str | None = None,
+        run_at: datetime | None = None,
+        max_attempts: int = 5,
+    ) -> None:
+        """
+        Gravar a tarefa na transação corrente: ela só fica visível para os workers
+        quando a escrita de domínio for confirmada. Com ``key``, uma tarefa pendente
+        com a mesma chave absorve a nova. Os horários seguem o relógio do banco, o
+        mesmo usado pela fila.
+        """
+        stmt = insert(Job).values(
+            kind=kind.value,
+            payload=payload or {},
+            data=data,
+            key=key,
+            status=JobStatus.PENDING.value,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_at=run_at if run_at is not None else func.localtimestamp(),
+            created_at=func.localtimestamp(),
+            updated_at=func.localtimestamp(),
+        )
+        if key is not None:
+            stmt = stmt.on_conflict_do_nothing(
+                index_elements=[Job.key], index_where=PENDING_KEY_WHERE
+            )
+        await db.execute(stmt)
+
+    async def enqueue_many(
+        self,
+        db: AsyncSession,
+        *,
+        kind: JobKind,
+        jobs: Sequence[tuple[str | None, dict[str, Any]]],
+        max_attempts: int = 5,
+    ) -> None:
+        """Como ``enqueue``, para vários ``(key, payload)`` em um único INSERT."""
+        if not jobs:
+            return
+        stmt = insert(Job).values(
+            [
+                {
+                    "kind": kind.value,
+                    "payload": payload,
+                    "key": key,
+                    "status": JobStatus.PENDING.value,
+                    "attempts": 0,
+                    "max_attempts": max_attempts,
+                    "run_at": func.localtimestamp(),
+                    "created_at": func.localtimestamp(),
+                    "updated_at": func.localtimestamp(),
+                }
+                for key, payload in jobs
+            ]
+        ).on_conflict_do_nothing(
+            index_elements=[Job.key], index_where=PENDING_KEY_WHERE
+        )
+        await db.execute(stmt)
+
+    async def claim(
+        self, db: AsyncSession, *, limit: int, lock_timeout: timedelta
+    ) -> Sequence[Row]:
+        """
+        Reservar até ``limit`` tarefas prontas (``FOR UPDATE SKIP LOCKED``, então
+        vários workers não disputam as mesmas linhas). Tarefas ``running`` presas há
+        mais de ``lock_timeout`` (worker que morreu) voltam a ser elegíveis enquanto
+        ainda têm tentativas; as que já gastaram todas viram falha definitiva.
+        """
+        now = func.localtimestamp()
+        stale = and_(
+            Job.status == JobStatus.RUNNING.value,
+            Job.locked_at < now - lock_timeout,
+        )
+        exhausted = (
+            select(Job.id)
+            .where(stale, Job.attempts >= Job.max_attempts)
+            .with_for_update(skip_locked=True)
+        )
+        await db.execute(
+            update(Job)
+            .where(Job.id.in_(exhausted.scalar_subquery()))
+            .values(
+                status=JobStatus.FAILED.value,
+                locked_at=None,
+                last_error="Lock expired with no attempts left",
+                updated_at=now,
+            )
+        )
+
+        ready = (
+            select(Job.id)
+            .where(
+                or_(
+                    and_(Job.status == JobStatus.PENDING.value, Job.run_at <= now),
+                    and_(stale, Job.attempts < Job.max_attempts),
+                )
+            )
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id.in_(ready.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING.value,
+                locked_at=now,
+                attempts=Job.attempts + 1,
+                updated_at=now,
+            )
+            .returning(Job.id, Job.kind, Job.payload, Job.data, Job.attempts, Job.max_attempts)
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
+    async def complete(self, db: AsyncSession, *, job_id: int) -> None:
+        await db.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=JobStatus.DONE.value,
+                data=None,
+                locked_at=None,
+                last_error=None,
+                updated_at=func.localtimestamp(),
+            )
+        )
+
+    async def fail(
+        self, db: AsyncSession, *, job_id: int, error: str, retry_in: timedelta | None
+    ) -> None:
+        """Reagendar após ``retry_in`` ou, sem ele, marcar como falha definitiva."""
+        # Se outra tarefa pendente com a mesma chave já existe, ela fará o mesmo trabalho
+        superseded = await db.execute(
+            update(Job)
+            .where(
+                Job.id == job_id,
+                select(pending_job.id)
+                .where(pending_job.key == Job.key, pending_job.status == JobStatus.PENDING.value)
+                .exists(),
+            )
+            .values(
+                status=JobStatus.DONE.value,
+                data=None,
+                locked_at=None,
+                last_error=error,
+                updated_at=func.localtimestamp(),
+            )
+        )
+        if superseded.rowcount:
+            return
+
+        values: dict[str, Any] = {
+            "locked_at": None,
+            "last_error": error,
+            "updated_at": func.localtimestamp(),
+        }
+        if retry_in is None:
+            values["status"] = JobStatus.FAILED.value
+        else:
+            values["status"] = JobStatus.PENDING.value
+            values["run_at"] = func.localtimestamp() + retry_in
+        await db.execute(update(Job).where(Job.id == job_id).values(**values))
+
+    async def purge(self, db: AsyncSession, *, older_than: timedelta) -> int:
+        """Apagar tarefas concluídas há mais de ``older_than``."""
+        result = await db.execute(
+            Job.__table__.delete().where(
+                Job.status == JobStatus.DONE.value,
+                Job.updated_at < func.localtimestamp() - older_than,
+            )
+        )
+        return result.rowcount
+
+
+job_crud = CRUDJob()
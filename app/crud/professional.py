@@ -1,9 +1,11 @@
-from sqlalchemy import select
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.crud import statements
 from app.crud.base import CRUDBase
-from app.models.professional import ProfessionalProfile, ProfileTag
+from app.models.professional import ProfessionalProfile
 from app.models.review import Review
 from app.models.user import User
 from app.schemas.professional import (
@@ -19,30 +21,13 @@ class CRUDProfessionalProfile(
     async def get_by_user_id(
         self, db: AsyncSession, *, user_id: int
     ) -> ProfessionalProfile | None:
-        result = await db.execute(
-            select(ProfessionalProfile)
-            .where(ProfessionalProfile.user_id == user_id)
-            .options(
-                joinedload(ProfessionalProfile.user),
-                joinedload(ProfessionalProfile.tags),
-                joinedload(ProfessionalProfile.unavailable_dates),
-            )
-        )
+        result = await db.execute(statements.profile_by_user_id(user_id))
         return result.unique().scalar_one_or_none()
 
     async def get_with_relations(
         self, db: AsyncSession, *, fk: int
     ) -> ProfessionalProfile | None:
-        result = await db.execute(
-            select(ProfessionalProfile)
-            .where(ProfessionalProfile.id == fk)
-            .options(
-                joinedload(ProfessionalProfile.user),
-                joinedload(ProfessionalProfile.tags),
-                joinedload(ProfessionalProfile.unavailable_dates),
-                joinedload(ProfessionalProfile.reviews).joinedload(Review.patient),
-            )
-        )
+        result = await db.execute(statements.profile_with_relations(fk))
         return result.unique().scalar_one_or_none()
 
     async def get_by_identification(
@@ -55,47 +40,59 @@ class CRUDProfessionalProfile(
         )
         return result.scalar_one_or_none()
 
-    async def list_professionals(
-        self,
-        db: AsyncSession,
-        *,
-        category: str | None = None,
-        name: str | None = None,
-        tags: list[str] | None = None,
-        only_online: bool | None = None,
-        only_presential: bool | None = None,
-        skip: int = 0,
-        limit: int = 100,
-    ) -> list[ProfessionalProfile]:
-        query = select(ProfessionalProfile).options(
-            joinedload(ProfessionalProfile.user),
-            joinedload(ProfessionalProfile.tags),
+    async def exists(self, db: AsyncSession, *, profile_id: int) -> bool:
+        result = await db.execute(
+            select(ProfessionalProfile.id).where(ProfessionalProfile.id == profile_id)
         )
+        return result.scalar_one_or_none() is not None
 
-        if category:
-            query = query.where(ProfessionalProfile.category == category)
-
-        if name:
-            query = query.join(ProfessionalProfile.user).where(
-                User.name.ilike(f"%{name}%")
+    async def is_unavailable(
+        self, db: AsyncSession, *, profile_id: int, target_date: date
+    ) -> bool:
+        """Se o profissional marcou ``target_date`` como indisponível."""
+        day_start = datetime.combine(target_date, datetime.min.time())
+        result = await db.execute(
+            statements.unavailable_between(
+                profile_id, day_start, day_start + timedelta(days=1)
             )
+        )
+        return result.scalar_one_or_none() is not None
 
-        if only_online is not None and only_online:
-            query = query.where(ProfessionalProfile.only_online.is_(True))
-
-        if only_presential is not None and only_presential:
-            query = query.where(ProfessionalProfile.only_presential.is_(True))
+    async def get_version(
+        self,
+        db: AsyncSession,
+        *,
+        profile_id: int | None = None,
+        user_id: int | None = None,
+        include_reviews: bool = False,
+    ) -> Row | None:
+        """Versão do perfil: ``updated_at`` do perfil e do usuário e, opcionalmente,
+        ``max(updated_at)``/``count`` das avaliações.
+        """
+        columns = [
+            ProfessionalProfile.id,
+            ProfessionalProfile.updated_at,
+            User.updated_at.label("user_updated_at"),
+        ]
+        if include_reviews:
+            columns += [
+                select(func.max(Review.updated_at))
+                .where(Review.professional_id == ProfessionalProfile.id)
+                .scalar_subquery()
+                .label("reviews_updated_at"),
+                select(func.count(Review.id))
+                .where(Review.professional_id == ProfessionalProfile.id)
+                .scalar_subquery()
+                .label("reviews_count"),
+            ]
 
-        if tags:
-            query = (
-                query.join(ProfessionalProfile.tags)
-                .where(ProfileTag.name.in_(tags))
-                .distinct()
-            )
+        query = select(*columns).join(ProfessionalProfile.user)
+        if profile_id is not None:
+            query = query.where(ProfessionalProfile.id == profile_id)
+        else:
+            query = query.where(ProfessionalProfile.user_id == user_id)
 
-        query = query.offset(skip).limit(limit)
         result = await db.execute(query)
-        return list(result.unique().scalars().all())
-
+        return result.one_or_none()
 
 professional_crud = CRUDProfessionalProfile(ProfessionalProfile)
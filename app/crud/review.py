@@ -1,10 +1,13 @@
 
+from datetime import datetime
+
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.crud.base import CRUDBase
 from app.models.review import Review
+from app.models.user import User
 from app.schemas.review import ReviewCreate, ReviewUpdate
 
 
@@ -48,6 +51,46 @@ class CRUDReview(CRUDBase[Review, ReviewCreate, ReviewUpdate]):
         )
         return result.scalar_one()
 
+    async def get_version_by_professional(
+        self, db: AsyncSession, *, professional_id: int
+    ) -> tuple[datetime | None, int]:
+        """``max(updated_at)`` (avaliação ou paciente exibido) e total de avaliações."""
+        result = await db.execute(
+            select(
+                func.max(func.greatest(Review.updated_at, User.updated_at)),
+                func.count(Review.id),
+            )
+            .join(User, User.id == Review.patient_id)
+            .where(Review.professional_id == professional_id)
+        )
+        last_modified, count = result.one()
+        return last_modified, count
+
+    async def get_version_by_patient(
+        self, db: AsyncSession, *, patient_id: int
+    ) -> tuple[datetime | None, int]:
+        result = await db.execute(
+            select(
+                func.max(func.greatest(Review.updated_at, User.updated_at)),
+                func.count(Review.id),
+            )
+            .join(User, User.id == Review.patient_id)
+            .where(Review.patient_id == patient_id)
+        )
+        last_modified, count = result.one()
+        return last_modified, count
+
+    async def get_version(
+        self, db: AsyncSession, *, review_id: int
+    ) -> tuple[int, datetime] | None:
+        result = await db.execute(
+            select(Review.id, func.greatest(Review.updated_at, User.updated_at))
+            .join(User, User.id == Review.patient_id)
+            .where(Review.id == review_id)
+        )
+        row = result.one_or_none()
+        return (row[0], row[1]) if row else None
+
     async def get_by_patient(
         self,
         db: AsyncSession,
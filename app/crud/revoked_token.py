@@ -0,0 +1,27 @@
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.revoked_token import RevokedToken
+
+
+class CRUDRevokedToken:
+
+    async def add(self, db: AsyncSession, *, jti: str, user_id: int, expires_at: int) -> None:
+        """Revogar o token; revogar de novo o mesmo ``jti`` não faz nada."""
+        await db.execute(
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+        )
+
+    async def active_jtis(self, db: AsyncSession, *, now: int) -> list[str]:
+        result = await db.execute(select(RevokedToken.jti).where(RevokedToken.expires_at > now))
+        return list(result.scalars())
+
+    async def purge_expired(self, db: AsyncSession, *, now: int) -> int:
+        result = await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        return result.rowcount
+
+
+revoked_token_crud = CRUDRevokedToken()
@@ -0,0 +1,130 @@
+import secrets
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Row, and_, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import statements
+from app.models.slot_hold import SlotHold
+
+
+class CRUDSlotHold:
+
+    async def find_active(
+        self,
+        db: AsyncSession,
+        *,
+        professional_id: int,
+        windows: list[tuple[datetime, datetime]],
+        exclude_patient_id: int | None = None,
+    ) -> Sequence[Row]:
+        """Reservas ainda válidas que se sobrepõem a alguma das janelas."""
+        query = select(SlotHold.start_time, SlotHold.end_time).where(
+            SlotHold.professional_id == professional_id,
+            SlotHold.start_time < max(end for _, end in windows),
+            SlotHold.end_time > min(start for start, _ in windows),
+            or_(
+                *(
+                    and_(SlotHold.start_time < end, SlotHold.end_time > start)
+                    for start, end in windows
+                )
+            ),
+            SlotHold.expires_at > func.localtimestamp(),
+        )
+        if exclude_patient_id is not None:
+            query = query.where(SlotHold.patient_id != exclude_patient_id)
+        result = await db.execute(query)
+        return result.all()
+
+    async def get_active_for_day(
+        self, db: AsyncSession, *, professional_id: int, target_date: date
+    ) -> Sequence[Row]:
+        day_start = datetime.combine(target_date, datetime.min.time())
+        result = await db.execute(
+            statements.active_holds_between(
+                professional_id, day_start, day_start + timedelta(days=1)
+            )
+        )
+        return result.all()
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        professional_id: int,
+        patient_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        ttl: timedelta,
+    ) -> Row:
+        """
+        Criar a reserva, substituindo as que o paciente já tinha com o profissional
+        e limpando as expiradas do profissional.
+        """
+        await db.execute(
+            delete(SlotHold).where(
+                SlotHold.professional_id == professional_id,
+                (SlotHold.patient_id == patient_id)
+                | (SlotHold.expires_at <= func.localtimestamp()),
+            )
+        )
+        result = await db.execute(
+            insert(SlotHold)
+            .values(
+                token=secrets.token_urlsafe(24),
+                professional_id=professional_id,
+                patient_id=patient_id,
+                start_time=start_time,
+                end_time=end_time,
+                expires_at=func.localtimestamp() + ttl,
+                created_at=func.localtimestamp(),
+            )
+            .returning(
+                SlotHold.token,
+                SlotHold.professional_id,
+                SlotHold.start_time,
+                SlotHold.end_time,
+                SlotHold.expires_at,
+            )
+        )
+        return result.one()
+
+    async def consume(
+        self,
+        db: AsyncSession,
+        *,
+        token: str,
+        patient_id: int,
+        professional_id: int,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> bool:
+        """
+        Remover a reserva válida do paciente para exatamente este horário. Um único
+        DELETE: dois agendamentos com o mesmo token não conseguem consumi-la juntos.
+        """
+        result = await db.execute(
+            delete(SlotHold)
+            .where(
+                SlotHold.token == token,
+                SlotHold.patient_id == patient_id,
+                SlotHold.professional_id == professional_id,
+                SlotHold.start_time == start_time,
+                SlotHold.end_time == end_time,
+                SlotHold.expires_at > func.localtimestamp(),
+            )
+            .returning(SlotHold.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def release(self, db: AsyncSession, *, token: str, patient_id: int) -> bool:
+        result = await db.execute(
+            delete(SlotHold)
+            .where(SlotHold.token == token, SlotHold.patient_id == patient_id)
+            .returning(SlotHold.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+
+slot_hold_crud = CRUDSlotHold()
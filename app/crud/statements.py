@@ -0,0 +1,119 @@
+"""Consultas dos caminhos quentes como ``lambda_stmt``.
+
+Um ``select()`` comum é remontado a cada chamada e o SQLAlchemy ainda percorre a
+árvore inteira para calcular a chave do cache de compilação. Com ``lambda_stmt``
+a construção roda uma vez por ponto do código: nas chamadas seguintes a chave sai
+do código da lambda e os valores capturados viram parâmetros. O SQL gerado é
+sempre o mesmo texto, então o asyncpg reaproveita o prepared statement do
+servidor (``DATABASE_PREPARED_STATEMENT_CACHE_SIZE`` por conexão).
+
+Cuidados ao adicionar consultas aqui: a lambda só pode capturar valores que
+viram parâmetros (números, strings, datas); partes opcionais do SQL entram com
+``stmt += lambda s: ...`` dentro de um ``if``, nunca com condicionais dentro da
+lambda. Cada função corresponde a um método do CRUD.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import StatementLambdaElement, func, lambda_stmt, select
+from sqlalchemy.orm import joinedload
+
+from app.models.appointment import Appointment
+from app.models.enums import AppointmentStatus
+from app.models.professional import ProfessionalProfile, UnavailableDate
+from app.models.review import Review
+from app.models.slot_hold import SlotHold
+from app.models.user import User
+
+
+def appointment_conflicts(
+    professional_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_id: int | None = None,
+) -> StatementLambdaElement:
+    stmt = lambda_stmt(
+        lambda: select(Appointment).where(
+            Appointment.professional_id == professional_id,
+            Appointment.start_time < end_time,
+            Appointment.end_time > start_time,
+            Appointment.status != AppointmentStatus.CANCELLED,
+        )
+    )
+    if exclude_id:
+        stmt += lambda s: s.where(Appointment.id != exclude_id)
+    return stmt
+
+
+def booked_windows(
+    professional_id: int, start_time: datetime, end_time: datetime
+) -> StatementLambdaElement:
+    """Início e fim das consultas não canceladas que começam em ``[start, end)``."""
+    return lambda_stmt(
+        lambda: select(Appointment.start_time, Appointment.end_time).where(
+            Appointment.professional_id == professional_id,
+            Appointment.start_time >= start_time,
+            Appointment.start_time < end_time,
+            Appointment.status != AppointmentStatus.CANCELLED,
+        )
+    )
+
+
+def active_holds_between(
+    professional_id: int, start_time: datetime, end_time: datetime
+) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(SlotHold.start_time, SlotHold.end_time).where(
+            SlotHold.professional_id == professional_id,
+            SlotHold.start_time < end_time,
+            SlotHold.end_time > start_time,
+            SlotHold.expires_at > func.localtimestamp(),
+        )
+    )
+
+
+def unavailable_between(
+    profile_id: int, start_time: datetime, end_time: datetime
+) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(UnavailableDate.id)
+        .where(
+            UnavailableDate.profile_id == profile_id,
+            UnavailableDate.date >= start_time,
+            UnavailableDate.date < end_time,
+        )
+        .limit(1)
+    )
+
+
+def profile_by_user_id(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(ProfessionalProfile)
+        .where(ProfessionalProfile.user_id == user_id)
+        .options(
+            joinedload(ProfessionalProfile.user),
+            joinedload(ProfessionalProfile.tags),
+            joinedload(ProfessionalProfile.unavailable_dates),
+        )
+    )
+
+
+def profile_with_relations(profile_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(ProfessionalProfile)
+        .where(ProfessionalProfile.id == profile_id)
+        .options(
+            joinedload(ProfessionalProfile.user),
+            joinedload(ProfessionalProfile.tags),
+            joinedload(ProfessionalProfile.unavailable_dates),
+            joinedload(ProfessionalProfile.reviews).joinedload(Review.patient),
+        )
+    )
+
+
+def user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+
+def user_by_cpf(cpf: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.cpf == cpf))
@@ -0,0 +1,88 @@
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import Insert, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.professional import ProfileTag, Tag
+from app.utils.validators import normalize_tag
+
+
+def unique_tags(names: Iterable[str]) -> dict[str, str]:
+    """``{normalizado: nome}`` mantendo a primeira grafia de cada tag e a ordem."""
+    tags: dict[str, str] = {}
+    for name in names:
+        if (normalized := normalize_tag(name)) and normalized not in tags:
+            tags[normalized] = name.strip()
+    return tags
+
+
+def build_upsert_statement(names: Iterable[str]) -> Insert:
+    """
+    Insere no dicionário as tags que ainda não existem e retorna
+    ``(normalized, id)`` de todas elas (novas e já existentes).
+    """
+    values = [
+        {"name": name, "normalized": normalized}
+        for normalized, name in unique_tags(names).items()
+    ]
+    stmt = insert(Tag).values(values)
+    # DO UPDATE sem alteração real para que o RETURNING inclua as linhas existentes
+    return stmt.on_conflict_do_update(
+        index_elements=[Tag.normalized], set_={"normalized": stmt.excluded.normalized}
+    ).returning(Tag.normalized, Tag.id)
+
+
+class CRUDTag:
+
+    async def get_or_create_ids(
+        self, db: AsyncSession, names: Iterable[str]
+    ) -> dict[str, int]:
+        """``{normalizado: id}`` das tags, cadastrando as novas no dicionário."""
+        names = list(names)
+        if not unique_tags(names):
+            return {}
+        result = await db.execute(build_upsert_statement(names))
+        return dict(result.all())
+
+    async def get_ids(self, db: AsyncSession, names: Iterable[str]) -> list[int | None]:
+        """
+        Ids das tags informadas, na ordem de ``names`` sem repetições; ``None`` para
+        tags que não existem no dicionário.
+        """
+        wanted = list(unique_tags(names))
+        if not wanted:
+            return []
+        result = await db.execute(
+            select(Tag.normalized, Tag.id).where(Tag.normalized.in_(wanted))
+        )
+        found = dict(result.all())
+        return [found.get(normalized) for normalized in wanted]
+
+    async def get_names(self, db: AsyncSession, tag_ids: Sequence[int]) -> dict[int, str]:
+        if not tag_ids:
+            return {}
+        result = await db.execute(select(Tag.id, Tag.name).where(Tag.id.in_(tag_ids)))
+        return dict(result.all())
+
+    async def build_profile_tags(
+        self, db: AsyncSession, names: Iterable[str]
+    ) -> list[ProfileTag]:
+        """``ProfileTag`` já ligadas ao dicionário, sem repetir tags equivalentes."""
+        tags = unique_tags(names)
+        tag_ids = await self.get_or_create_ids(db, tags.values())
+        return [
+            ProfileTag(name=name, tag_id=tag_ids[normalized])
+            for normalized, name in tags.items()
+        ]
+
+    async def add_profile_tags(
+        self, db: AsyncSession, *, profile_id: int, names: Iterable[str]
+    ) -> list[ProfileTag]:
+        profile_tags = await self.build_profile_tags(db, names)
+        for profile_tag in profile_tags:
+            profile_tag.profile_id = profile_id
+        db.add_all(profile_tags)
+        return profile_tags
+
+tag_crud = CRUDTag()
@@ -1,29 +1,74 @@
 
-from sqlalchemy import select
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Float, Update, column, func, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import statements
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.utils.cep_geo import geocode_cep, prefix_table
+
+
+def _location(cep: str | None) -> dict[str, float | None]:
+    latitude, longitude = geocode_cep(cep) or (None, None)
+    return {"latitude": latitude, "longitude": longitude}
+
+
+def build_geocode_statement(*, user_ids: Sequence[int] | None = None) -> Update:
+    """
+    Preenche ``latitude``/``longitude`` de todos os usuários (ou dos informados) com um
+    único UPDATE, juntando os CEPs à tabela de prefixos expandida para 3 dígitos.
+    """
+    size, rows = prefix_table()
+    prefixes = values(
+        column("prefix"), column("latitude", Float), column("longitude", Float),
+        name="cep_prefixes",
+    ).data(rows)
+    digits = func.regexp_replace(func.coalesce(User.cep, ""), r"\D", "", "g")
+
+    stmt = (
+        update(User)
+        .values(latitude=prefixes.c.latitude, longitude=prefixes.c.longitude)
+        .where(func.length(digits) == 8, func.left(digits, size) == prefixes.c.prefix)
+    )
+    if user_ids is not None:
+        stmt = stmt.where(User.id.in_(user_ids))
+    return stmt.execution_options(synchronize_session=False)
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 
     async def get_by_email(self, db: AsyncSession, *, email: str) -> User | None:
-        result = await db.execute(select(User).where(User.email == email))
+        result = await db.execute(statements.user_by_email(email))
         return result.scalar_one_or_none()
 
     async def get_by_cpf(self, db: AsyncSession, *, cpf: str) -> User | None:
-        result = await db.execute(select(User).where(User.cpf == cpf))
+        result = await db.execute(statements.user_by_cpf(cpf))
         return result.scalar_one_or_none()
 
     async def create_user(self, db: AsyncSession, *, obj_in: UserCreate, hashed_password: str) -> User:
         obj_data = obj_in.model_dump(exclude={"password", "profissional_identification", "category"})
-        db_obj = User(**obj_data, password=hashed_password)
+        db_obj = User(**obj_data, **_location(obj_data.get("cep")), password=hashed_password)
         db.add(db_obj)
         await db.flush()
         await db.refresh(db_obj)
         return db_obj
 
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate | dict[str, Any]
+    ) -> User:
+        update_data = (
+            obj_in
+            if isinstance(obj_in, dict)
+            else obj_in.model_dump(exclude_unset=True)
+        )
+        # Coordenadas acompanham o CEP
+        if "cep" in update_data:
+            update_data = {**update_data, **_location(update_data["cep"])}
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
 
 user_crud = CRUDUser(User)
@@ -0,0 +1,16 @@
+"""Execução em segundo plano dos efeitos colaterais gravados na outbox ``jobs``."""
+
+from app.jobs import tasks  # noqa: F401  (registra os handlers)
+from app.jobs.periodic import PeriodicTask
+from app.jobs.reminders import ReminderScheduler
+from app.jobs.revocations import TokenRevocationSync
+from app.jobs.transitions import AppointmentTransitionScheduler
+from app.jobs.worker import JobWorker
+
+__all__ = [
+    "JobWorker",
+    "PeriodicTask",
+    "ReminderScheduler",
+    "AppointmentTransitionScheduler",
+    "TokenRevocationSync",
+]
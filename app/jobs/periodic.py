@@ -0,0 +1,38 @@
+import asyncio
+import contextlib
+import logging
+from abc import ABC, abstractmethod
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask(ABC):
+    """
+    Laço que chama ``run_once`` a cada ``poll_interval`` segundos até ``stop``.
+    Falhas são registradas e a próxima rodada acontece normalmente.
+    """
+
+    name = "periodic task"
+
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession], *, poll_interval: float
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        stop = stop or asyncio.Event()
+        logger.info("%s started", self.name.capitalize())
+        while not stop.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("%s failed", self.name.capitalize())
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+        logger.info("%s stopped", self.name.capitalize())
+
+    @abstractmethod
+    async def run_once(self) -> int: ...
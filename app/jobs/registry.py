@@ -0,0 +1,25 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.enums import JobKind
+
+# handler(db, payload, data): roda numa transação própria, confirmada pelo worker
+Handler = Callable[[AsyncSession, dict[str, Any], bytes | None], Awaitable[None]]
+
+_handlers: dict[str, Handler] = {}
+
+
+def job_handler(kind: JobKind) -> Callable[[Handler], Handler]:
+    """Registrar a função que executa as tarefas de ``kind``."""
+
+    def register(handler: Handler) -> Handler:
+        _handlers[kind.value] = handler
+        return handler
+
+    return register
+
+
+def get_handler(kind: str) -> Handler | None:
+    return _handlers.get(kind)
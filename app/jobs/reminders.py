@@ -0,0 +1,48 @@
+import logging
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.jobs.periodic import PeriodicTask
+from app.services.reminder import reminder_service
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderScheduler(PeriodicTask):
+    """
+    Varre periodicamente as consultas que entram na janela de lembrete e enfileira
+    a entrega na outbox ``jobs``; quem envia é o ``JobWorker``. Cada lote é uma
+    transação curta, e várias instâncias podem rodar juntas (``SKIP LOCKED``).
+    """
+
+    name = "reminder scheduler"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        lead: timedelta = timedelta(minutes=settings.reminder_lead_minutes),
+        batch_size: int = settings.reminder_batch_size,
+        poll_interval: float = settings.reminder_poll_interval,
+    ):
+        super().__init__(session_factory, poll_interval=poll_interval)
+        self.lead = lead
+        self.batch_size = batch_size
+
+    async def run_once(self) -> int:
+        """Enfileirar todos os lembretes vencidos, um lote por transação."""
+        total = 0
+        while True:
+            async with self.session_factory() as db:
+                scheduled = await reminder_service.schedule_due(
+                    db, lead=self.lead, limit=self.batch_size
+                )
+                await db.commit()
+            total += scheduled
+            if scheduled < self.batch_size:
+                break
+        if total:
+            logger.info("Scheduled %d appointment reminders", total)
+        return total
@@ -0,0 +1,34 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.jobs.periodic import PeriodicTask
+from app.services.auth import sync_revoked_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRevocationSync(PeriodicTask):
+    """
+    Recarrega periodicamente, em cada processo da API, o conjunto em memória dos
+    tokens revogados (logout) e apaga do banco os que já expiraram. Um token
+    revogado em outro processo é recusado aqui em até ``poll_interval`` segundos.
+    """
+
+    name = "token revocation sync"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        poll_interval: float = settings.token_revocation_sync_interval,
+    ):
+        super().__init__(session_factory, poll_interval=poll_interval)
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as db:
+            revoked = await sync_revoked_tokens(db)
+            await db.commit()
+        logger.debug("Revocation list synced: %d active revoked tokens", revoked)
+        return revoked
@@ -0,0 +1,66 @@
+"""Tarefas executadas pelos workers a partir da outbox."""
+
+import asyncio
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs.registry import job_handler
+from app.models.enums import JobKind
+from app.services import user as user_service
+from app.services.notifier import get_notifier
+from app.services.reminder import reminder_service
+from app.services.review import review_service
+from app.services.s3 import s3_service
+from app.services.upload_spool import upload_spool
+
+
+@job_handler(JobKind.REFRESH_PROFESSIONAL_RATING)
+async def refresh_professional_rating(
+    db: AsyncSession, payload: dict[str, Any], data: bytes | None
+) -> None:
+    await review_service.update_professional_rating(
+        db, professional_id=payload["professional_id"]
+    )
+
+
+@job_handler(JobKind.UPLOAD_PROFILE_IMAGE)
+async def upload_profile_image(
+    db: AsyncSession, payload: dict[str, Any], data: bytes | None
+) -> None:
+    # Tarefas gravadas por versões anteriores trazem os bytes na própria linha
+    spool_key = payload.get("spool_key")
+    if data is None and spool_key is not None:
+        data = await asyncio.to_thread(upload_spool.read, spool_key)
+    if data is None:
+        raise ValueError("Profile image job without content")
+    # boto3 é síncrono: roda numa thread para não bloquear o event loop
+    await asyncio.to_thread(
+        s3_service.put_object,
+        key=payload["key"],
+        content=data,
+        content_type=payload["content_type"],
+    )
+    # Tarefas gravadas por versões anteriores não trazem a URL (já estava salva)
+    if "url" in payload:
+        await user_service.set_profile_image_url(db, payload["user_id"], payload["url"])
+    if spool_key is not None:
+        await asyncio.to_thread(upload_spool.remove, spool_key)
+
+
+@job_handler(JobKind.SEND_APPOINTMENT_REMINDER)
+async def send_appointment_reminder(
+    db: AsyncSession, payload: dict[str, Any], data: bytes | None
+) -> None:
+    await reminder_service.deliver(
+        db, appointment_id=payload["appointment_id"], notifier=get_notifier()
+    )
+
+
+@job_handler(JobKind.SEND_REVIEW_INVITATION)
+async def send_review_invitation(
+    db: AsyncSession, payload: dict[str, Any], data: bytes | None
+) -> None:
+    await review_service.send_review_invitation(
+        db, appointment_id=payload["appointment_id"], notifier=get_notifier()
+    )
@@ -0,0 +1,51 @@
+import logging
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.jobs.periodic import PeriodicTask
+from app.services.appointment import close_past_appointments
+
+logger = logging.getLogger(__name__)
+
+
+class AppointmentTransitionScheduler(PeriodicTask):
+    """
+    Encerra periodicamente as consultas que já terminaram: ``confirmed`` vira
+    ``completed`` e ``pending`` vira ``expired``. Cada lote de até ``batch_size``
+    consultas é uma transação curta (``SKIP LOCKED``, seguro com várias instâncias).
+    """
+
+    name = "appointment transition scheduler"
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        grace: timedelta = timedelta(minutes=settings.appointment_transition_grace_minutes),
+        batch_size: int = settings.appointment_transition_batch_size,
+        poll_interval: float = settings.appointment_transition_interval,
+    ):
+        super().__init__(session_factory, poll_interval=poll_interval)
+        self.grace = grace
+        self.batch_size = batch_size
+
+    async def run_once(self) -> int:
+        """Encerrar todas as consultas vencidas, um lote por transação."""
+        completed = expired = 0
+        while True:
+            async with self.session_factory() as db:
+                counts = await close_past_appointments(
+                    db, grace=self.grace, limit=self.batch_size
+                )
+                await db.commit()
+            completed += counts["completed"]
+            expired += counts["expired"]
+            if max(counts.values()) < self.batch_size:
+                break
+        if completed or expired:
+            logger.info(
+                "Closed past appointments: %d completed, %d expired", completed, expired
+            )
+        return completed + expired
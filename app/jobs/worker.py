@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import logging
+import random
+from datetime import timedelta
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.crud.job import job_crud
+from app.jobs.registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Consome a outbox ``jobs``: reserva lotes com ``SKIP LOCKED`` e executa cada tarefa
+    em sua própria sessão, com no máximo ``concurrency`` tarefas simultâneas. Pode rodar
+    dentro da API (lifespan) ou em processos separados (``scripts/run_worker.py``).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        concurrency: int = settings.job_concurrency,
+        batch_size: int = settings.job_batch_size,
+        poll_interval: float = settings.job_poll_interval,
+        lock_timeout: timedelta = timedelta(seconds=settings.job_lock_timeout_seconds),
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self._slots = asyncio.Semaphore(concurrency)
+        self._running: set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        stop = stop or asyncio.Event()
+        logger.info("Job worker started (concurrency=%d)", self.concurrency)
+        try:
+            while not stop.is_set():
+                try:
+                    claimed = await self.run_once()
+                except Exception:
+                    logger.exception("Failed to claim jobs")
+                    claimed = 0
+
+                # Lote cheio: provavelmente há mais tarefas prontas, sem esperar
+                if claimed < self.batch_size:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+        finally:
+            await self.drain()
+            logger.info("Job worker stopped")
+
+    async def run_once(self) -> int:
+        """Reservar um lote (limitado às vagas livres) e disparar as tarefas."""
+        await self._slots.acquire()
+        self._slots.release()
+        free = self.concurrency - len(self._running)
+        limit = max(1, min(self.batch_size, free))
+
+        async with self.session_factory() as db:
+            jobs = await job_crud.claim(db, limit=limit, lock_timeout=self.lock_timeout)
+            await db.commit()
+
+        for job in jobs:
+            await self._slots.acquire()
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+        return len(jobs)
+
+    async def drain(self) -> None:
+        """Aguardar as tarefas em execução terminarem."""
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._slots.release()
+
+    async def _execute(self, job: Row) -> None:
+        handler = get_handler(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            # Efeitos da tarefa e conclusão na mesma transação
+            async with self.session_factory() as db:
+                await handler(db, job.payload, job.data)
+                await job_crud.complete(db, job_id=job.id)
+                await db.commit()
+        except Exception as e:
+            retry_in = self._retry_delay(job) if handler is not None else None
+            logger.warning(
+                "Job %s (%s) failed on attempt %d/%d: %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                job.max_attempts,
+                e,
+                exc_info=retry_in is None,
+            )
+            async with self.session_factory() as db:
+                await job_crud.fail(
+                    db, job_id=job.id, error=f"{type(e).__name__}: {e}", retry_in=retry_in
+                )
+                await db.commit()
+
+    def _retry_delay(self, job: Row) -> timedelta | None:
+        """Backoff exponencial com jitter; ``None`` quando as tentativas acabaram."""
+        if job.attempts >= job.max_attempts:
+            return None
+        delay = min(
+            settings.job_retry_base_seconds * 2 ** (job.attempts - 1),
+            settings.job_retry_max_seconds,
+        )
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))  # noqa: S311
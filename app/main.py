@@ -1,8 +1,58 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1 import appointments, auth, professionals, reviews, users
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadYourWritesMiddleware, replica_router
+from app.jobs import (
+    AppointmentTransitionScheduler,
+    JobWorker,
+    ReminderScheduler,
+    TokenRevocationSync,
+)
+from app.services.warmup import warm_up_until_ready
+from app.utils.metrics import render_latest
+from app.utils.rate_limit import RateLimitMiddleware
+from app.utils.responses import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Worker de tarefas e agendadores no próprio processo; desative com
+    # JOB_WORKER_ENABLED / REMINDER_SCHEDULER_ENABLED / APPOINTMENT_TRANSITION_ENABLED
+    # quando rodarem à parte (scripts/run_worker.py)
+    stop = asyncio.Event()
+    background = []
+    if settings.job_worker_enabled:
+        background.append(JobWorker(AsyncSessionLocal).run(stop))
+    if settings.reminder_scheduler_enabled:
+        background.append(ReminderScheduler(AsyncSessionLocal).run(stop))
+    if settings.appointment_transition_enabled:
+        background.append(AppointmentTransitionScheduler(AsyncSessionLocal).run(stop))
+    # Por processo: cada um mantém a própria cópia da lista de tokens revogados
+    if settings.token_revocation_sync_enabled:
+        background.append(TokenRevocationSync(AsyncSessionLocal).run(stop))
+
+    tasks = [asyncio.create_task(coro) for coro in background]
+
+    # Só aceita requisições depois de aquecer (ou de WARMUP_TIMEOUT_SECONDS; aí o
+    # aquecimento segue em segundo plano e /health/ready responde 503 até terminar)
+    app.state.ready = not settings.warmup_enabled
+    if settings.warmup_enabled:
+        warmup = asyncio.create_task(warm_up_until_ready(app.state, stop))
+        tasks.append(warmup)
+        await asyncio.wait({warmup}, timeout=settings.warmup_timeout_seconds)
+    try:
+        yield
+    finally:
+        stop.set()
+        await asyncio.gather(*tasks)
+        await replica_router.dispose()
+
 
 app = FastAPI(
     title=settings.app_name,
@@ -11,8 +61,19 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
+# Com réplicas, quem acabou de escrever lê do primário por alguns segundos
+if replica_router.engines:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Registrado antes do CORS para ficar por dentro dele: as respostas 429 também
+# levam os cabeçalhos CORS
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
@@ -31,6 +92,23 @@ async def health_check():
     }
 
 
+@app.get("/health/ready", tags=["health"])
+async def readiness(request: Request):
+    """Pronto para tráfego: 503 enquanto o aquecimento da subida não terminou."""
+    # Sem lifespan (ex.: TestClient fora do "with") o estado nunca foi definido
+    if not getattr(request.app.state, "ready", False):
+        return FastJSONResponse({"status": "warming_up"}, status_code=503)
+    return {"status": "ready"}
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics():
+    """Métricas do processo no formato de exposição do Prometheus."""
+    return PlainTextResponse(
+        render_latest(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(
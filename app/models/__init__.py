@@ -1,18 +1,44 @@
 
 from app.models.appointment import Appointment
-from app.models.enums import AppointmentStatus, ProfessionalCategory, Role
-from app.models.professional import ProfessionalProfile, ProfileTag, UnavailableDate
+from app.models.directory import ProfessionalDirectory
+from app.models.enums import (
+    AppointmentStatus,
+    JobKind,
+    JobStatus,
+    ProfessionalCategory,
+    ReminderStatus,
+    Role,
+    TagMatch,
+)
+from app.models.job import Job
+from app.models.professional import (
+    ProfessionalProfile,
+    ProfileTag,
+    Tag,
+    UnavailableDate,
+)
 from app.models.review import Review
+from app.models.revoked_token import RevokedToken
+from app.models.slot_hold import SlotHold
 from app.models.user import User
 
 __all__ = [
     "User",
     "ProfessionalProfile",
     "ProfileTag",
+    "Tag",
     "UnavailableDate",
+    "ProfessionalDirectory",
     "Appointment",
     "Review",
+    "SlotHold",
+    "Job",
+    "RevokedToken",
     "Role",
     "ProfessionalCategory",
     "AppointmentStatus",
+    "TagMatch",
+    "JobStatus",
+    "JobKind",
+    "ReminderStatus",
 ]
@@ -2,11 +2,11 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.models.enums import AppointmentStatus
+from app.models.enums import AppointmentStatus, ReminderStatus
 
 if TYPE_CHECKING:
     from app.models.professional import ProfessionalProfile
@@ -31,11 +31,34 @@ class Appointment(Base):
         String(20), default=AppointmentStatus.PENDING
     )
 
+    # Lembrete: None até o agendador reservar a consulta (ver app.jobs.reminders)
+    reminder_status: Mapped[ReminderStatus | None] = mapped_column(
+        String(20), nullable=True
+    )
+    reminder_sent_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.now, onupdate=datetime.now
     )
 
+    __table_args__ = (
+        # Só consultas ativas ainda sem lembrete: a busca por vencidos não varre a tabela
+        Index(
+            "ix_appointments_reminder_due",
+            "start_time",
+            postgresql_where=text(
+                "status IN ('pending', 'confirmed') AND reminder_status IS NULL"
+            ),
+        ),
+        # Consultas em aberto por horário de término: encerramento em lote
+        Index(
+            "ix_appointments_open_end_time",
+            "end_time",
+            postgresql_where=text("status IN ('pending', 'confirmed')"),
+        ),
+    )
+
     patient: Mapped["User"] = relationship(
         back_populates="patient_appointments",
         foreign_keys=[patient_id],
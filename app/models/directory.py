@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, Integer, SmallInteger, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ProfessionalDirectory(Base):
+    """
+    Read model desnormalizado da listagem de profissionais: uma linha por perfil
+    com os dados do usuário, tags e avaliação já combinados, consultado sem joins.
+
+    É mantido pela aplicação (``directory_crud.refresh``) nas escritas de perfil,
+    usuário, tags e avaliações, e pode ser reconstruído com
+    ``scripts/rebuild_directory.py``.
+    """
+
+    __tablename__ = "professional_directory"
+
+    profile_id: Mapped[int] = mapped_column(
+        ForeignKey("professional_profiles.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[int] = mapped_column(index=True)
+
+    name: Mapped[str] = mapped_column(String(255))
+    email: Mapped[str] = mapped_column(String(255))
+    phone: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    cep: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    uf: Mapped[str | None] = mapped_column(String(2), nullable=True)
+    city: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    address: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    profile_image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    latitude: Mapped[float | None] = mapped_column(nullable=True)
+    longitude: Mapped[float | None] = mapped_column(nullable=True)
+    # Célula da grade de proximidade (app.utils.cep_geo.geo_cell)
+    geo_cell: Mapped[int | None] = mapped_column(nullable=True, index=True)
+
+    bio: Mapped[str | None] = mapped_column(Text, nullable=True)
+    category: Mapped[str] = mapped_column(String(50), index=True)
+    profissional_identification: Mapped[str] = mapped_column(String(50))
+    services: Mapped[str | None] = mapped_column(Text, nullable=True)
+    price: Mapped[float]
+    only_online: Mapped[bool]
+    only_presential: Mapped[bool]
+    rating: Mapped[float]
+    num_reviews: Mapped[int]
+    available_days_of_week: Mapped[str | None] = mapped_column(Text, nullable=True)
+    start_hour: Mapped[str | None] = mapped_column(String(5), nullable=True)
+    end_hour: Mapped[str | None] = mapped_column(String(5), nullable=True)
+
+    # Bit i ligado = atende no dia ``date.weekday() == i`` (segunda = bit 0)
+    weekday_mask: Mapped[int] = mapped_column(SmallInteger, default=0)
+    tags: Mapped[list[str]] = mapped_column(ARRAY(String(50)), default=list)
+    # Ids no dicionário de tags (app.models.professional.Tag), na mesma ordem de ``tags``
+    tag_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), default=list)
+
+    # max(updated_at) de perfil e usuário: versão usada nos ETags da listagem
+    updated_at: Mapped[datetime]
+
+    # Com pg_trgm disponível, a migration cria este índice como
+    # GIN (tag_ids, name gin_trgm_ops), cobrindo também o filtro ILIKE por nome
+    __table_args__ = (
+        Index("ix_professional_directory_search", "tag_ids", postgresql_using="gin"),
+    )
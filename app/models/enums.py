@@ -26,3 +26,33 @@ class AppointmentStatus(str, Enum):
     CONFIRMED = "confirmed"
     CANCELLED = "cancelled"
     COMPLETED = "completed"
+    EXPIRED = "expired"  # passou do horário sem ser confirmada
+
+
+class TagMatch(str, Enum):
+
+    ANY = "any"
+    ALL = "all"
+
+
+class JobStatus(str, Enum):
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobKind(str, Enum):
+
+    REFRESH_PROFESSIONAL_RATING = "refresh_professional_rating"
+    UPLOAD_PROFILE_IMAGE = "upload_profile_image"
+    SEND_APPOINTMENT_REMINDER = "send_appointment_reminder"
+    SEND_REVIEW_INVITATION = "send_review_invitation"
+
+
+class ReminderStatus(str, Enum):
+
+    QUEUED = "queued"
+    SENT = "sent"
+    SKIPPED = "skipped"
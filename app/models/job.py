@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Index, LargeBinary, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.enums import JobStatus
+
+
+class Job(Base):
+    """
+    Outbox de tarefas assíncronas: gravada na mesma transação da escrita de domínio
+    e consumida pelos workers de ``app.jobs``.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+    # Conteúdo binário da tarefa (ex.: imagem a enviar ao S3)
+    data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Tarefas pendentes com a mesma chave são coalescidas em uma só
+    key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    status: Mapped[JobStatus] = mapped_column(String(20), default=JobStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=5)
+    run_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    locked_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.now, onupdate=datetime.now
+    )
+
+    __table_args__ = (
+        # Fila: só as linhas ainda não concluídas entram nos índices
+        Index(
+            "ix_jobs_queue",
+            "run_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        Index(
+            "uq_jobs_pending_key",
+            "key",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
@@ -72,6 +72,19 @@ class ProfessionalProfile(Base):
         return f"<ProfessionalProfile(id={self.id}, category={self.category})>"
 
 
+class Tag(Base):
+    """Dicionário de tags: uma linha por nome normalizado (``normalize_tag``)."""
+
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+    normalized: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.id}, name={self.name})>"
+
+
 class ProfileTag(Base):
 
     __tablename__ = "profile_tags"
@@ -79,6 +92,7 @@ class ProfileTag(Base):
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     profile_id: Mapped[int] = mapped_column(ForeignKey("professional_profiles.id"), index=True)
     name: Mapped[str] = mapped_column(String(50))
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id"), index=True)
 
     profile: Mapped["ProfessionalProfile"] = relationship(back_populates="tags")
 
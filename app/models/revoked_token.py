@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    """
+    JWT revogado antes do ``exp`` (logout). Cada processo da API mantém em memória
+    os ``jti`` ainda não expirados (``app.core.security.revocation_list``).
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    jti: Mapped[str] = mapped_column(String(32), unique=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    # ``exp`` do token (epoch em segundos, UTC): depois disso a linha pode sair
+    expires_at: Mapped[int] = mapped_column(BigInteger, index=True)
+
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken(jti={self.jti}, user_id={self.user_id})>"
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class SlotHold(Base):
+    """
+    Reserva temporária de um horário entre a consulta de disponibilidade e o
+    agendamento. Tabela UNLOGGED: as reservas valem poucos minutos, então não
+    passam pelo WAL (e somem se o banco reiniciar sem desligamento limpo).
+    """
+
+    __tablename__ = "slot_holds"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    token: Mapped[str] = mapped_column(String(64), unique=True)
+
+    professional_id: Mapped[int] = mapped_column(
+        ForeignKey("professional_profiles.id", ondelete="CASCADE")
+    )
+    patient_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+
+    start_time: Mapped[datetime] = mapped_column()
+    end_time: Mapped[datetime] = mapped_column()
+    expires_at: Mapped[datetime] = mapped_column()
+
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_slot_holds_professional_start", "professional_id", "start_time"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SlotHold(id={self.id}, professional_id={self.professional_id}, "
+            f"start_time={self.start_time}, expires_at={self.expires_at})>"
+        )
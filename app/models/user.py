@@ -32,6 +32,10 @@ class User(Base):
     address: Mapped[str | None] = mapped_column(String(255), nullable=True)
     profile_image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
+    # Coordenadas aproximadas do CEP (app.utils.cep_geo), atualizadas junto com o CEP
+    latitude: Mapped[float | None] = mapped_column(nullable=True)
+    longitude: Mapped[float | None] = mapped_column(nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.now, onupdate=datetime.now
@@ -2,16 +2,25 @@
 from app.schemas.appointment import (
     AppointmentCreate,
     AppointmentResponse,
+    AppointmentSeriesConflict,
+    AppointmentSeriesCreate,
+    AppointmentSeriesResponse,
     AppointmentUpdate,
+    SlotHoldCreate,
+    SlotHoldResponse,
 )
 from app.schemas.auth import LoginResponse, Token, TokenData
 from app.schemas.professional import (
+    FacetCount,
+    ProfessionalFacetsResponse,
     ProfessionalProfileCreate,
     ProfessionalProfileResponse,
     ProfessionalProfileUpdate,
+    ProfessionalSearchResponse,
     ProfileTagCreate,
     ProfileTagResponse,
     ReviewSummary,
+    TagFacet,
     UnavailableDateCreate,
     UnavailableDateResponse,
 )
@@ -35,13 +44,22 @@ __all__ = [
     "ProfessionalProfileCreate",
     "ProfessionalProfileUpdate",
     "ProfessionalProfileResponse",
+    "ProfessionalSearchResponse",
+    "ProfessionalFacetsResponse",
+    "FacetCount",
+    "TagFacet",
     "ProfileTagCreate",
     "ProfileTagResponse",
     "UnavailableDateCreate",
     "UnavailableDateResponse",
     "AppointmentCreate",
     "AppointmentUpdate",
+    "SlotHoldCreate",
+    "SlotHoldResponse",
     "AppointmentResponse",
+    "AppointmentSeriesCreate",
+    "AppointmentSeriesConflict",
+    "AppointmentSeriesResponse",
     "ReviewCreate",
     "ReviewUpdate",
     "ReviewResponse",
@@ -1,7 +1,7 @@
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from app.models.enums import AppointmentStatus
 
@@ -29,7 +29,27 @@ class AppointmentBase(BaseModel):
 
 class AppointmentCreate(AppointmentBase):
 
-    pass
+    # Token de POST /hold: o agendamento confirma a reserva do horário
+    hold_token: str | None = Field(default=None, max_length=64)
+
+
+class SlotHoldCreate(AppointmentBase):
+
+    @model_validator(mode="after")
+    def validate_window(self) -> "SlotHoldCreate":
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
+
+class SlotHoldResponse(BaseModel):
+
+    token: str
+    professional_id: int
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
+    ttl_seconds: int
 
 
 class AppointmentUpdate(BaseModel):
@@ -70,3 +90,38 @@ class AppointmentResponse(BaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class AppointmentSeriesCreate(AppointmentBase):
+
+    occurrences: int = Field(..., ge=1, le=52)
+    interval_days: int = Field(default=7, ge=1, le=31)
+    skip_conflicts: bool = False
+
+    @model_validator(mode="after")
+    def validate_series(self) -> "AppointmentSeriesCreate":
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        if self.end_time - self.start_time > timedelta(days=self.interval_days):
+            raise ValueError("Appointment duration must not exceed the series interval")
+        return self
+
+    def occurrence_times(self) -> list[tuple[datetime, datetime]]:
+        step = timedelta(days=self.interval_days)
+        return [
+            (self.start_time + step * i, self.end_time + step * i)
+            for i in range(self.occurrences)
+        ]
+
+
+class AppointmentSeriesConflict(BaseModel):
+
+    occurrence: int
+    start_time: datetime
+    end_time: datetime
+
+
+class AppointmentSeriesResponse(BaseModel):
+
+    created: list[AppointmentResponse]
+    conflicts: list[AppointmentSeriesConflict] = []
@@ -120,9 +120,40 @@ class ProfessionalProfileResponse(ProfessionalProfileBase):
     unavailable_dates: list[UnavailableDateResponse] = []
     reviews: list["ReviewSummary"] = []
 
+    # Presente apenas na listagem com near=
+    distance_km: float | None = None
+
     model_config = ConfigDict(from_attributes=True)
 
 
+class TagFacet(BaseModel):
+
+    tag: str
+    count: int
+
+
+class ProfessionalSearchResponse(BaseModel):
+
+    items: list[ProfessionalProfileResponse]
+    total: int
+    tag_facets: list[TagFacet] = []
+
+
+class FacetCount(BaseModel):
+
+    value: str | bool
+    count: int
+
+
+class ProfessionalFacetsResponse(BaseModel):
+
+    total: int
+    category: list[FacetCount] = []
+    only_online: list[FacetCount] = []
+    only_presential: list[FacetCount] = []
+    tags: list[TagFacet] = []
+
+
 class ReviewSummary(BaseModel):
     """Resumo de avaliação para incluir no perfil do profissional"""
     id: int
@@ -1,30 +1,134 @@
-from datetime import date
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.crud.appointment import appointment_crud
+from app.crud.job import job_crud
+from app.crud.professional import professional_crud
+from app.crud.slot_hold import slot_hold_crud
 from app.models.appointment import Appointment
-from app.models.enums import AppointmentStatus
+from app.models.enums import AppointmentStatus, JobKind
 from app.schemas.appointment import (
     AppointmentCreate,
-    AppointmentResponse,
+    AppointmentSeriesConflict,
+    AppointmentSeriesCreate,
     AppointmentUpdate,
+    SlotHoldCreate,
 )
-from app.utils.exceptions import ConflictException, NotFoundException
+from app.services.booking import booking_coordinator
+from app.utils.exceptions import BadRequestException, ConflictException, NotFoundException
+from app.utils.http_cache import Validator, aggregate_validator, entity_validator
+
+
+async def hold_slot(db: AsyncSession, patient_id: int, hold_in: SlotHoldCreate) -> Row:
+    """Reservar o horário por ``SLOT_HOLD_TTL_SECONDS`` para o paciente concluir o agendamento.
+
+    Passa pelo mesmo lock de agenda dos agendamentos, então reservas e agendamentos
+    simultâneos do mesmo horário não passam ambos pela verificação.
+    """
+    if hold_in.start_time <= datetime.now():  # noqa: DTZ005
+        raise BadRequestException("Cannot hold a slot in the past")
+
+    if not await professional_crud.exists(db, profile_id=hold_in.professional_id):
+        raise NotFoundException("Professional not found")
+
+    await booking_coordinator.lock(
+        db,
+        professional_id=hold_in.professional_id,
+        windows=[(hold_in.start_time, hold_in.end_time)],
+    )
+
+    await ensure_slot_free(
+        db,
+        professional_id=hold_in.professional_id,
+        start_time=hold_in.start_time,
+        end_time=hold_in.end_time,
+        patient_id=patient_id,
+    )
+
+    hold = await slot_hold_crud.create(
+        db,
+        professional_id=hold_in.professional_id,
+        patient_id=patient_id,
+        start_time=hold_in.start_time,
+        end_time=hold_in.end_time,
+        ttl=timedelta(seconds=settings.slot_hold_ttl_seconds),
+    )
+    await db.commit()
+    return hold
+
+
+async def release_hold(db: AsyncSession, patient_id: int, token: str) -> None:
+    if not await slot_hold_crud.release(db, token=token, patient_id=patient_id):
+        raise NotFoundException("Slot hold not found")
+    await db.commit()
+
+
+async def ensure_slot_free(
+    db: AsyncSession,
+    *,
+    professional_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    patient_id: int,
+    exclude_id: int | None = None,
+) -> None:
+    """Conflitar com agendamentos ativos e com reservas válidas de outros pacientes."""
+    conflicts = await appointment_crud.find_conflicts(
+        db,
+        professional_id=professional_id,
+        start_time=start_time,
+        end_time=end_time,
+        exclude_id=exclude_id,
+    )
+    if conflicts:
+        raise ConflictException("Time slot already booked")
+
+    held = await slot_hold_crud.find_active(
+        db,
+        professional_id=professional_id,
+        windows=[(start_time, end_time)],
+        exclude_patient_id=patient_id,
+    )
+    if held:
+        raise ConflictException("Time slot is on hold by another patient")
 
 
 async def create_appointment(
     db: AsyncSession, patient_id: int, appointment_in: AppointmentCreate
 ) -> Appointment:
-    conflicts = await appointment_crud.find_conflicts(
+    # Agendamentos do mesmo profissional e dia fazem fila daqui até o commit
+    await booking_coordinator.lock(
+        db,
+        professional_id=appointment_in.professional_id,
+        windows=[(appointment_in.start_time, appointment_in.end_time)],
+    )
+
+    # Confirma a reserva: o DELETE do token é atômico e desfeito se algo abaixo falhar
+    if appointment_in.hold_token and not await slot_hold_crud.consume(
         db,
+        token=appointment_in.hold_token,
+        patient_id=patient_id,
         professional_id=appointment_in.professional_id,
         start_time=appointment_in.start_time,
         end_time=appointment_in.end_time,
-    )
+    ):
+        raise ConflictException("Slot hold expired or does not match this slot")
 
-    if conflicts:
-        raise ConflictException("Time slot already booked")
+    await ensure_slot_free(
+        db,
+        professional_id=appointment_in.professional_id,
+        start_time=appointment_in.start_time,
+        end_time=appointment_in.end_time,
+        patient_id=patient_id,
+    )
 
     cancelled = await appointment_crud.find_cancelled(
         db,
@@ -36,6 +140,8 @@ async def create_appointment(
 
     if cancelled:
         cancelled.status = AppointmentStatus.PENDING
+        cancelled.reminder_status = None
+        cancelled.reminder_sent_at = None
         await db.commit()
         await db.refresh(cancelled)
         return cancelled
@@ -53,6 +159,91 @@ async def create_appointment(
     return appointment
 
 
+async def create_appointment_series(
+    db: AsyncSession, patient_id: int, series_in: AppointmentSeriesCreate
+) -> tuple[list[Appointment], list[AppointmentSeriesConflict]]:
+    """Agendar uma série recorrente em uma única transação.
+
+    Todas as ocorrências são validadas com uma consulta só; as livres são inseridas
+    em um único INSERT e cancelamentos do mesmo paciente no mesmo horário são
+    reaproveitados, como em ``create_appointment``.
+    """
+    windows = series_in.occurrence_times()
+    await booking_coordinator.lock(
+        db, professional_id=series_in.professional_id, windows=windows
+    )
+    existing = await appointment_crud.find_overlapping_any(
+        db, professional_id=series_in.professional_id, windows=windows
+    )
+    held = await slot_hold_crud.find_active(
+        db,
+        professional_id=series_in.professional_id,
+        windows=windows,
+        exclude_patient_id=patient_id,
+    )
+
+    conflicts: list[AppointmentSeriesConflict] = []
+    revived: list[Appointment] = []
+    new_rows: list[dict] = []
+    for occurrence, (start_time, end_time) in enumerate(windows, start=1):
+        overlapping = [
+            apt
+            for apt in existing
+            if apt.start_time < end_time and apt.end_time > start_time
+        ]
+        on_hold = any(
+            hold.start_time < end_time and hold.end_time > start_time for hold in held
+        )
+        if on_hold or any(apt.status != AppointmentStatus.CANCELLED for apt in overlapping):
+            conflicts.append(
+                AppointmentSeriesConflict(
+                    occurrence=occurrence, start_time=start_time, end_time=end_time
+                )
+            )
+            continue
+
+        cancelled = next(
+            (
+                apt
+                for apt in overlapping
+                if apt.patient_id == patient_id
+                and apt.start_time == start_time
+                and apt.end_time == end_time
+            ),
+            None,
+        )
+        if cancelled:
+            revived.append(cancelled)
+            continue
+
+        new_rows.append(
+            {
+                "patient_id": patient_id,
+                "professional_id": series_in.professional_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "status": AppointmentStatus.PENDING,
+            }
+        )
+
+    if conflicts and not series_in.skip_conflicts:
+        occurrences = ", ".join(
+            f"#{c.occurrence} ({c.start_time.isoformat()})" for c in conflicts
+        )
+        raise ConflictException(f"Time slot already booked for occurrences {occurrences}")
+
+    for appointment in revived:
+        appointment.status = AppointmentStatus.PENDING
+        appointment.reminder_status = None
+        appointment.reminder_sent_at = None
+
+    created = await appointment_crud.create_many(db, rows=new_rows)
+    await db.commit()
+
+    appointments = sorted(revived + created, key=lambda apt: apt.start_time)
+    return appointments, conflicts
+
+
 async def get_appointment(db: AsyncSession, appointment_id: int) -> Appointment:
     appointment = await appointment_crud.get_with_relations(
         db, appointment_id=appointment_id
@@ -62,64 +253,69 @@ async def get_appointment(db: AsyncSession, appointment_id: int) -> Appointment:
     return appointment
 
 
+async def get_appointment_version(db: AsyncSession, appointment_id: int) -> Row:
+    """Versão leve do agendamento: basta para autorizar e responder ``304``."""
+    version = await appointment_crud.get_item_version(db, appointment_id=appointment_id)
+    if version is None:
+        raise NotFoundException("Appointment not found")
+    return version
+
+
+def get_appointment_validator(version: Row) -> Validator:
+    return entity_validator("appointment", (version.id, version.updated_at))
+
+
+async def get_appointments_validator(
+    db: AsyncSession,
+    *,
+    patient_id: int | None = None,
+    professional_id: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Validator:
+    last_modified, count = await appointment_crud.get_version(
+        db,
+        patient_id=patient_id,
+        professional_id=professional_id,
+        since=datetime.combine(start_date, datetime.min.time()) if start_date else None,
+        until=datetime.combine(end_date, datetime.max.time()) if end_date else None,
+    )
+    return aggregate_validator(
+        "appointments",
+        last_modified,
+        count,
+        patient_id,
+        professional_id,
+        start_date,
+        end_date,
+        skip,
+        limit,
+    )
+
+
 async def get_patient_appointments(
     db: AsyncSession, patient_id: int, skip: int = 0, limit: int = 100
-) -> list[AppointmentResponse]:
-    appointments = await appointment_crud.get_by_patient(
+) -> list[dict]:
+    rows = await appointment_crud.list_response_rows(
         db, patient_id=patient_id, skip=skip, limit=limit
     )
-
-    return [
-        AppointmentResponse(
-            id=apt.id,
-            patient_id=apt.patient_id,
-            patient_name=apt.patient.name if apt.patient else None,
-            patient_image_url=apt.patient.profile_image_url if apt.patient else None,
-            professional_id=apt.professional_id,
-            professional_name=(
-                apt.professional.user.name
-                if apt.professional and apt.professional.user
-                else None
-            ),
-            professional_image_url=(
-                apt.professional.user.profile_image_url
-                if apt.professional and apt.professional.user
-                else None
-            ),
-            start_time=apt.start_time,
-            end_time=apt.end_time,
-            status=apt.status,
-            created_at=apt.created_at,
-            updated_at=apt.updated_at,
-        )
-        for apt in appointments
-    ]
+    return [dict(row._mapping) for row in rows]
 
 
 async def get_professional_appointments(
     db: AsyncSession, professional_id: int, skip: int = 0, limit: int = 100
-) -> list[AppointmentResponse]:
-    appointments = await appointment_crud.get_by_professional(
-        db, professional_id=professional_id, skip=skip, limit=limit
-    )
-
-    return [
-        AppointmentResponse(
-            id=apt.id,
-            patient_id=apt.patient_id,
-            patient_name=apt.patient.name if apt.patient else None,
-            patient_image_url=apt.patient.profile_image_url if apt.patient else None,
-            professional_id=apt.professional_id,
-            professional_name=None,
-            professional_image_url=None,
-            start_time=apt.start_time,
-            end_time=apt.end_time,
-            status=apt.status,
-            created_at=apt.created_at,
-            updated_at=apt.updated_at,
-        )
-        for apt in appointments
-    ]
+) -> list[dict]:
+    # Na agenda do próprio profissional os dados dele não são repetidos
+    rows = await appointment_crud.list_response_rows(
+        db,
+        professional_id=professional_id,
+        include_professional=False,
+        skip=skip,
+        limit=limit,
+    )
+    return [dict(row._mapping) for row in rows]
 
 
 async def update_appointment(
@@ -131,16 +327,24 @@ async def update_appointment(
         start_time = appointment_in.start_time or appointment.start_time
         end_time = appointment_in.end_time or appointment.end_time
 
-        conflicts = await appointment_crud.find_conflicts(
+        await booking_coordinator.lock(
+            db,
+            professional_id=appointment.professional_id,
+            windows=[(start_time, end_time)],
+        )
+        await ensure_slot_free(
             db,
             professional_id=appointment.professional_id,
             start_time=start_time,
             end_time=end_time,
+            patient_id=appointment.patient_id,
             exclude_id=appointment.id,
         )
 
-        if conflicts:
-            raise ConflictException("Time slot already booked")
+        # Remarcada: o lembrete volta a ser agendado para o novo horário
+        if start_time != appointment.start_time:
+            appointment.reminder_status = None
+            appointment.reminder_sent_at = None
 
     updated = await appointment_crud.update(
         db, db_obj=appointment, obj_in=appointment_in
@@ -150,6 +354,39 @@ async def update_appointment(
     return updated
 
 
+async def close_past_appointments(
+    db: AsyncSession, *, grace: timedelta, limit: int
+) -> dict[str, int]:
+    """Encerrar um lote de consultas que já terminaram (ver ``AppointmentTransitionScheduler``).
+
+    Confirmadas viram ``completed`` e recebem um convite para avaliação, enfileirado na
+    mesma transação; pendentes nunca confirmadas viram ``expired``.
+    """
+    completed = await appointment_crud.transition_past(
+        db,
+        from_status=AppointmentStatus.CONFIRMED,
+        to_status=AppointmentStatus.COMPLETED,
+        grace=grace,
+        limit=limit,
+    )
+    await job_crud.enqueue_many(
+        db,
+        kind=JobKind.SEND_REVIEW_INVITATION,
+        jobs=[
+            (f"review-invitation:{appointment_id}", {"appointment_id": appointment_id})
+            for appointment_id in completed
+        ],
+    )
+    expired = await appointment_crud.transition_past(
+        db,
+        from_status=AppointmentStatus.PENDING,
+        to_status=AppointmentStatus.EXPIRED,
+        grace=grace,
+        limit=limit,
+    )
+    return {"completed": len(completed), "expired": len(expired)}
+
+
 async def delete_appointment(db: AsyncSession, appointment_id: int) -> None:
     appointment = await get_appointment(db, appointment_id)
     await appointment_crud.delete(db, pk=appointment.id)
@@ -163,9 +400,9 @@ async def get_professional_appointments_by_date(
     end_date: date | None = None,
     skip: int = 0,
     limit: int = 100,
-) -> list[AppointmentResponse]:
+) -> list[dict]:
     """Buscar agendamentos de um profissional com filtro de data."""
-    appointments = await appointment_crud.get_by_professional_and_date(
+    rows = await appointment_crud.list_response_rows(
         db,
         professional_id=professional_id,
         start_date=start_date,
@@ -173,29 +410,65 @@ async def get_professional_appointments_by_date(
         skip=skip,
         limit=limit,
     )
+    return [dict(row._mapping) for row in rows]
 
-    return [
-        AppointmentResponse(
-            id=apt.id,
-            patient_id=apt.patient_id,
-            patient_name=apt.patient.name if apt.patient else None,
-            patient_image_url=apt.patient.profile_image_url if apt.patient else None,
-            professional_id=apt.professional_id,
-            professional_name=(
-                apt.professional.user.name
-                if apt.professional and apt.professional.user
-                else None
-            ),
-            professional_image_url=(
-                apt.professional.user.profile_image_url
-                if apt.professional and apt.professional.user
-                else None
-            ),
-            start_time=apt.start_time,
-            end_time=apt.end_time,
-            status=apt.status,
-            created_at=apt.created_at,
-            updated_at=apt.updated_at,
-        )
-        for apt in appointments
-    ]
+
+EXPORT_COLUMNS = [
+    "id",
+    "start_time",
+    "end_time",
+    "status",
+    "patient_id",
+    "patient_name",
+    "created_at",
+    "updated_at",
+]
+
+
+def _export_record(row) -> dict:
+    return {
+        "id": row.id,
+        "start_time": row.start_time.isoformat(),
+        "end_time": row.end_time.isoformat(),
+        "status": row.status.value if hasattr(row.status, "value") else row.status,
+        "patient_id": row.patient_id,
+        "patient_name": row.patient_name,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+    }
+
+
+async def export_professional_appointments(
+    professional_id: int,
+    export_format: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> AsyncIterator[str]:
+    """Gerar o histórico de agendamentos em CSV ou NDJSON, lote a lote.
+
+    Usa uma sessão própria porque é consumido pelo ``StreamingResponse`` depois que
+    a rota retorna; a memória usada não depende do tamanho do histórico.
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        yield buffer.getvalue()
+
+    async with AsyncSessionLocal() as db:
+        async for rows in appointment_crud.stream_history(
+            db,
+            professional_id=professional_id,
+            start_date=start_date,
+            end_date=end_date,
+        ):
+            records = [_export_record(row) for row in rows]
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+                writer.writerows(records)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(record, ensure_ascii=False) + "\n" for record in records
+                )
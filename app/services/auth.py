@@ -1,11 +1,21 @@
+import time
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    revocation_list,
+    verify_password,
+)
+from app.crud.revoked_token import revoked_token_crud
 from app.crud.user import user_crud
 from app.models.user import User
 from app.schemas.auth import LoginResponse
 from app.schemas.user import UserResponse
-from app.utils.exceptions import UnauthorizedException
+from app.utils.exceptions import BadRequestException, UnauthorizedException
 
 
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> User:
@@ -14,7 +24,11 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     if not user:
         raise UnauthorizedException("Invalid credentials")
 
-    if not verify_password(password, user.password):
+    # Devolve a conexão ao pool antes do bcrypt (trabalho lento sem banco)
+    await db.commit()
+
+    # bcrypt leva dezenas de ms de CPU: numa thread, o event loop segue atendendo
+    if not await run_in_threadpool(verify_password, password, user.password):
         raise UnauthorizedException("Invalid credentials")
 
     return user
@@ -37,5 +51,29 @@ async def login(db: AsyncSession, email: str, password: str) -> LoginResponse:
     return LoginResponse(token=access_token, user=user_response)
 
 
-def hash_password(password: str) -> str:
-    return get_password_hash(password)
+async def logout(db: AsyncSession, token: str) -> None:
+    """
+    Revogar o token até o ``exp``. Este processo passa a recusá-lo na hora; os
+    demais, na próxima sincronização da lista (``TOKEN_REVOCATION_SYNC_INTERVAL``).
+    """
+    claims = decode_access_token(token)
+    if "jti" not in claims:
+        raise BadRequestException("Token cannot be revoked; log in again to get a new one")
+
+    await revoked_token_crud.add(
+        db, jti=claims["jti"], user_id=claims["id"], expires_at=int(claims["exp"])
+    )
+    await db.commit()
+    revocation_list.add(claims["jti"])
+
+
+async def sync_revoked_tokens(db: AsyncSession) -> int:
+    """Recarregar a lista de revogação do processo e apagar as linhas expiradas."""
+    now = int(time.time())
+    revocation_list.replace(await revoked_token_crud.active_jtis(db, now=now))
+    await revoked_token_crud.purge_expired(db, now=now)
+    return len(revocation_list)
+
+
+async def hash_password(password: str) -> str:
+    return await run_in_threadpool(get_password_hash, password)
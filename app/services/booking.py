@@ -0,0 +1,71 @@
+"""Serialização das escritas de agenda por profissional e dia."""
+
+import time
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Integer, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.metrics import Counter, Histogram
+
+booking_lock_wait_seconds = Histogram(
+    "booking_lock_wait_seconds",
+    "Tempo esperando o advisory lock de agenda (profissional + dia)",
+)
+booking_locks_total = Counter(
+    "booking_locks_total", "Advisory locks de agenda adquiridos"
+)
+
+
+def window_days(start_time: datetime, end_time: datetime) -> list[date]:
+    """Dias tocados pelo intervalo ``[start_time, end_time)``."""
+    day = start_time.date()
+    last = max(day, (end_time - timedelta(microseconds=1)).date())
+    days = [day]
+    while day < last:
+        day += timedelta(days=1)
+        days.append(day)
+    return days
+
+
+class BookingCoordinator:
+    """
+    Antes de verificar conflitos e gravar, a transação pega um advisory lock
+    (``pg_advisory_xact_lock(professional_id, dia)``) para cada dia tocado. Escritas
+    concorrentes no mesmo profissional e dia fazem fila; profissionais (ou dias)
+    diferentes seguem em paralelo. Os locks são liberados no commit/rollback.
+    """
+
+    async def lock(
+        self,
+        db: AsyncSession,
+        *,
+        professional_id: int,
+        windows: Iterable[tuple[datetime, datetime]],
+    ) -> float:
+        """Travar os dias das janelas e retornar o tempo de espera, em segundos."""
+        days = sorted({day for start, end in windows for day in window_days(start, end)})
+        if not days:
+            return 0.0
+
+        # Um só round-trip; unnest segue a ordem do array, crescente em todas as
+        # transações, então séries que se sobrepõem não entram em deadlock
+        day_key = func.unnest(
+            literal([day.toordinal() for day in days], ARRAY(Integer))
+        ).column_valued("day")
+        # Conexão obtida antes de medir: a espera pelo pool não entra na métrica
+        await db.connection()
+        started = time.perf_counter()
+        await db.execute(
+            select(func.pg_advisory_xact_lock(professional_id, day_key))
+        )
+        waited = time.perf_counter() - started
+
+        booking_lock_wait_seconds.observe(waited)
+        booking_locks_total.inc(len(days))
+        return waited
+
+
+booking_coordinator = BookingCoordinator()
@@ -0,0 +1,123 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.appointment import appointment_crud
+from app.models.enums import AppointmentStatus
+from app.utils.http_cache import Validator, build_etag
+
+# Quantos dias de histórico entram no feed; agendamentos futuros entram sempre
+CALENDAR_HISTORY_DAYS = 90
+
+ICS_STATUS = {
+    AppointmentStatus.PENDING: "TENTATIVE",
+    AppointmentStatus.CONFIRMED: "CONFIRMED",
+    AppointmentStatus.COMPLETED: "CONFIRMED",
+    AppointmentStatus.CANCELLED: "CANCELLED",
+    AppointmentStatus.EXPIRED: "CANCELLED",
+}
+
+
+def calendar_window_start() -> datetime:
+    today = datetime.combine(datetime.now().date(), datetime.min.time())  # noqa: DTZ005
+    return today - timedelta(days=CALENDAR_HISTORY_DAYS)
+
+
+async def get_calendar_validator(
+    db: AsyncSession,
+    *,
+    patient_id: int | None = None,
+    professional_id: int | None = None,
+) -> Validator:
+    """Validador do feed calculado só com agregados, sem montar o calendário."""
+    since = calendar_window_start()
+    last_modified, count = await appointment_crud.get_version(
+        db, patient_id=patient_id, professional_id=professional_id, since=since
+    )
+    # Apps de calendário costumam revalidar por data: o feed mantém o Last-Modified.
+    # If-None-Match tem precedência e, pela contagem no ETag, também vê exclusões
+    return Validator(
+        etag=build_etag(
+            "calendar", last_modified, count, patient_id, professional_id, since.date()
+        ),
+        last_modified=last_modified,
+    )
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Quebrar linhas com mais de 75 octetos (RFC 5545, seção 3.1)."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+
+    chunks = []
+    current = ""
+    for char in line:
+        limit = 75 if not chunks else 74
+        if len((current + char).encode()) > limit:
+            chunks.append(current)
+            current = char
+        else:
+            current += char
+    chunks.append(current)
+    return "\r\n ".join(chunks)
+
+
+def _format_local(value: datetime) -> str:
+    # Horário "flutuante": o banco armazena horários locais sem timezone
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _format_utc(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+async def build_calendar(
+    db: AsyncSession,
+    *,
+    patient_id: int | None = None,
+    professional_id: int | None = None,
+) -> str:
+    rows = await appointment_crud.get_calendar_rows(
+        db,
+        patient_id=patient_id,
+        professional_id=professional_id,
+        since=calendar_window_start(),
+    )
+
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:-//{settings.app_name}//Agenda//PT-BR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(settings.app_name)}",
+    ]
+    for row in rows:
+        summary = f"Consulta com {row.counterpart_name}" if row.counterpart_name else "Consulta"
+        lines.extend(
+            [
+                "BEGIN:VEVENT",
+                f"UID:appointment-{row.id}@{settings.app_name.lower()}",
+                f"DTSTAMP:{_format_utc(row.updated_at)}",
+                f"LAST-MODIFIED:{_format_utc(row.updated_at)}",
+                f"DTSTART:{_format_local(row.start_time)}",
+                f"DTEND:{_format_local(row.end_time)}",
+                f"SUMMARY:{_escape(summary)}",
+                f"STATUS:{ICS_STATUS.get(AppointmentStatus(row.status), 'TENTATIVE')}",
+                "END:VEVENT",
+            ]
+        )
+    lines.append("END:VCALENDAR")
+
+    return "".join(f"{_fold(line)}\r\n" for line in lines)
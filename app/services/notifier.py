@@ -0,0 +1,112 @@
+"""Notification delivery backends."""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class AppointmentReminder:
+    """Dados de um lembrete de consulta, independentes do canal de entrega."""
+
+    appointment_id: int
+    start_time: datetime
+    end_time: datetime
+    patient_name: str
+    patient_email: str
+    professional_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class ReviewInvitation:
+    """Convite para o paciente avaliar uma consulta concluída."""
+
+    appointment_id: int
+    start_time: datetime
+    patient_name: str
+    patient_email: str
+    professional_name: str
+
+
+class Notifier(ABC):
+    """
+    Interface dos canais de notificação. Um backend novo (e-mail, push, SMS)
+    implementa os métodos ``send_*`` e é registrado em ``NOTIFIERS``.
+    Exceções levantadas aqui fazem a tarefa ser tentada de novo.
+    """
+
+    @abstractmethod
+    async def send_appointment_reminder(self, reminder: AppointmentReminder) -> None: ...
+
+    @abstractmethod
+    async def send_review_invitation(self, invitation: ReviewInvitation) -> None: ...
+
+
+class LogNotifier(Notifier):
+    """Only logs the notification (default for local development)."""
+
+    async def send_appointment_reminder(self, reminder: AppointmentReminder) -> None:
+        logger.info(
+            "Reminder for appointment %s: %s <%s> with %s at %s",
+            reminder.appointment_id,
+            reminder.patient_name,
+            reminder.patient_email,
+            reminder.professional_name,
+            reminder.start_time.isoformat(),
+        )
+
+    async def send_review_invitation(self, invitation: ReviewInvitation) -> None:
+        logger.info(
+            "Review invitation for appointment %s: %s <%s> with %s",
+            invitation.appointment_id,
+            invitation.patient_name,
+            invitation.patient_email,
+            invitation.professional_name,
+        )
+
+
+class FileNotifier(Notifier):
+    """Append each notification as a JSON line to a local file (useful in tests)."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    async def send_appointment_reminder(self, reminder: AppointmentReminder) -> None:
+        await self._write("appointment_reminder", reminder)
+
+    async def send_review_invitation(self, invitation: ReviewInvitation) -> None:
+        await self._write("review_invitation", invitation)
+
+    async def _write(self, type_: str, message: object) -> None:
+        line = json.dumps(
+            {"type": type_, **asdict(message)},
+            default=datetime.isoformat,
+            ensure_ascii=False,
+        )
+        await asyncio.to_thread(self._append, line)
+
+    def _append(self, line: str) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+NOTIFIERS = {
+    "log": lambda: LogNotifier(),
+    "file": lambda: FileNotifier(settings.notifier_file_path),
+}
+
+
+def get_notifier(backend: str | None = None) -> Notifier:
+    backend = backend or settings.notifier_backend
+    try:
+        return NOTIFIERS[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown notifier backend: {backend!r}") from None
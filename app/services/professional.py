@@ -1,24 +1,33 @@
 from datetime import date, datetime, timedelta
 
-from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.appointment import appointment_crud
+from app.crud.directory import directory_crud
 from app.crud.professional import professional_crud
-from app.models.enums import AppointmentStatus, ProfessionalCategory
-from app.models.professional import ProfessionalProfile, ProfileTag, UnavailableDate
+from app.crud.slot_hold import slot_hold_crud
+from app.crud.tag import tag_crud
+from app.models.enums import ProfessionalCategory, TagMatch
+from app.models.professional import ProfessionalProfile, UnavailableDate
+from app.models.user import User
 from app.schemas.professional import (
     AvailableSlotsResponse,
     ProfessionalProfileCreate,
-    ProfessionalProfileResponse,
     ProfessionalProfileUpdate,
     TimeSlot,
 )
+from app.utils.cep_geo import parse_point
 from app.utils.exceptions import (
     BadRequestException,
     ForbiddenException,
     NotFoundException,
 )
+from app.utils.http_cache import Validator, aggregate_validator, entity_validator
+from app.utils.single_flight import SingleFlight
+
+# Leituras públicas muito concorridas (perfil compartilhado em redes sociais)
+profile_flight = SingleFlight("professional_profile")
+slots_flight = SingleFlight("available_slots")
 
 
 async def create_professional_profile(
@@ -44,6 +53,7 @@ async def create_professional_profile(
     )
     db.add(profile)
     await db.flush()
+    await directory_crud.refresh(db, profile_ids=[profile.id])
     return profile
 
 
@@ -66,9 +76,7 @@ async def create_full_professional_profile(
     await db.flush()
 
     if profile_in.tags:
-        for tag_name in profile_in.tags:
-            tag = ProfileTag(profile_id=profile.id, name=tag_name)
-            db.add(tag)
+        await tag_crud.add_profile_tags(db, profile_id=profile.id, names=profile_in.tags)
 
     if profile_in.unavailable_dates:
         for date_in in profile_in.unavailable_dates:
@@ -79,6 +87,7 @@ async def create_full_professional_profile(
             )
             db.add(unavailable)
 
+    await directory_crud.refresh(db, profile_ids=[profile.id])
     await db.commit()
     await db.refresh(profile)
     return profile
@@ -93,6 +102,34 @@ async def get_professional_profile(
     return profile
 
 
+async def get_profile_payload(
+    db: AsyncSession,
+    profile_id: int,
+    *,
+    include_reviews: bool = True,
+    limit_reviews: int = 5,
+    etag: str | None = None,
+) -> dict:
+    """
+    Payload de ``GET /professionals/{id}``, coalescido entre requisições idênticas
+    simultâneas. ``etag`` (do validador já conferido) entra na chave: quem validou
+    uma versão nunca recebe o corpo de outra.
+    """
+
+    async def load() -> dict:
+        profile = await get_professional_profile(db, profile_id)
+        reviews = (
+            build_review_summaries(profile, limit_reviews=limit_reviews)
+            if include_reviews
+            else []
+        )
+        return build_profile_payload(profile, reviews=reviews)
+
+    return await profile_flight.do(
+        (profile_id, include_reviews, limit_reviews, etag), load
+    )
+
+
 async def get_professional_profile_by_user(
     db: AsyncSession, user_id: int
 ) -> ProfessionalProfile:
@@ -119,30 +156,21 @@ async def update_professional_profile(
     for field, value in update_data.items():
         setattr(profile, field, value)
 
-    if profile_in.tags is not None:
-        try:
-            delete(ProfileTag).where(ProfileTag.profile_id == profile.id)
-        except Exception as e:
-            BadRequestException(f"Error deleting tags: {e}")
+    if profile_in.tags is not None or profile_in.unavailable_dates is not None:
+        # Tags e datas vivem em outras tabelas; atualiza a versão usada nos ETags
+        profile.updated_at = datetime.now()  # noqa: DTZ005
 
-        for tag_name in profile_in.tags:
-            tag = ProfileTag(profile_id=profile.id, name=tag_name)
-            db.add(tag)
+    # As listas enviadas substituem as anteriores (delete-orphan remove as antigas)
+    if profile_in.tags is not None:
+        profile.tags = await tag_crud.build_profile_tags(db, profile_in.tags)
 
     if profile_in.unavailable_dates is not None:
-        try:
-            delete(UnavailableDate).where(UnavailableDate.profile_id == profile.id)
-        except Exception as e:
-            BadRequestException(f"Error deleting unavailable dates: {e}")
-
-        for date_in in profile_in.unavailable_dates:
-            unavailable = UnavailableDate(
-                profile_id=profile.id,
-                date=date_in.date,
-                reason=date_in.reason,
-            )
-            db.add(unavailable)
+        profile.unavailable_dates = [
+            UnavailableDate(date=date_in.date, reason=date_in.reason)
+            for date_in in profile_in.unavailable_dates
+        ]
 
+    await directory_crud.refresh(db, profile_ids=[profile.id])
     await db.commit()
     await db.refresh(profile)
     return profile
@@ -160,64 +188,243 @@ async def delete_professional_profile(
     await db.commit()
 
 
+async def get_profile_validator(
+    db: AsyncSession,
+    *,
+    profile_id: int | None = None,
+    user_id: int | None = None,
+    include_reviews: bool = False,
+) -> Validator | None:
+    version = await professional_crud.get_version(
+        db, profile_id=profile_id, user_id=user_id, include_reviews=include_reviews
+    )
+    if version is None:
+        return None
+
+    versions = [("profile", version.updated_at), ("user", version.user_updated_at)]
+    if include_reviews:
+        versions.append((("reviews", version.reviews_count), version.reviews_updated_at))
+    return entity_validator(f"professional:{version.id}", *versions)
+
+
+async def get_professionals_list_validator(
+    db: AsyncSession,
+    category: str | None = None,
+    name: str | None = None,
+    tag_ids: list[int] | None = None,
+    match: TagMatch = TagMatch.ANY,
+    only_online: bool | None = None,
+    only_presential: bool | None = None,
+    near: tuple[float, float] | None = None,
+    radius_km: float | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Validator:
+    """Validador da página a partir das tuplas ``(id, updated_at)`` dos perfis listados."""
+    versions = await directory_crud.list_versions(
+        db,
+        category=category,
+        name=name,
+        tag_ids=tag_ids,
+        match=match,
+        only_online=only_online,
+        only_presential=only_presential,
+        near=near,
+        radius_km=radius_km,
+        skip=skip,
+        limit=limit,
+    )
+    return entity_validator("professionals", *versions)
+
+
 async def list_professionals(
     db: AsyncSession,
     category: str | None = None,
     name: str | None = None,
-    tags: list[str] | None = None,
+    tag_ids: list[int] | None = None,
+    match: TagMatch = TagMatch.ANY,
     only_online: bool | None = None,
     only_presential: bool | None = None,
+    near: tuple[float, float] | None = None,
+    radius_km: float | None = None,
     skip: int = 0,
     limit: int = 100,
-) -> list[ProfessionalProfileResponse]:
-    profiles = await professional_crud.list_professionals(
+) -> list[dict]:
+    rows = await directory_crud.list_professionals(
         db,
         category=category,
         name=name,
-        tags=tags,
+        tag_ids=tag_ids,
+        match=match,
         only_online=only_online,
         only_presential=only_presential,
+        near=near,
+        radius_km=radius_km,
         skip=skip,
         limit=limit,
     )
 
-    responses = []
-    for profile in profiles:
-        response = ProfessionalProfileResponse(
-            id=profile.id,
-            user_id=profile.user_id,
-            bio=profile.bio,
-            category=profile.category,
-            profissional_identification=profile.profissional_identification,
-            services=profile.services,
-            price=profile.price,
-            only_online=profile.only_online,
-            only_presential=profile.only_presential,
-            rating=profile.rating,
-            num_reviews=profile.num_reviews,
-            available_days_of_week=profile.available_days_of_week,
-            start_hour=profile.start_hour,
-            end_hour=profile.end_hour,
-            user_name=profile.user.name if profile.user else None,
-            email=profile.user.email if profile.user else None,
-            phone=profile.user.phone if profile.user else None,
-            cep=profile.user.cep if profile.user else None,
-            uf=profile.user.uf if profile.user else None,
-            city=profile.user.city if profile.user else None,
-            address=profile.user.address if profile.user else None,
-            profile_image_url=profile.user.profile_image_url if profile.user else None,
-            tags=[tag.name for tag in profile.tags],
-            unavailable_dates=[],
-        )
-        responses.append(response)
+    # As linhas já vêm no formato do schema; só faltam as coleções não listadas
+    profiles = [
+        {**row._mapping, "unavailable_dates": [], "reviews": []} for row in rows
+    ]
+    if near is not None:
+        for profile in profiles:
+            profile["distance_km"] = round(profile["distance_km"], 1)
+    return profiles
 
-    return responses
+
+async def search_professionals(
+    db: AsyncSession,
+    category: str | None = None,
+    name: str | None = None,
+    tag_ids: list[int] | None = None,
+    match: TagMatch = TagMatch.ANY,
+    only_online: bool | None = None,
+    only_presential: bool | None = None,
+    near: tuple[float, float] | None = None,
+    radius_km: float | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    facet_limit: int = 20,
+) -> dict:
+    """Página de perfis com o total e as contagens por tag de todos os resultados."""
+    filters = {
+        "category": category,
+        "name": name,
+        "tag_ids": tag_ids,
+        "match": match,
+        "only_online": only_online,
+        "only_presential": only_presential,
+        "near": near,
+        "radius_km": radius_km,
+    }
+    items = await list_professionals(db, **filters, skip=skip, limit=limit)
+    total = await directory_crud.count(db, **filters)
+    facets = await directory_crud.tag_facets(db, **filters, limit=facet_limit)
+    return {
+        "items": items,
+        "total": total,
+        "tag_facets": [{"tag": tag, "count": count} for tag, count in facets],
+    }
+
+
+async def get_facets_validator(
+    db: AsyncSession,
+    category: str | None = None,
+    name: str | None = None,
+    tag_ids: list[int] | None = None,
+    match: TagMatch = TagMatch.ANY,
+    only_online: bool | None = None,
+    only_presential: bool | None = None,
+    near: tuple[float, float] | None = None,
+    radius_km: float | None = None,
+    tag_limit: int = 20,
+) -> Validator:
+    """Validador das facetas: muda quando qualquer perfil do filtro muda, entra ou sai."""
+    version = await directory_crud.get_version(
+        db,
+        category=category,
+        name=name,
+        tag_ids=tag_ids,
+        match=match,
+        only_online=only_online,
+        only_presential=only_presential,
+        near=near,
+        radius_km=radius_km,
+    )
+    return aggregate_validator(
+        "professionals:facets", version.updated_at, version.count, tag_limit
+    )
+
+
+async def get_facets(
+    db: AsyncSession,
+    category: str | None = None,
+    name: str | None = None,
+    tag_ids: list[int] | None = None,
+    match: TagMatch = TagMatch.ANY,
+    only_online: bool | None = None,
+    only_presential: bool | None = None,
+    near: tuple[float, float] | None = None,
+    radius_km: float | None = None,
+    tag_limit: int = 20,
+) -> dict:
+    rows = await directory_crud.facets(
+        db,
+        category=category,
+        name=name,
+        tag_ids=tag_ids,
+        match=match,
+        only_online=only_online,
+        only_presential=only_presential,
+        near=near,
+        radius_km=radius_km,
+        tag_limit=tag_limit,
+    )
+
+    facets: dict = {
+        "total": 0,
+        "category": [],
+        "only_online": [],
+        "only_presential": [],
+        "tags": [],
+    }
+    for facet, value, count in rows:
+        if facet == "total":
+            facets["total"] = count
+        elif facet == "tags":
+            facets["tags"].append({"tag": value, "count": count})
+        elif facet == "category":
+            facets["category"].append({"value": value, "count": count})
+        else:
+            facets[facet].append({"value": value == "true", "count": count})
+
+    for facet in ("category", "only_online", "only_presential"):
+        facets[facet].sort(key=lambda item: (-item["count"], str(item["value"])))
+    return facets
+
+
+async def resolve_tag_filter(
+    db: AsyncSession, tags: list[str] | None, match: TagMatch
+) -> list[int] | None:
+    """
+    Converter os nomes de ``tags=`` em ids do dicionário. ``None`` = sem filtro;
+    lista vazia = nenhum perfil pode satisfazer o filtro.
+    """
+    if not tags:
+        return None
+    tag_ids = await tag_crud.get_ids(db, tags)
+    if match == TagMatch.ALL and None in tag_ids:
+        return []
+    return [tag_id for tag_id in tag_ids if tag_id is not None]
+
+
+def resolve_near(near: str) -> tuple[float, float]:
+    """Converter ``near=`` (``"lat,lon"`` ou CEP) em coordenadas."""
+    point = parse_point(near)
+    if point is None:
+        raise BadRequestException(
+            "near must be a valid CEP or 'latitude,longitude' coordinates"
+        )
+    return point
 
 
 async def get_available_slots(
     db: AsyncSession, profile_id: int, target_date: date, duration_minutes: int
 ) -> AvailableSlotsResponse:
     """Calcular horários disponíveis de um profissional para uma data específica."""
+    # Sem ETag na chave, a origem da sessão entra nela: quem lê do primário (acabou
+    # de agendar) não pode receber o resultado de uma leitura numa réplica atrasada
+    return await slots_flight.do(
+        (db.bind, profile_id, target_date, duration_minutes),
+        lambda: _compute_available_slots(db, profile_id, target_date, duration_minutes),
+    )
+
+
+async def _compute_available_slots(
+    db: AsyncSession, profile_id: int, target_date: date, duration_minutes: int
+) -> AvailableSlotsResponse:
     profile = await get_professional_profile(db, profile_id)
 
     # Verificar se o profissional tem horários configurados
@@ -251,29 +458,29 @@ async def get_available_slots(
         )
 
     # Verificar datas indisponíveis
-    unavailable_result = await db.execute(
-        select(UnavailableDate).where(
-            UnavailableDate.profile_id == profile_id,
-            UnavailableDate.date == str(target_date),
-        )
-    )
-    if unavailable_result.scalar_one_or_none():
+    if await professional_crud.is_unavailable(
+        db, profile_id=profile_id, target_date=target_date
+    ):
         return AvailableSlotsResponse(
             date=target_date,
             available_slots=[],
             unavailable_reason="Data marcada como indisponível",
         )
 
-    # Buscar agendamentos do dia
-    appointments = await appointment_crud.get_by_professional_and_date(
-        db, professional_id=profile_id, start_date=target_date, end_date=target_date
+    # Agendamentos não cancelados do dia (só início e fim)
+    appointments = await appointment_crud.get_booked_windows(
+        db, professional_id=profile_id, target_date=target_date
     )
-
-    # Filtrar apenas agendamentos não cancelados
     booked_slots = [
-        (apt.start_time.time(), apt.end_time.time())
-        for apt in appointments
-        if apt.status != AppointmentStatus.CANCELLED
+        (apt.start_time.time(), apt.end_time.time()) for apt in appointments
+    ]
+
+    # Horários reservados (POST /appointments/hold) também ficam indisponíveis
+    holds = await slot_hold_crud.get_active_for_day(
+        db, professional_id=profile_id, target_date=target_date
+    )
+    booked_slots += [
+        (hold.start_time.time(), hold.end_time.time()) for hold in holds
     ]
 
     # Gerar slots disponíveis
@@ -313,40 +520,46 @@ async def get_available_slots(
     return AvailableSlotsResponse(date=target_date, available_slots=available_slots)
 
 
-async def build_professional_response_with_reviews(
-    profile: ProfessionalProfile,
-    limit_reviews: int = 5,
-) -> dict:
-    """
-    Constrói resposta do profissional incluindo reviews recentes.
-    """
-    from app.schemas.professional import ReviewSummary
-
-    # Pegar as últimas N reviews
+def build_review_summaries(
+    profile: ProfessionalProfile, limit_reviews: int = 5
+) -> list[dict]:
+    """Resumo (formato ``ReviewSummary``) das N avaliações mais recentes do perfil."""
     recent_reviews = sorted(profile.reviews, key=lambda r: r.created_at, reverse=True)[
         :limit_reviews
     ]
+    return [
+        {
+            "id": review.id,
+            "rating": review.rating,
+            "comment": review.comment,
+            "patient_name": (
+                review.patient.name if not review.is_anonymous and review.patient else None
+            ),
+            "is_anonymous": review.is_anonymous,
+            "created_at": review.created_at.isoformat(),
+        }
+        for review in recent_reviews
+    ]
 
-    reviews_data = []
-    for review in recent_reviews:
-        patient_name = None
-        if not review.is_anonymous and review.patient:
-            patient_name = review.patient.name
-
-        reviews_data.append(
-            ReviewSummary(
-                id=review.id,
-                rating=review.rating,
-                comment=review.comment,
-                patient_name=patient_name,
-                is_anonymous=review.is_anonymous,
-                created_at=review.created_at.isoformat(),
-            )
-        )
 
+def build_profile_payload(
+    profile: ProfessionalProfile,
+    *,
+    user: User | None = None,
+    tags: list[str] | None = None,
+    reviews: list[dict] | None = None,
+) -> dict:
+    """
+    Único mapeamento de perfil (e usuário dono) para o formato de
+    ``ProfessionalProfileResponse``, na ordem de campos do schema.
+
+    Os dados vêm do banco e já são válidos: o dict vai direto para
+    ``fast_json_response``, sem passar de novo pela validação do pydantic.
+    ``user`` e ``tags`` permitem montar a resposta sem tocar em
+    relacionamentos não carregados.
+    """
+    user = user if user is not None else profile.user
     return {
-        "id": profile.id,
-        "user_id": profile.user_id,
         "bio": profile.bio,
         "category": profile.category,
         "profissional_identification": profile.profissional_identification,
@@ -354,20 +567,22 @@ async def build_professional_response_with_reviews(
         "price": profile.price,
         "only_online": profile.only_online,
         "only_presential": profile.only_presential,
-        "rating": profile.rating,
-        "num_reviews": profile.num_reviews,
         "available_days_of_week": profile.available_days_of_week,
         "start_hour": profile.start_hour,
         "end_hour": profile.end_hour,
-        "user_name": profile.user.name if profile.user else None,
-        "email": profile.user.email if profile.user else None,
-        "phone": profile.user.phone if profile.user else None,
-        "cep": profile.user.cep if profile.user else None,
-        "uf": profile.user.uf if profile.user else None,
-        "city": profile.user.city if profile.user else None,
-        "address": profile.user.address if profile.user else None,
-        "profile_image_url": profile.user.profile_image_url if profile.user else None,
-        "tags": [tag.name for tag in profile.tags],
+        "id": profile.id,
+        "user_id": profile.user_id,
+        "rating": profile.rating,
+        "num_reviews": profile.num_reviews,
+        "user_name": user.name if user else None,
+        "email": user.email if user else None,
+        "phone": user.phone if user else None,
+        "cep": user.cep if user else None,
+        "uf": user.uf if user else None,
+        "city": user.city if user else None,
+        "address": user.address if user else None,
+        "profile_image_url": user.profile_image_url if user else None,
+        "tags": tags if tags is not None else [tag.name for tag in profile.tags],
         "unavailable_dates": [],
-        "reviews": reviews_data,
+        "reviews": reviews or [],
     }
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.appointment import appointment_crud
+from app.crud.job import job_crud
+from app.models.enums import AppointmentStatus, JobKind, ReminderStatus
+from app.services.notifier import AppointmentReminder, Notifier
+
+
+class ReminderService:
+
+    async def schedule_due(
+        self, db: AsyncSession, *, lead: timedelta, limit: int
+    ) -> int:
+        """
+        Reserve a batch of appointments due for a reminder and enqueue one delivery
+        job per appointment, in the caller's transaction.
+        """
+        appointment_ids = await appointment_crud.claim_due_reminders(
+            db, lead=lead, limit=limit
+        )
+        await job_crud.enqueue_many(
+            db,
+            kind=JobKind.SEND_APPOINTMENT_REMINDER,
+            jobs=[
+                (f"reminder:{appointment_id}", {"appointment_id": appointment_id})
+                for appointment_id in appointment_ids
+            ],
+        )
+        return len(appointment_ids)
+
+    async def deliver(
+        self, db: AsyncSession, *, appointment_id: int, notifier: Notifier
+    ) -> ReminderStatus | None:
+        """
+        Send the reminder and record the delivery state. Appointments cancelled,
+        completed or already reminded since scheduling are skipped.
+        """
+        row = await appointment_crud.get_notification_row(
+            db, appointment_id=appointment_id
+        )
+        if row is None or row.reminder_status != ReminderStatus.QUEUED:
+            return None
+
+        if row.status not in (AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED):
+            status = ReminderStatus.SKIPPED
+        else:
+            await notifier.send_appointment_reminder(
+                AppointmentReminder(
+                    appointment_id=row.id,
+                    start_time=row.start_time,
+                    end_time=row.end_time,
+                    patient_name=row.patient_name,
+                    patient_email=row.patient_email,
+                    professional_name=row.professional_name,
+                )
+            )
+            status = ReminderStatus.SENT
+
+        await appointment_crud.set_reminder_status(
+            db, appointment_id=appointment_id, status=status
+        )
+        return status
+
+
+reminder_service = ReminderService()
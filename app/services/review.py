@@ -1,13 +1,21 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.appointment import appointment_crud
+from app.crud.directory import directory_crud
+from app.crud.job import job_crud
 from app.crud.professional import professional_crud
 from app.crud.review import review as review_crud
 from app.models.appointment import Appointment
-from app.models.enums import AppointmentStatus
+from app.models.enums import AppointmentStatus, JobKind
 from app.models.review import Review
 from app.schemas.review import ReviewCreate, ReviewUpdate
+from app.services.notifier import Notifier, ReviewInvitation
 from app.utils.exceptions import BadRequestException, NotFoundException
+from app.utils.http_cache import Validator, aggregate_validator, entity_validator
+from app.utils.single_flight import SingleFlight
+
+stats_flight = SingleFlight("review_stats")
 
 
 class ReviewService:
@@ -62,8 +70,8 @@ class ReviewService:
         await db.flush()
         await db.refresh(new_review)
 
-        # Update professional rating
-        await self.update_professional_rating(
+        # Update professional rating (em segundo plano)
+        await self.enqueue_rating_refresh(
             db, professional_id=appointment.professional_id
         )
 
@@ -99,7 +107,7 @@ class ReviewService:
 
         # Recalculate professional rating if rating changed
         if review_in.rating is not None:
-            await self.update_professional_rating(
+            await self.enqueue_rating_refresh(
                 db, professional_id=db_review.professional_id
             )
 
@@ -132,11 +140,54 @@ class ReviewService:
         # Delete review
         await review_crud.delete(db, pk=review_id)
 
-        # Recalculate professional rating
-        await self.update_professional_rating(db, professional_id=professional_id)
+        # Recalculate professional rating (em segundo plano)
+        await self.enqueue_rating_refresh(db, professional_id=professional_id)
 
         await db.commit()
 
+    async def enqueue_rating_refresh(
+        self,
+        db: AsyncSession,
+        *,
+        professional_id: int,
+    ) -> None:
+        """
+        Schedule the rating recalculation in the same transaction as the review
+        write. Pending refreshes for the same professional are coalesced.
+        """
+        await job_crud.enqueue(
+            db,
+            kind=JobKind.REFRESH_PROFESSIONAL_RATING,
+            payload={"professional_id": professional_id},
+            key=f"rating:{professional_id}",
+        )
+
+    async def send_review_invitation(
+        self, db: AsyncSession, *, appointment_id: int, notifier: Notifier
+    ) -> bool:
+        """
+        Invite the patient to review a completed appointment, unless it was
+        reviewed (or reopened) in the meantime.
+        """
+        row = await appointment_crud.get_notification_row(
+            db, appointment_id=appointment_id
+        )
+        if row is None or row.status != AppointmentStatus.COMPLETED:
+            return False
+        if await review_crud.get_by_appointment(db, appointment_id=appointment_id):
+            return False
+
+        await notifier.send_review_invitation(
+            ReviewInvitation(
+                appointment_id=row.id,
+                start_time=row.start_time,
+                patient_name=row.patient_name,
+                patient_email=row.patient_email,
+                professional_name=row.professional_name,
+            )
+        )
+        return True
+
     async def update_professional_rating(
         self,
         db: AsyncSession,
@@ -155,7 +206,7 @@ class ReviewService:
             professional.rating = stats["average_rating"]
             professional.num_reviews = stats["total_reviews"]
             db.add(professional)
-            await db.flush()
+            await directory_crud.refresh(db, profile_ids=[professional_id])
 
     async def get_professional_reviews(
         self,
@@ -177,17 +228,70 @@ class ReviewService:
         )
         return reviews, total
 
+    async def get_professional_reviews_validator(
+        self,
+        db: AsyncSession,
+        *,
+        professional_id: int,
+        scope: str = "reviews",
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Validator:
+        """
+        Validator for the review list/stats of a professional (aggregate query only).
+        """
+        last_modified, count = await review_crud.get_version_by_professional(
+            db, professional_id=professional_id
+        )
+        return aggregate_validator(
+            scope, last_modified, count, professional_id, skip, limit
+        )
+
+    async def get_patient_reviews_validator(
+        self,
+        db: AsyncSession,
+        *,
+        patient_id: int,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Validator:
+        last_modified, count = await review_crud.get_version_by_patient(
+            db, patient_id=patient_id
+        )
+        return aggregate_validator(
+            "patient-reviews", last_modified, count, patient_id, skip, limit
+        )
+
+    async def get_review_validator(
+        self,
+        db: AsyncSession,
+        *,
+        review_id: int,
+    ) -> Validator | None:
+        version = await review_crud.get_version(db, review_id=review_id)
+        if version is None:
+            return None
+        return entity_validator("review", version)
+
     async def get_professional_stats(
         self,
         db: AsyncSession,
         *,
         professional_id: int,
+        etag: str | None = None,
     ) -> dict:
         """
         Get review statistics for a professional.
+
+        Identical concurrent calls share one query; ``etag`` (the validator already
+        checked by the route) is part of the key. The returned dict is shared and
+        must not be mutated.
         """
-        return await review_crud.get_stats_by_professional(
-            db, professional_id=professional_id
+        return await stats_flight.do(
+            (professional_id, etag),
+            lambda: review_crud.get_stats_by_professional(
+                db, professional_id=professional_id
+            ),
         )
 
     async def get_patient_reviews(
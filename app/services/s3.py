@@ -25,6 +25,38 @@ class S3Service:
         self.bucket_name = settings.aws_s3_bucket
         self.region = settings.aws_region
 
+    def prepare_profile_image(self, file_name: str, user_id: int) -> dict:
+        """
+        Generate the S3 key, public URL and content type for a new profile image.
+
+        The URL is deterministic, so it travels in the upload job payload and is
+        stored once the upload succeeds.
+        """
+        file_extension = file_name.split(".")[-1] if "." in file_name else "jpg"
+        unique_filename = f"profile_images/user_{user_id}/{uuid.uuid4()}.{file_extension}"
+        return {
+            "url": f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{unique_filename}",
+            "key": unique_filename,
+            "content_type": self._get_content_type(file_extension),
+        }
+
+    def put_object(
+        self, *, key: str, content: bytes | BinaryIO, content_type: str
+    ) -> None:
+        """Upload content to S3 under the given key."""
+        try:
+            logger.info(f"Uploading to S3: {key}")
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=content,
+                ContentType=content_type,
+            )
+            logger.info(f"Upload successful: {key}")
+        except ClientError as e:
+            logger.error(f"S3 upload error: {str(e)}", exc_info=True)
+            raise ValueError(f"S3 upload failed: {str(e)}")
+
     def upload_profile_image(
         self, file_content: bytes | BinaryIO, file_name: str, user_id: int
     ) -> dict:
@@ -39,41 +71,12 @@ class S3Service:
         Returns:
             dict: Upload response containing url and key
         """
-        try:
-            logger.info(f"Starting S3 upload for user {user_id}")
-            logger.info(f"File name: {file_name}, File type: {type(file_content)}")
-
-            # Generate unique filename
-            file_extension = file_name.split(".")[-1] if "." in file_name else "jpg"
-            unique_filename = f"profile_images/user_{user_id}/{uuid.uuid4()}.{file_extension}"
-
-            logger.info(f"Uploading to S3: {unique_filename}")
-
-            # Determine content type
-            content_type = self._get_content_type(file_extension)
-
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=unique_filename,
-                Body=file_content,
-                ContentType=content_type,
-            )
-
-            # Generate public URL
-            url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{unique_filename}"
-
-            logger.info(f"Upload successful! URL: {url}")
-            return {
-                "url": url,
-                "key": unique_filename,
-            }
-        except ClientError as e:
-            logger.error(f"S3 upload error: {str(e)}", exc_info=True)
-            raise ValueError(f"S3 upload failed: {str(e)}")
-        except Exception as e:
-            logger.error(f"S3 upload exception: {str(e)}", exc_info=True)
-            raise
+        logger.info(f"Starting S3 upload for user {user_id}")
+        image = self.prepare_profile_image(file_name, user_id)
+        self.put_object(
+            key=image["key"], content=file_content, content_type=image["content_type"]
+        )
+        return {"url": image["url"], "key": image["key"]}
 
     def delete_image(self, key: str) -> bool:
         """
@@ -0,0 +1,66 @@
+"""Local spool for uploads waiting on a background job."""
+
+import logging
+import os
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSpool:
+    """
+    Keep uploaded files on disk until the job that sends them to S3 runs.
+
+    Only the spool key travels in the job payload, so the ``jobs`` table (and its
+    WAL) never carries the file itself. Workers running outside the API process
+    must see the same directory (shared volume).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        # A chave vem do payload da tarefa: nunca deixar sair do diretório
+        if not key or Path(key).name != key:
+            raise ValueError(f"Invalid spool key: {key!r}")
+        return self.directory / key
+
+    def write(self, content: bytes) -> str:
+        """Store content and return its spool key."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        key = uuid.uuid4().hex
+        partial = self.directory / f".{key}.partial"
+        partial.write_bytes(content)
+        # rename é atômico: o worker nunca lê um arquivo pela metade
+        os.replace(partial, self._path(key))
+        return key
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def remove(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def purge(self, *, older_than: timedelta) -> int:
+        """Delete files left behind (rolled back requests, failed jobs)."""
+        if not self.directory.is_dir():
+            return 0
+        cutoff = time.time() - older_than.total_seconds()
+        purged = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    purged += 1
+            except FileNotFoundError:
+                continue
+        logger.info(f"Purged {purged} spooled uploads")
+        return purged
+
+
+upload_spool = UploadSpool(settings.upload_spool_dir)
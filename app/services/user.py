@@ -1,12 +1,17 @@
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.directory import directory_crud
+from app.crud.job import job_crud
 from app.crud.user import user_crud
-from app.models.enums import Role
+from app.models.enums import JobKind, Role
 from app.models.professional import ProfessionalProfile
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.services.auth import hash_password
 from app.services.s3 import s3_service
+from app.services.upload_spool import upload_spool
 from app.utils.exceptions import BadRequestException, NotFoundException
 
 
@@ -19,7 +24,9 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     if existing_cpf:
         raise BadRequestException("CPF already registered")
 
-    hashed_password = hash_password(user_in.password)
+    # Encerra a transação das verificações: a conexão volta ao pool durante o bcrypt
+    await db.commit()
+    hashed_password = await hash_password(user_in.password)
 
     user = await user_crud.create_user(
         db, obj_in=user_in, hashed_password=hashed_password
@@ -48,6 +55,7 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
             end_hour="",
         )
         db.add(profile)
+        await directory_crud.refresh(db, user_ids=[user.id])
 
     await db.commit()
     await db.refresh(user)
@@ -70,6 +78,8 @@ async def update_user(db: AsyncSession, user_id: int, user_in: UserUpdate) -> Us
             raise BadRequestException("Email already in use")
 
     updated_user = await user_crud.update(db, db_obj=user, obj_in=user_in)
+    if updated_user.role == Role.PROFESSIONAL:
+        await directory_crud.refresh(db, user_ids=[user_id])
     await db.commit()
     await db.refresh(updated_user)
     return updated_user
@@ -93,14 +103,34 @@ async def upload_profile_image(
     """Upload profile image for a user."""
     user = await get_user(db, user_id)
 
-    # Upload to S3
-    upload_result = s3_service.upload_profile_image(
-        file_content=file_content, file_name=file_name, user_id=user_id
+    # O envio ao S3 fica para o worker; a URL só é gravada depois que ele termina
+    # (set_profile_image_url), para o perfil nunca apontar para um objeto inexistente
+    image = s3_service.prepare_profile_image(file_name, user_id)
+    # Os bytes ficam no spool local; a tarefa leva só a chave, sem inflar a tabela jobs
+    spool_key = await asyncio.to_thread(upload_spool.write, file_content)
+    await job_crud.enqueue(
+        db,
+        kind=JobKind.UPLOAD_PROFILE_IMAGE,
+        payload={
+            "user_id": user_id,
+            "key": image["key"],
+            "url": image["url"],
+            "content_type": image["content_type"],
+            "spool_key": spool_key,
+        },
     )
-
-    # Update user with new image URL
-    user.profile_image_url = upload_result["url"]
     await db.commit()
     await db.refresh(user)
 
     return user
+
+
+async def set_profile_image_url(db: AsyncSession, user_id: int, url: str) -> None:
+    """Point the user at an image that is already in S3 (called by the upload job)."""
+    user = await user_crud.get(db, pk=user_id)
+    if user is None:
+        # Conta excluída antes do envio terminar
+        return
+    user.profile_image_url = url
+    if user.role == Role.PROFESSIONAL:
+        await directory_crud.refresh(db, user_ids=[user_id])
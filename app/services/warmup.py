@@ -0,0 +1,150 @@
+"""Aquecimento do processo antes de receber tráfego.
+
+Logo após um deploy as primeiras requisições pagam custos que depois somem: a
+configuração dos mappers do SQLAlchemy, conexões novas ao banco, o carregamento
+do backend do bcrypt e do jose, a compilação das consultas quentes (e os
+prepared statements do asyncpg) e as páginas frias no cache do PostgreSQL. O
+``lifespan`` roda ``warm_up_until_ready`` antes de aceitar requisições (até
+``WARMUP_TIMEOUT_SECONDS``) e ``GET /health/ready`` só responde 200 quando o
+aquecimento terminou.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import configure_mappers
+from starlette.datastructures import State
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadSessionLocal, engine, replica_router
+from app.core.security import create_access_token, decode_access_token, pwd_context
+from app.crud.user import user_crud
+from app.services import professional as professional_service
+from app.services.auth import sync_revoked_tokens
+from app.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+warmup_duration_seconds = Histogram(
+    "warmup_duration_seconds",
+    "Duração de cada etapa do aquecimento na subida do processo",
+    labels=("stage",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+async def _configure_mappers() -> None:
+    configure_mappers()
+
+
+async def _load_security_backends() -> None:
+    # Só carrega o backend do bcrypt (sem calcular hash) e faz um ida e volta no jose
+    pwd_context.handler().get_backend()
+    decode_access_token(create_access_token({"id": 0}))
+
+
+async def _open_connections(target: AsyncEngine, count: int) -> None:
+    """Abrir ``count`` conexões ao mesmo tempo; ao sair elas ficam no pool."""
+    async with contextlib.AsyncExitStack() as stack:
+        connections = await asyncio.gather(
+            *(stack.enter_async_context(target.connect()) for _ in range(count))
+        )
+        for connection in connections:
+            await connection.exec_driver_sql("select 1")
+
+
+async def _fill_pools() -> None:
+    # Mais que o pool_size seriam conexões de overflow, fechadas ao devolver
+    count = min(settings.warmup_connections, settings.database_pool_limits[0])
+    if count > 0:
+        await asyncio.gather(
+            *(_open_connections(target, count) for target in [engine, *replica_router.engines])
+        )
+
+
+async def _prime_reads(session_factory: async_sessionmaker[AsyncSession]) -> list[dict]:
+    """As leituras públicas mais acessadas, com os parâmetros padrão das rotas."""
+    async with session_factory() as db:
+        await professional_service.get_professionals_list_validator(db, limit=100)
+        profiles = await professional_service.list_professionals(db, limit=100)
+        await professional_service.get_facets_validator(db)
+        await professional_service.get_facets(db)
+        await professional_service.search_professionals(db, limit=20)
+
+    profiles = profiles[: settings.warmup_profiles]
+    for profile in profiles:
+        async with session_factory() as db:
+            await professional_service.get_profile_validator(
+                db, profile_id=profile["id"], include_reviews=True
+            )
+            await professional_service.get_profile_payload(db, profile["id"])
+    return profiles
+
+
+async def _prime_slots(profiles: list[dict]) -> None:
+    # Só no primário, como a rota: slot_holds é UNLOGGED e não existe nas réplicas
+    today = date.today()  # noqa: DTZ011
+    for profile in profiles:
+        async with ReadSessionLocal() as db:
+            await professional_service.get_available_slots(db, profile["id"], today, 60)
+
+
+async def _prime_queries() -> None:
+    async with ReadSessionLocal() as db:
+        # Login: mesma consulta (lambda_stmt) que authenticate_user
+        await user_crud.get_by_email(db, email="warmup@vittaaqui.invalid")
+    factories = [ReadSessionLocal, *replica_router.session_factories]
+    profiles, *_ = await asyncio.gather(*(_prime_reads(factory) for factory in factories))
+    await _prime_slots(profiles)
+
+
+async def _load_revocation_list() -> None:
+    # Tokens revogados são recusados desde a primeira requisição
+    async with AsyncSessionLocal() as db:
+        await sync_revoked_tokens(db)
+        await db.commit()
+
+
+STAGES: list[tuple[str, Callable[[], Awaitable[None]]]] = [
+    ("mappers", _configure_mappers),
+    ("security", _load_security_backends),
+    ("pool", _fill_pools),
+    ("revocations", _load_revocation_list),
+    ("queries", _prime_queries),
+]
+
+
+async def warm_up() -> float:
+    """Rodar todas as etapas em ordem; retorna a duração total em segundos."""
+    started = time.perf_counter()
+    for stage, run in STAGES:
+        stage_started = time.perf_counter()
+        await run()
+        elapsed = time.perf_counter() - stage_started
+        warmup_duration_seconds.observe(elapsed, stage=stage)
+        logger.debug("Warm-up stage %s took %.3fs", stage, elapsed)
+    return time.perf_counter() - started
+
+
+async def warm_up_until_ready(state: State, stop: asyncio.Event) -> None:
+    """
+    Aquecer e marcar ``state.ready``. Se falhar (banco fora do ar na subida), o
+    processo serve mesmo assim, sem ficar pronto, e tenta de novo a cada
+    ``WARMUP_RETRY_SECONDS`` até conseguir ou ``stop`` ser sinalizado.
+    """
+    while not stop.is_set():
+        try:
+            elapsed = await warm_up()
+        except Exception:
+            logger.exception("Warm-up failed; retrying in %ss", settings.warmup_retry_seconds)
+        else:
+            state.ready = True
+            logger.info("Warm-up finished in %.2fs; ready for traffic", elapsed)
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), timeout=settings.warmup_retry_seconds)
@@ -0,0 +1,220 @@
+"""
+Geocodificação offline de CEPs.
+
+Os CEPs são distribuídos por faixas geográficas: os primeiros dígitos identificam
+região, sub-região e setor. A tabela abaixo associa prefixos de CEP ao centro da
+cidade principal da faixa, o que dá precisão de cidade/região metropolitana sem
+depender de serviços externos. A busca usa o prefixo mais longo cadastrado, então
+faixas mais finas (3 a 5 dígitos) podem ser acrescentadas sem mudar o código.
+
+As coordenadas também definem a grade usada no índice de proximidade
+(``geo_cell``): células de ``GRID_DEGREES`` graus, numeradas linha a linha.
+"""
+
+import math
+import re
+
+EARTH_RADIUS_KM = 6371.0
+
+# Tamanho da célula da grade (~28 km no equador)
+GRID_DEGREES = 0.25
+GRID_COLUMNS = int(360 / GRID_DEGREES)
+
+# prefixo do CEP -> (latitude, longitude)
+CEP_PREFIXES: dict[str, tuple[float, float]] = {
+    # São Paulo e região metropolitana
+    "01": (-23.550, -46.633),
+    "02": (-23.490, -46.620),
+    "03": (-23.550, -46.550),
+    "04": (-23.630, -46.660),
+    "05": (-23.560, -46.720),
+    "06": (-23.532, -46.792),
+    "07": (-23.454, -46.533),
+    "08": (-23.540, -46.450),
+    "09": (-23.664, -46.538),
+    # Interior e litoral de SP
+    "11": (-23.960, -46.333),
+    "12": (-23.179, -45.887),
+    "13": (-22.906, -47.061),
+    "14": (-21.178, -47.810),
+    "15": (-20.820, -49.379),
+    "16": (-21.209, -50.433),
+    "17": (-22.315, -49.061),
+    "18": (-23.502, -47.458),
+    "19": (-22.121, -51.389),
+    # Rio de Janeiro
+    "20": (-22.903, -43.176),
+    "21": (-22.850, -43.300),
+    "22": (-22.970, -43.190),
+    "23": (-22.920, -43.550),
+    "24": (-22.883, -43.104),
+    "25": (-22.786, -43.312),
+    "26": (-22.759, -43.451),
+    "27": (-22.523, -44.104),
+    "28": (-21.754, -41.324),
+    # Espírito Santo
+    "29": (-20.320, -40.338),
+    # Minas Gerais
+    "30": (-19.917, -43.934),
+    "31": (-19.870, -43.960),
+    "32": (-19.932, -44.054),
+    "33": (-19.466, -44.247),
+    "34": (-19.985, -43.847),
+    "35": (-19.468, -42.537),
+    "36": (-21.764, -43.350),
+    "37": (-21.551, -45.430),
+    "38": (-18.918, -48.277),
+    "39": (-16.735, -43.862),
+    # Bahia e Sergipe
+    "40": (-12.971, -38.501),
+    "41": (-12.930, -38.430),
+    "42": (-12.697, -38.324),
+    "43": (-12.547, -38.712),
+    "44": (-12.267, -38.967),
+    "45": (-14.866, -40.839),
+    "46": (-14.224, -42.781),
+    "47": (-12.153, -44.996),
+    "48": (-9.413, -40.503),
+    "49": (-10.911, -37.072),
+    # Pernambuco, Alagoas, Paraíba e Rio Grande do Norte
+    "50": (-8.054, -34.881),
+    "51": (-8.110, -34.910),
+    "52": (-8.030, -34.920),
+    "53": (-8.009, -34.855),
+    "54": (-8.113, -35.015),
+    "55": (-8.283, -35.976),
+    "56": (-9.389, -40.503),
+    "57": (-9.666, -35.735),
+    "58": (-7.119, -34.845),
+    "59": (-5.795, -35.209),
+    # Ceará, Piauí e Maranhão
+    "60": (-3.732, -38.527),
+    "61": (-3.736, -38.653),
+    "62": (-3.689, -40.349),
+    "63": (-7.213, -39.315),
+    "64": (-5.089, -42.802),
+    "65": (-2.530, -44.303),
+    # Pará e Amapá
+    "66": (-1.456, -48.502),
+    "67": (-1.366, -48.372),
+    "68": (-2.443, -54.708),
+    "689": (0.035, -51.070),
+    # Amazonas, Roraima e Acre
+    "69": (-3.119, -60.022),
+    "693": (2.820, -60.672),
+    "699": (-9.975, -67.810),
+    # Distrito Federal
+    "70": (-15.794, -47.882),
+    "71": (-15.833, -48.056),
+    "72": (-15.819, -48.108),
+    "73": (-15.652, -47.791),
+    # Goiás, Rondônia e Tocantins
+    "74": (-16.686, -49.265),
+    "75": (-16.328, -48.953),
+    "76": (-15.934, -50.140),
+    "768": (-8.761, -63.904),
+    "769": (-10.877, -61.951),
+    "77": (-10.184, -48.334),
+    # Mato Grosso e Mato Grosso do Sul
+    "78": (-15.601, -56.097),
+    "79": (-20.469, -54.620),
+    # Paraná
+    "80": (-25.429, -49.271),
+    "81": (-25.480, -49.290),
+    "82": (-25.400, -49.250),
+    "83": (-25.535, -49.206),
+    "84": (-25.095, -50.162),
+    "85": (-24.955, -53.455),
+    "86": (-23.310, -51.163),
+    "87": (-23.420, -51.938),
+    # Santa Catarina
+    "88": (-27.595, -48.548),
+    "89": (-26.919, -49.066),
+    "892": (-26.304, -48.846),
+    # Rio Grande do Sul
+    "90": (-30.035, -51.218),
+    "91": (-30.060, -51.170),
+    "92": (-29.918, -51.184),
+    "93": (-29.678, -51.131),
+    "94": (-29.944, -50.992),
+    "95": (-29.168, -51.179),
+    "96": (-31.772, -52.343),
+    "97": (-29.684, -53.807),
+    "98": (-28.388, -53.915),
+    "99": (-28.262, -52.407),
+}
+
+_MAX_PREFIX = max(len(prefix) for prefix in CEP_PREFIXES)
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+
+def clean_cep(cep: str) -> str:
+    return "".join(ch for ch in cep if ch.isdigit())
+
+
+def geocode_cep(cep: str | None) -> tuple[float, float] | None:
+    """Coordenadas aproximadas do CEP, ou ``None`` se a faixa não for conhecida."""
+    if not cep:
+        return None
+
+    digits = clean_cep(cep)
+    if len(digits) != 8:
+        return None
+
+    for size in range(_MAX_PREFIX, 0, -1):
+        if point := CEP_PREFIXES.get(digits[:size]):
+            return point
+    return None
+
+
+def prefix_table() -> tuple[int, list[tuple[str, float, float]]]:
+    """
+    Tabela de prefixos expandida para o tamanho do maior prefixo, para que o banco
+    resolva o CEP com uma simples igualdade: ``(tamanho, [(prefixo, lat, lon), ...])``.
+    """
+    rows = []
+    for number in range(10**_MAX_PREFIX):
+        prefix = f"{number:0{_MAX_PREFIX}d}"
+        if point := geocode_cep(prefix.ljust(8, "0")):
+            rows.append((prefix, *point))
+    return _MAX_PREFIX, rows
+
+
+def parse_point(value: str) -> tuple[float, float] | None:
+    """
+    Interpreta ``near=``: aceita ``"lat,lon"`` ou um CEP. Retorna ``None`` se o valor
+    não puder ser convertido em coordenadas.
+    """
+    if match := _COORDINATES.match(value):
+        latitude, longitude = float(match.group(1)), float(match.group(2))
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            return latitude, longitude
+        return None
+    return geocode_cep(value)
+
+
+def geo_cell(latitude: float, longitude: float) -> int:
+    """Célula da grade; mesmo cálculo de ``app.crud.directory._geo_cell``."""
+    row = math.floor((latitude + 90) / GRID_DEGREES)
+    column = math.floor((longitude + 180) / GRID_DEGREES)
+    return row * GRID_COLUMNS + column
+
+
+def cells_within(latitude: float, longitude: float, radius_km: float) -> list[int]:
+    """Células da grade que cobrem o retângulo envolvente do raio."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    # Perto dos polos o retângulo cobre todas as longitudes
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_delta, 90.0)))
+    lon_delta = 180.0 if cos_lat < 1e-6 else min(lat_delta / cos_lat, 180.0)
+
+    min_row = math.floor((max(latitude - lat_delta, -90.0) + 90) / GRID_DEGREES)
+    max_row = math.floor((min(latitude + lat_delta, 90.0) + 90) / GRID_DEGREES)
+    min_column = math.floor((longitude - lon_delta + 180) / GRID_DEGREES)
+    max_column = math.floor((longitude + lon_delta + 180) / GRID_DEGREES)
+
+    columns = {column % GRID_COLUMNS for column in range(min_column, max_column + 1)}
+    return sorted(
+        row * GRID_COLUMNS + column
+        for row in range(min_row, max_row + 1)
+        for column in columns
+    )
@@ -0,0 +1,95 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+@dataclass(frozen=True, slots=True)
+class Validator:
+    """Validadores HTTP (``ETag``/``Last-Modified``) de um recurso."""
+
+    etag: str
+    last_modified: datetime | None = None
+
+
+def build_etag(*parts: object) -> str:
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def entity_validator(scope: str, *versions: tuple[object, datetime | None]) -> Validator:
+    """Validador a partir de tuplas ``(id, updated_at)`` das entidades exibidas."""
+    last_modified = max((updated for _, updated in versions if updated), default=None)
+    return Validator(etag=build_etag(scope, *versions), last_modified=last_modified)
+
+
+def aggregate_validator(
+    scope: str, last_modified: datetime | None, count: int, *params: object
+) -> Validator:
+    """Validador de listas a partir de ``max(updated_at)`` e ``count(*)``.
+
+    Só ``ETag``: remover ou tirar um item do filtro não altera o ``max(updated_at)``
+    dos que restam, então um ``Last-Modified`` responderia ``304`` com a lista
+    desatualizada. A contagem no ``ETag`` cobre esses casos.
+    """
+    return Validator(etag=build_etag(scope, last_modified, count, *params))
+
+
+def _to_utc(value: datetime) -> datetime:
+    # O banco guarda horários locais sem timezone; astimezone() os interpreta como locais
+    return value.astimezone(UTC).replace(microsecond=0)
+
+
+def validator_headers(validator: Validator) -> dict[str, str]:
+    # no-cache: o cliente pode guardar a resposta, mas revalida a cada uso
+    headers = {"ETag": validator.etag, "Cache-Control": "no-cache"}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            _to_utc(validator.last_modified), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """Avaliar ``If-None-Match``/``If-Modified-Since`` conforme a RFC 9110."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validator.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validator.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return _to_utc(validator.last_modified) <= since
+
+    return False
+
+
+def not_modified_response(validator: Validator) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(validator)
+    )
+
+
+def conditional_response(
+    request: Request, response: Response, validator: Validator | None
+) -> Response | None:
+    """Anexar os validadores à resposta e devolver ``304`` se o cliente já a tem.
+
+    Deve ser chamado antes de carregar relacionamentos e serializar, para que o
+    ``304`` custe apenas a consulta do validador. ``None`` (recurso inexistente)
+    segue o fluxo normal, que produz o ``404``.
+    """
+    if validator is None:
+        return None
+    if is_not_modified(request, validator):
+        return not_modified_response(validator)
+    response.headers.update(validator_headers(validator))
+    return None
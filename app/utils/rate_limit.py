@@ -0,0 +1,246 @@
+"""Limite de requisições por token bucket (por IP e por usuário autenticado).
+
+Cada cliente tem um balde de ``capacity`` fichas que se recarrega a
+``refill_per_second``; cada requisição gasta o custo da rota (login e cadastro,
+que rodam bcrypt, custam mais). Sem fichas suficientes a resposta é ``429`` com
+``Retry-After``. O estado fica em memória, em shards LRU limitados (memória
+constante mesmo com muitos IPs diferentes), ou num servidor compatível com o
+protocolo Redis quando há vários workers.
+"""
+
+import logging
+import math
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from jose import JWTError
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.utils.metrics import Counter
+from app.utils.responses import FastJSONResponse
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # redis é opcional; só o backend "redis" precisa dele
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+rate_limit_rejections_total = Counter(
+    "rate_limit_rejections_total",
+    "Requisições recusadas com 429 pelo limite de taxa",
+    labels=("scope",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Limit:
+    capacity: float
+    refill_per_second: float
+
+
+# (método, caminho) -> custo em fichas; as demais rotas custam DEFAULT_COST
+ROUTE_COSTS: list[tuple[str, re.Pattern[str], int]] = [
+    ("POST", re.compile(r"^/api/auth/(login|register)/?$"), 10),
+    ("GET", re.compile(r"^/api/professionals?/(search|facets)?/?$"), 3),
+    ("GET", re.compile(r"^/api/professionals?/\d+/available-slots/?$"), 3),
+]
+DEFAULT_COST = 1
+
+EXEMPT_PATHS = frozenset({"/", "/health/ready", "/metrics", "/docs", "/redoc", "/openapi.json"})
+
+
+def route_cost(method: str, path: str) -> int:
+    for route_method, pattern, cost in ROUTE_COSTS:
+        if method == route_method and pattern.match(path):
+            return cost
+    return DEFAULT_COST
+
+
+class ShardedBucketStore:
+    """
+    Baldes em memória do processo. As chaves são distribuídas em ``shards``
+    ``OrderedDict`` em ordem de uso; cada shard guarda no máximo
+    ``max_keys / shards`` baldes e descarta o usado há mais tempo ao passar
+    disso. Um cliente descartado volta com o balde cheio, o que só o favorece.
+    Roda no event loop, sem locks.
+    """
+
+    def __init__(self, max_keys: int, shards: int):
+        self._shards: list[OrderedDict[str, tuple[float, float]]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self._max_per_shard = max(1, max_keys // shards)
+
+    async def consume(self, key: str, limit: Limit, cost: float) -> float:
+        """Gastar ``cost`` fichas; retorna 0 se permitido ou os segundos até haver fichas."""
+        shard = self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+        now = time.monotonic()
+
+        state = shard.get(key)
+        if state is None:
+            tokens = limit.capacity
+        else:
+            tokens, updated = state
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+            shard.move_to_end(key)
+
+        if tokens >= cost:
+            tokens -= cost
+            wait = 0.0
+        else:
+            wait = (cost - tokens) / limit.refill_per_second
+
+        shard[key] = (tokens, now)
+        if len(shard) > self._max_per_shard:
+            shard.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+# Recarga e consumo atômicos no servidor; TIME evita depender do relógio dos workers
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Baldes compartilhados entre workers num servidor compatível com o protocolo
+    Redis (Redis, Valkey, KeyDB...). Cada chave expira quando o balde estaria
+    cheio de novo, então a memória também fica limitada. Se o servidor falhar a
+    requisição passa (fail-open): o limite protege a API, não pode derrubá-la.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requer o pacote 'redis'")
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def consume(self, key: str, limit: Limit, cost: float) -> float:
+        try:
+            wait = await self._script(
+                keys=[self.prefix + key],
+                args=[limit.capacity, limit.refill_per_second, cost],
+            )
+        except redis.RedisError:
+            logger.warning("Rate limit backend unavailable; allowing request", exc_info=True)
+            return 0.0
+        return float(wait)
+
+
+BUCKET_STORES = {
+    "memory": lambda: ShardedBucketStore(
+        settings.rate_limit_max_keys, settings.rate_limit_shards
+    ),
+    "redis": lambda: RedisBucketStore(settings.rate_limit_redis_url),
+}
+
+
+def get_bucket_store(backend: str | None = None) -> ShardedBucketStore | RedisBucketStore:
+    backend = backend or settings.rate_limit_backend
+    try:
+        return BUCKET_STORES[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown rate limit backend: {backend!r}") from None
+
+
+def _user_id(scope: Scope) -> int | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                user_id = decode_access_token(token).get("id")
+            except JWTError:
+                return None
+            return user_id if isinstance(user_id, int) else None
+    return None
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI que aplica o limite antes do roteamento. Toda requisição gasta
+    o balde do IP; com JWT válido, também o do usuário, e falta de fichas em
+    qualquer um dos dois responde ``429`` (muitas contas ou tokens num mesmo IP
+    continuam limitados pelo IP). O IP vem de
+    ``scope["client"]``: atrás de proxy, rode o uvicorn com ``--proxy-headers``
+    e ``--forwarded-allow-ips`` para que ele reflita o cliente real.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ShardedBucketStore | RedisBucketStore | None = None,
+        ip_limit: Limit | None = None,
+        user_limit: Limit | None = None,
+    ):
+        self.app = app
+        self.store = store or get_bucket_store()
+        self.ip_limit = ip_limit or Limit(
+            settings.rate_limit_ip_capacity, settings.rate_limit_ip_refill_per_second
+        )
+        self.user_limit = user_limit or Limit(
+            settings.rate_limit_user_capacity, settings.rate_limit_user_refill_per_second
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or path in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        buckets = [("ip", f"ip:{client[0] if client else '-'}", self.ip_limit)]
+        user_id = _user_id(scope)
+        if user_id is not None:
+            buckets.append(("user", f"user:{user_id}", self.user_limit))
+
+        cost = route_cost(scope["method"], path)
+        for bucket_scope, key, limit in buckets:
+            # Custo acima da capacidade nunca passaria; limitado para ainda ser possível
+            wait = await self.store.consume(key, limit, min(cost, limit.capacity))
+            if wait > 0:
+                rate_limit_rejections_total.inc(scope=bucket_scope)
+                response = FastJSONResponse(
+                    {"detail": "Too many requests"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,40 @@
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos o serializador do pydantic-core
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` que renderiza com orjson quando instalado.
+
+    Sem orjson, usa ``pydantic_core.to_json`` (Rust), que também entende enums,
+    datas e ``datetime`` e é bem mais rápido que o ``json`` da stdlib.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return pydantic_core.to_json(content)
+
+
+def fast_json_response(
+    content: Any,
+    *,
+    response: Response | None = None,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """Responder com um payload já no formato do ``response_model``.
+
+    Devolver uma ``Response`` faz o FastAPI pular a revalidação contra o
+    ``response_model`` (que continua valendo para o OpenAPI), então ``content``
+    deve vir de uma função de mapeamento que já produz o formato do schema. Os
+    cabeçalhos definidos em ``response`` (ex.: ``ETag``) são preservados.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content=content, status_code=status_code, headers=headers)
@@ -0,0 +1,66 @@
+"""Coalescência de leituras idênticas concorrentes (single-flight).
+
+Enquanto uma leitura com a mesma chave está em andamento, as requisições que
+chegam esperam o resultado dela em vez de repetir as consultas. Não é cache: a
+chave sai do mapa assim que a leitura termina, então nada fica velho além da
+duração da própria consulta. O resultado é compartilhado entre requisições e não
+deve ser alterado por quem o recebe.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.utils.metrics import Counter
+
+T = TypeVar("T")
+
+single_flight_calls_total = Counter(
+    "single_flight_calls_total",
+    "Leituras coalescidas: executadas (leader) ou reaproveitadas (shared)",
+    labels=("name", "result"),
+)
+
+
+class SingleFlight:
+    """
+    Um mapa ``chave -> Future`` por tipo de leitura. Quem chega primeiro (leader)
+    executa ``fn`` na própria sessão; os demais aguardam o mesmo ``Future``. Se o
+    leader for cancelado (cliente desconectou), quem esperava tenta de novo e um
+    deles assume a leitura. Exceções (ex.: ``NotFoundException``) chegam a todos.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while (future := self._inflight.get(key)) is not None:
+            try:
+                # shield: cancelar este follower não cancela a leitura dos outros
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+            single_flight_calls_total.inc(name=self.name, result="shared")
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        single_flight_calls_total.inc(name=self.name, result="leader")
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Marca como lida: sem followers o asyncio avisaria "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
@@ -1,3 +1,4 @@
+import unicodedata
 
 from validate_docbr import CPF
 
@@ -17,3 +18,10 @@ def format_cpf(cpf: str) -> str:
 
 def clean_cpf(cpf: str) -> str:
     return cpf.replace(".", "").replace("-", "").replace(" ", "")
+
+
+def normalize_tag(name: str) -> str:
+    """Forma canônica da tag: sem acentos, minúscula e com espaços simples."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    plain = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(plain.casefold().split())
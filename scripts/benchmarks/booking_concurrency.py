@@ -0,0 +1,204 @@
+"""Teste de concorrência dos agendamentos (lock de agenda por profissional + dia).
+
+Dispara centenas de ``create_appointment`` simultâneos, cada um na própria sessão
+(como ``get_db``), disputando poucos horários de poucos profissionais numa data
+distante. Ao final confere o invariante: no máximo um agendamento ativo por
+horário, ou seja, exatamente ``professionals * slots`` sucessos e nenhuma
+sobreposição no banco. Mostra também a espera pelo advisory lock (p50/p95/máx).
+
+Com ``--without-lock`` o coordenador vira no-op, para comparar com o comportamento
+antigo (verificação e escrita sem serialização). Os agendamentos criados são
+removidos no fim. Rode contra um banco de desenvolvimento.
+
+Exemplo:
+
+    python scripts/benchmarks/booking_concurrency.py --bookings 400 --professionals 5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+from statistics import median, quantiles
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.enums import AppointmentStatus, Role
+from app.models.professional import ProfessionalProfile
+from app.models.user import User
+from app.schemas.appointment import AppointmentCreate
+from app.services import appointment as appointment_service
+from app.services.booking import booking_coordinator
+from app.utils.exceptions import ConflictException
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=300)
+    parser.add_argument("--professionals", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=3, help="horários por profissional")
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--without-lock", action="store_true")
+    return parser.parse_args()
+
+
+async def book(
+    session_factory: async_sessionmaker[AsyncSession],
+    patient_id: int,
+    appointment_in: AppointmentCreate,
+) -> str:
+    async with session_factory() as db:
+        try:
+            await appointment_service.create_appointment(db, patient_id, appointment_in)
+            return "created"
+        except ConflictException:
+            await db.rollback()
+            return "conflict"
+        except Exception:
+            logger.exception("Unexpected booking error")
+            await db.rollback()
+            return "error"
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(
+        str(settings.database_url), echo=False, pool_size=args.pool_size, max_overflow=0
+    )
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    # Registra a espera de cada transação (o histograma de /metrics só guarda buckets)
+    lock_waits: list[float] = []
+    locked = booking_coordinator.lock
+
+    async def timed_lock(*lock_args, **lock_kwargs) -> float:
+        if args.without_lock:
+            return 0.0
+        waited = await locked(*lock_args, **lock_kwargs)
+        lock_waits.append(waited)
+        return waited
+
+    booking_coordinator.lock = timed_lock
+
+    rng = random.Random(args.seed)
+    target = date.today() + timedelta(days=400)  # noqa: DTZ011
+    day_start = datetime.combine(target, datetime.min.time()).replace(hour=8)
+
+    try:
+        async with session_factory() as db:
+            professional_ids = list(
+                (
+                    await db.execute(
+                        select(ProfessionalProfile.id)
+                        .order_by(ProfessionalProfile.id)
+                        .limit(args.professionals)
+                    )
+                ).scalars()
+            )
+            patient_ids = list(
+                (
+                    await db.execute(
+                        select(User.id)
+                        .where(User.role == Role.PATIENT)
+                        .order_by(User.id)
+                        .limit(args.bookings)
+                    )
+                ).scalars()
+            )
+
+        requests = []
+        for i in range(args.bookings):
+            slot = rng.randrange(args.slots)
+            start = day_start + timedelta(hours=slot)
+            requests.append(
+                (
+                    patient_ids[i % len(patient_ids)],
+                    AppointmentCreate(
+                        professional_id=rng.choice(professional_ids),
+                        start_time=start,
+                        end_time=start + timedelta(hours=1),
+                    ),
+                )
+            )
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                book(session_factory, patient_id, appointment_in)
+                for patient_id, appointment_in in requests
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+        async with session_factory() as db:
+            window = (
+                Appointment.professional_id.in_(professional_ids),
+                Appointment.start_time >= day_start,
+                Appointment.start_time < day_start + timedelta(days=1),
+                Appointment.status != AppointmentStatus.CANCELLED,
+            )
+            other = aliased(Appointment)
+            overlaps = (
+                await db.execute(
+                    select(Appointment.id)
+                    .join(
+                        other,
+                        (other.professional_id == Appointment.professional_id)
+                        & (other.id > Appointment.id)
+                        & (other.start_time < Appointment.end_time)
+                        & (other.end_time > Appointment.start_time)
+                        & (other.status != AppointmentStatus.CANCELLED),
+                    )
+                    .where(*window)
+                )
+            ).all()
+            await db.execute(
+                delete(Appointment).where(
+                    Appointment.professional_id.in_(professional_ids),
+                    Appointment.start_time >= day_start,
+                    Appointment.start_time < day_start + timedelta(days=1),
+                )
+            )
+            await db.commit()
+    finally:
+        await engine.dispose()
+
+    expected = len({(a.professional_id, a.start_time) for _, a in requests})
+    logger.info(
+        "%d reservas simultâneas em %.2fs (%s)",
+        args.bookings,
+        elapsed,
+        "sem lock" if args.without_lock else "com advisory lock",
+    )
+    logger.info(
+        "criadas=%d (esperado %d)  conflitos=%d  erros=%d  sobreposições=%d",
+        results.count("created"),
+        expected,
+        results.count("conflict"),
+        results.count("error"),
+        len(overlaps),
+    )
+    if len(lock_waits) >= 2:
+        p95 = quantiles(lock_waits, n=20)[-1]
+        logger.info(
+            "espera pelo lock: p50=%.1fms  p95=%.1fms  máx=%.1fms",
+            median(lock_waits) * 1000,
+            p95 * 1000,
+            max(lock_waits) * 1000,
+        )
+    if overlaps or results.count("created") != expected:
+        raise SystemExit("❌ Invariante violado: horário agendado mais de uma vez")
+    logger.info("✅ Nenhum horário agendado duas vezes")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(run(parse_args()))
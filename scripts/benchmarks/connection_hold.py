@@ -0,0 +1,150 @@
+"""Tempo que cada rota mantém uma conexão do pool fora dele.
+
+Faz requisições em sequência (uma por vez, direto no app ASGI, sem rede) e,
+pelos eventos ``checkout``/``checkin`` do pool, mede por rota quanto da
+requisição a conexão ficou emprestada e se ela ainda estava fora do pool quando
+a resposta começou a ser enviada. Com ``SessionRoute`` isso nunca deve
+acontecer: o script termina com erro se alguma rota segurar a conexão durante a
+serialização ou o envio. Rode contra um banco de desenvolvimento com dados.
+
+Exemplo:
+
+    python scripts/benchmarks/connection_hold.py --rounds 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from statistics import median
+
+import httpx
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Sample:
+    started: float
+    response_started: float | None = None
+    finished: float | None = None
+    held_at_response: bool = False
+    holds: list[list[float]] = field(default_factory=list)
+
+    @property
+    def hold_time(self) -> float:
+        return sum(checkin - checkout for checkout, checkin in self.holds)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--email", default="joao@example.com")
+    parser.add_argument("--password", default="senha123")
+    parser.add_argument("--professional-id", type=int, default=4)
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core.database import engine
+    from app.main import app
+
+    current: list[Sample] = []
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(*_) -> None:
+        if current:
+            current[-1].holds.append([time.perf_counter(), 0.0])
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(*_) -> None:
+        if current and current[-1].holds:
+            current[-1].holds[-1][1] = time.perf_counter()
+
+    async def measured(scope, receive, send) -> None:
+        sample = current[-1]
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                sample.response_started = time.perf_counter()
+                sample.held_at_response = engine.pool.checkedout() > 0
+            await send(message)
+
+        await app(scope, receive, send_wrapper)
+        sample.finished = time.perf_counter()
+
+    pid = args.professional_id
+    target = (date.today() + timedelta(days=7)).isoformat()  # noqa: DTZ011
+    credentials = {"email": args.email, "password": args.password}
+    routes = [
+        ("POST", "/api/auth/login", {"data": credentials}),
+        ("GET", "/api/professionals/?limit=20", {}),
+        ("GET", "/api/professionals/search?limit=20", {}),
+        ("GET", "/api/professionals/facets", {}),
+        ("GET", f"/api/professionals/{pid}", {}),
+        ("GET", f"/api/professionals/{pid}/available-slots?target_date={target}", {}),
+        ("GET", f"/api/professionals/{pid}/reviews", {}),
+        ("GET", f"/api/professionals/{pid}/reviews/stats", {}),
+        ("GET", "/api/users/me", {}),
+        ("GET", "/api/appointments/my", {}),
+        ("GET", "/api/appointments/my/calendar.ics", {}),
+        ("GET", "/api/reviews/my", {}),
+        ("PUT", "/api/users/me", {"json": {}}),
+    ]
+
+    transport = httpx.ASGITransport(app=measured)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        current.append(Sample(time.perf_counter()))
+        login = await client.post("/api/auth/login", data=credentials)
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+        results: dict[str, list[Sample]] = {}
+        for _ in range(args.rounds):
+            for method, url, kwargs in routes:
+                current.append(Sample(time.perf_counter()))
+                response = await client.request(method, url, headers=headers, **kwargs)
+                response.raise_for_status()
+                results.setdefault(f"{method} {url.split('?')[0]}", []).append(current[-1])
+                current.clear()
+
+    await engine.dispose()
+
+    logger.info("%-52s %9s %9s %6s  %s", "rota", "total ms", "conexão", "%", "livre no envio")
+    offenders = []
+    for route, samples in results.items():
+        total = median(s.finished - s.started for s in samples) * 1000
+        hold = median(s.hold_time for s in samples) * 1000
+        held = sum(s.held_at_response for s in samples)
+        logger.info(
+            "%-52s %9.2f %9.2f %5.0f%%  %s",
+            route,
+            total,
+            hold,
+            hold / total * 100 if total else 0,
+            "sim" if not held else f"NÃO ({held}/{len(samples)})",
+        )
+        if held:
+            offenders.append(route)
+
+    if offenders:
+        raise SystemExit(f"❌ Conexão ainda emprestada ao enviar a resposta: {offenders}")
+    logger.info("✅ Todas as rotas devolvem a conexão antes de enviar a resposta")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Só as rotas: sem worker/agendadores e sem limite de taxa durante a medição
+    for name in (
+        "JOB_WORKER_ENABLED",
+        "REMINDER_SCHEDULER_ENABLED",
+        "APPOINTMENT_TRANSITION_ENABLED",
+        "RATE_LIMIT_ENABLED",
+    ):
+        os.environ.setdefault(name, "false")
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,95 @@
+"""Vazão da verificação de JWT: python-jose a cada requisição x cache de verificados.
+
+Gera ``--users`` tokens (um por usuário ativo) e verifica ``--calls`` vezes,
+percorrendo os tokens em ordem aleatória como chegariam as requisições:
+
+- antes: cache desligado, ``jose.jwt.decode`` em toda chamada (assinatura +
+  parse das claims);
+- depois: ``decode_access_token``, que confere a assinatura só na primeira vez e
+  depois lê do LRU (mais a consulta à lista de revogação).
+
+Com ``--algorithm ES256`` uma chave P-256 temporária é gerada e usada no lugar
+de ``JWT_SECRET``. Não precisa de banco.
+
+Exemplo:
+
+    python scripts/benchmarks/jwt_verification.py --algorithm ES256 --calls 200000
+"""
+
+import argparse
+import logging
+import os
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algorithm", default="HS256", choices=["HS256", "ES256"])
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def configure(algorithm: str) -> None:
+    """Antes de importar ``app.core.security``: as chaves são lidas na importação."""
+    os.environ["JWT_ALGORITHM"] = algorithm
+    if algorithm == "ES256":
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        os.environ["JWT_PRIVATE_KEY"] = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+
+
+def throughput(verify, tokens: list[str], order: list[int]) -> tuple[float, float]:
+    started = time.perf_counter()
+    for i in order:
+        verify(tokens[i])
+    elapsed = time.perf_counter() - started
+    return len(order) / elapsed, elapsed / len(order) * 1e6
+
+
+def run(args: argparse.Namespace) -> None:
+    configure(args.algorithm)
+
+    from app.core import security
+    from app.core.config import settings
+
+    tokens = [
+        security.create_access_token({"id": user_id, "email": f"user{user_id}@example.com"})
+        for user_id in range(args.users)
+    ]
+    rng = random.Random(args.seed)
+    order = [rng.randrange(args.users) for _ in range(args.calls)]
+
+    # Antes: cache desligado, a assinatura é conferida em toda chamada
+    cache_size = security.token_cache.max_size
+    security.token_cache.max_size = 0
+    before, before_us = throughput(security.decode_access_token, tokens, order)
+    security.token_cache.max_size = cache_size
+    after, after_us = throughput(security.decode_access_token, tokens, order)
+
+    logger.info(
+        "%s, %d tokens, %d verificações (cache de %d)",
+        args.algorithm,
+        args.users,
+        args.calls,
+        settings.jwt_cache_size,
+    )
+    logger.info("%-28s %12s %10s", "", "verif./s", "µs/verif.")
+    logger.info("%-28s %12.0f %10.2f", "antes: sem cache", before, before_us)
+    logger.info("%-28s %12.0f %10.2f", "depois: com cache", after, after_us)
+    logger.info("%.1fx mais rápido", after / before)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run(parse_args())
@@ -0,0 +1,177 @@
+"""Micro-benchmark da serialização de uma página de profissionais.
+
+Compara o caminho antigo (modelo validado montado à mão + revalidação do
+FastAPI contra o ``response_model`` + ``JSONResponse``) com o caminho atual
+(``build_profile_payload`` + ``FastJSONResponse``), sem banco nem HTTP. O
+renderer do caminho atual é orjson quando instalado, senão ``pydantic_core``.
+
+Exemplo:
+
+    python scripts/benchmarks/serialization.py --items 100 --rounds 2000
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from collections.abc import Callable, Coroutine
+from statistics import median
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.enums import ProfessionalCategory
+from app.models.professional import ProfessionalProfile, ProfileTag
+from app.models.user import User
+from app.schemas.professional import ProfessionalProfileResponse
+from app.services.professional import build_profile_payload
+from app.utils import responses
+from app.utils.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+PAGE_TYPE = list[ProfessionalProfileResponse]
+
+
+def build_profiles(count: int, seed: int = 42) -> list[ProfessionalProfile]:
+    """Perfis transitórios (fora de sessão) com usuário e tags preenchidos."""
+    rng = random.Random(seed)
+    categories = list(ProfessionalCategory)
+    profiles = []
+    for i in range(1, count + 1):
+        user = User(
+            id=i,
+            name=f"Profissional {i}",
+            email=f"pro{i}@example.com",
+            phone="11999990000",
+            cep="01310-100",
+            uf="SP",
+            city="São Paulo",
+            address=f"Av. Paulista, {i}",
+            profile_image_url=f"https://cdn.example.com/profiles/{i}.jpg",
+        )
+        profile = ProfessionalProfile(
+            id=i,
+            user_id=i,
+            bio="Atendimento humanizado. " * 8,
+            category=rng.choice(categories).value,
+            profissional_identification=f"CRM-{i:06d}",
+            services="Consulta, Retorno, Teleconsulta",
+            price=round(rng.uniform(80, 400), 2),
+            only_online=rng.random() < 0.2,
+            only_presential=False,
+            rating=round(rng.uniform(3, 5), 1),
+            num_reviews=rng.randint(0, 500),
+            available_days_of_week="monday,tuesday,wednesday,thursday,friday",
+            start_hour="08:00",
+            end_hour="18:00",
+        )
+        profile.user = user
+        profile.tags = [ProfileTag(name=f"tag-{rng.randint(1, 40)}") for _ in range(4)]
+        profiles.append(profile)
+    return profiles
+
+
+def legacy_response(profile: ProfessionalProfile) -> ProfessionalProfileResponse:
+    return ProfessionalProfileResponse(
+        id=profile.id,
+        user_id=profile.user_id,
+        bio=profile.bio,
+        category=profile.category,
+        profissional_identification=profile.profissional_identification,
+        services=profile.services,
+        price=profile.price,
+        only_online=profile.only_online,
+        only_presential=profile.only_presential,
+        rating=profile.rating,
+        num_reviews=profile.num_reviews,
+        available_days_of_week=profile.available_days_of_week,
+        start_hour=profile.start_hour,
+        end_hour=profile.end_hour,
+        user_name=profile.user.name if profile.user else None,
+        email=profile.user.email if profile.user else None,
+        phone=profile.user.phone if profile.user else None,
+        cep=profile.user.cep if profile.user else None,
+        uf=profile.user.uf if profile.user else None,
+        city=profile.user.city if profile.user else None,
+        address=profile.user.address if profile.user else None,
+        profile_image_url=profile.user.profile_image_url if profile.user else None,
+        tags=[tag.name for tag in profile.tags],
+        unavailable_dates=[],
+    )
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Executar uma corrotina que não suspende, sem o custo de um event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("a corrotina suspendeu")
+
+
+def make_legacy(profiles: list[ProfessionalProfile]) -> Callable[[], bytes]:
+    field = create_model_field(name="Response_list_professionals", type_=PAGE_TYPE)
+
+    def run() -> bytes:
+        content = [legacy_response(profile) for profile in profiles]
+        # O mesmo que o FastAPI faz com o retorno da rota: dump + validação + encoder
+        payload = run_sync(serialize_response(field=field, response_content=content))
+        return JSONResponse(payload).body
+
+    return run
+
+
+def make_fast(profiles: list[ProfessionalProfile]) -> Callable[[], bytes]:
+    def run() -> bytes:
+        return FastJSONResponse([build_profile_payload(profile) for profile in profiles]).body
+
+    return run
+
+
+def measure(fn: Callable[[], bytes], rounds: int) -> list[float]:
+    fn()  # aquecimento (caches de adapters/serializers)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="perfis por página")
+    parser.add_argument("--rounds", type=int, default=500, help="repetições por caminho")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    profiles = build_profiles(args.items)
+
+    legacy, fast = make_legacy(profiles), make_fast(profiles)
+    if json.loads(legacy()) != json.loads(fast()):
+        raise SystemExit("os dois caminhos devem gerar o mesmo JSON")
+
+    renderer = "orjson" if responses.orjson is not None else "pydantic-core"
+    logger.info("%d perfis/página, %d rodadas, renderer: %s", args.items, args.rounds, renderer)
+    results = {}
+    for label, fn in (("legacy", legacy), ("fast-path", fast)):
+        samples = measure(fn, args.rounds)
+        results[label] = median(samples)
+        logger.info(
+            "  %-10s mediana %7.3f ms  p95 %7.3f ms",
+            label,
+            results[label] * 1000,
+            sorted(samples)[int(len(samples) * 0.95)] * 1000,
+        )
+    logger.info("  speedup    %.1fx", results["legacy"] / results["fast-path"])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -0,0 +1,206 @@
+"""Custo das consultas quentes do CRUD: ``select()`` comum x ``lambda_stmt``.
+
+Para cada consulta de ``app.crud.statements`` mede, com parâmetros diferentes a
+cada chamada (como em produção):
+
+- construção: montar o statement e calcular a chave do cache de compilação,
+  só CPU, sem banco;
+- execução: ida e volta completa numa mesma conexão, em µs por chamada.
+
+No fim mostra quantos prepared statements a conexão guardou no servidor
+(``pg_prepared_statements``): com o texto do SQL estável ele fica no tamanho do
+conjunto de consultas, não no número de chamadas. Rode contra um banco de
+desenvolvimento com dados.
+
+Exemplo:
+
+    python scripts/benchmarks/statement_cache.py --calls 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Executable, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.crud import statements
+from app.models.appointment import Appointment
+from app.models.enums import AppointmentStatus
+from app.models.professional import ProfessionalProfile, UnavailableDate
+from app.models.slot_hold import SlotHold
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--professional-id", type=int, default=4)
+    parser.add_argument("--email", default="joao@example.com")
+    return parser.parse_args()
+
+
+def day_window(i: int) -> tuple[datetime, datetime]:
+    day = date.today() + timedelta(days=i % 60)  # noqa: DTZ011
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+
+def plain_queries(pid: int, email: str) -> dict[str, Callable[[int], Executable]]:
+    """As mesmas consultas como eram escritas no CRUD antes do ``lambda_stmt``."""
+
+    def conflicts(i: int) -> Executable:
+        start, _ = day_window(i)
+        return select(Appointment).where(
+            Appointment.professional_id == pid,
+            Appointment.start_time < start + timedelta(hours=1),
+            Appointment.end_time > start,
+            Appointment.status != AppointmentStatus.CANCELLED,
+        )
+
+    def booked(i: int) -> Executable:
+        start, end = day_window(i)
+        return select(Appointment.start_time, Appointment.end_time).where(
+            Appointment.professional_id == pid,
+            Appointment.start_time >= start,
+            Appointment.start_time < end,
+            Appointment.status != AppointmentStatus.CANCELLED,
+        )
+
+    def holds(i: int) -> Executable:
+        start, end = day_window(i)
+        return select(SlotHold.start_time, SlotHold.end_time).where(
+            SlotHold.professional_id == pid,
+            SlotHold.start_time < end,
+            SlotHold.end_time > start,
+            SlotHold.expires_at > func.localtimestamp(),
+        )
+
+    def unavailable(i: int) -> Executable:
+        start, end = day_window(i)
+        return (
+            select(UnavailableDate.id)
+            .where(
+                UnavailableDate.profile_id == pid,
+                UnavailableDate.date >= start,
+                UnavailableDate.date < end,
+            )
+            .limit(1)
+        )
+
+    def profile(i: int) -> Executable:
+        return (
+            select(ProfessionalProfile)
+            .where(ProfessionalProfile.user_id == pid + i % 2)
+            .options(
+                joinedload(ProfessionalProfile.user),
+                joinedload(ProfessionalProfile.tags),
+                joinedload(ProfessionalProfile.unavailable_dates),
+            )
+        )
+
+    def user(i: int) -> Executable:
+        return select(User).where(User.email == (email if i % 2 else f"x{i}@example.com"))
+
+    return {
+        "conflitos": conflicts,
+        "horários ocupados": booked,
+        "reservas ativas": holds,
+        "indisponibilidade": unavailable,
+        "perfil por usuário": profile,
+        "usuário por e-mail": user,
+    }
+
+
+def lambda_queries(pid: int, email: str) -> dict[str, Callable[[int], Executable]]:
+    return {
+        "conflitos": lambda i: statements.appointment_conflicts(
+            pid, day_window(i)[0], day_window(i)[0] + timedelta(hours=1)
+        ),
+        "horários ocupados": lambda i: statements.booked_windows(pid, *day_window(i)),
+        "reservas ativas": lambda i: statements.active_holds_between(pid, *day_window(i)),
+        "indisponibilidade": lambda i: statements.unavailable_between(pid, *day_window(i)),
+        "perfil por usuário": lambda i: statements.profile_by_user_id(pid + i % 2),
+        "usuário por e-mail": lambda i: statements.user_by_email(
+            email if i % 2 else f"x{i}@example.com"
+        ),
+    }
+
+
+def construction_us(build: Callable[[int], Executable], calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        # O que toda execução paga antes de achar o SQL compilado no cache
+        build(i)._generate_cache_key()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def execution_us(db: AsyncSession, build: Callable[[int], Executable], calls: int) -> float:
+    for i in range(20):  # aquece caches de compilação e prepared statements
+        (await db.execute(build(i))).unique().all()
+    started = time.perf_counter()
+    for i in range(calls):
+        (await db.execute(build(i))).unique().all()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(
+        str(settings.database_url),
+        pool_size=1,
+        max_overflow=0,
+        query_cache_size=settings.database_query_cache_size,
+        connect_args={
+            "prepared_statement_cache_size": settings.database_prepared_statement_cache_size
+        },
+    )
+    plain = plain_queries(args.professional_id, args.email)
+    lambdas = lambda_queries(args.professional_id, args.email)
+
+    logger.info(
+        "%-20s %14s %14s %14s %14s",
+        "consulta",
+        "select() µs",
+        "lambda µs",
+        "exec select()",
+        "exec lambda",
+    )
+    try:
+        async with AsyncSession(engine) as db:
+            for name, build in plain.items():
+                build_plain = construction_us(build, args.calls)
+                build_lambda = construction_us(lambdas[name], args.calls)
+                exec_plain = await execution_us(db, build, args.calls)
+                exec_lambda = await execution_us(db, lambdas[name], args.calls)
+                logger.info(
+                    "%-20s %14.1f %14.1f %14.1f %14.1f",
+                    name,
+                    build_plain,
+                    build_lambda,
+                    exec_plain,
+                    exec_lambda,
+                )
+            prepared = (
+                await db.execute(text("select count(*) from pg_prepared_statements"))
+            ).scalar_one()
+    finally:
+        await engine.dispose()
+
+    logger.info(
+        "prepared statements na conexão após %d chamadas por consulta: %d (cache: %d)",
+        args.calls * 2 + 40,
+        prepared,
+        settings.database_prepared_statement_cache_size,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(run(parse_args()))
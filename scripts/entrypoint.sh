@@ -36,5 +36,10 @@ fi
 
 echo "🎉 Database setup complete!"
 
-echo "🚀 Starting FastAPI application..."
-exec uv run uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+if [ "$DEBUG" = "True" ] || [ "$DEBUG" = "true" ]; then
+    echo "🚀 Starting FastAPI application (reload)..."
+    exec uv run uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+fi
+
+echo "🚀 Starting FastAPI application (${WEB_CONCURRENCY:-one per CPU} workers)..."
+exec uv run python scripts/serve.py --host 0.0.0.0 --port 8000
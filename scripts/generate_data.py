@@ -0,0 +1,644 @@
+"""Gerador de dados sintéticos em larga escala.
+
+Gera pacientes, profissionais, tags, agendamentos e avaliações com distribuições
+realistas e carrega tudo com ``COPY`` (padrão) ou ``INSERT`` em lote. A geração é
+determinística pela ``--seed`` e pela data de referência ``--now`` (da qual saem
+todos os horários e o status passado/futuro dos agendamentos) e sempre anexa aos
+dados existentes, continuando a partir do maior ``id`` de cada tabela.
+
+Exemplo:
+
+    python scripts/generate_data.py --patients 1000000 --professionals 50000 \\
+        --appointments 5000000 --seed 42
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.crud.directory import build_refresh_statement
+from app.crud.tag import build_upsert_statement
+from app.models.appointment import Appointment
+from app.models.directory import ProfessionalDirectory
+from app.models.enums import AppointmentStatus, ProfessionalCategory, Role
+from app.models.professional import ProfessionalProfile, ProfileTag
+from app.models.review import Review
+from app.models.user import User
+from app.utils.cep_geo import geocode_cep
+from app.utils.validators import normalize_tag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PASSWORD = "senha123"
+# Data de referência fixa: mesma --seed, mesmos dados, em qualquer dia que rodar
+DEFAULT_NOW = datetime(2026, 1, 1)  # noqa: DTZ001
+EMAIL_DOMAIN = "synthetic.vitta"
+
+# (cidade, UF, prefixo de CEP, peso)
+CITIES: list[tuple[str, str, str, int]] = [
+    ("São Paulo", "SP", "01", 250),
+    ("Rio de Janeiro", "RJ", "20", 120),
+    ("Belo Horizonte", "MG", "30", 60),
+    ("Brasília", "DF", "70", 50),
+    ("Salvador", "BA", "40", 50),
+    ("Fortaleza", "CE", "60", 45),
+    ("Curitiba", "PR", "80", 40),
+    ("Recife", "PE", "50", 40),
+    ("Porto Alegre", "RS", "90", 40),
+    ("Manaus", "AM", "69", 30),
+    ("Belém", "PA", "66", 25),
+    ("Goiânia", "GO", "74", 25),
+    ("Campinas", "SP", "13", 25),
+    ("São Luís", "MA", "65", 15),
+    ("Maceió", "AL", "57", 15),
+    ("Natal", "RN", "59", 15),
+    ("Teresina", "PI", "64", 12),
+    ("João Pessoa", "PB", "58", 12),
+    ("Florianópolis", "SC", "88", 12),
+    ("Cuiabá", "MT", "78", 10),
+    ("Campo Grande", "MS", "79", 10),
+    ("Vitória", "ES", "29", 10),
+    ("Aracaju", "SE", "49", 10),
+]
+
+CATEGORY_WEIGHTS: dict[ProfessionalCategory, int] = {
+    ProfessionalCategory.PHYSICIAN: 30,
+    ProfessionalCategory.PSYCHOLOGIST: 25,
+    ProfessionalCategory.NUTRITIONIST: 15,
+    ProfessionalCategory.PHYSIOTHERAPIST: 12,
+    ProfessionalCategory.PERSONAL_TRAINER: 8,
+    ProfessionalCategory.OCCUPATIONAL_THERAPY: 4,
+    ProfessionalCategory.ELDERLY_CARE: 4,
+    ProfessionalCategory.DOCTOR: 2,
+}
+
+CATEGORY_PRICE: dict[ProfessionalCategory, float] = {
+    ProfessionalCategory.PHYSICIAN: 250.0,
+    ProfessionalCategory.PSYCHOLOGIST: 170.0,
+    ProfessionalCategory.NUTRITIONIST: 150.0,
+    ProfessionalCategory.PHYSIOTHERAPIST: 130.0,
+    ProfessionalCategory.PERSONAL_TRAINER: 100.0,
+    ProfessionalCategory.OCCUPATIONAL_THERAPY: 140.0,
+    ProfessionalCategory.ELDERLY_CARE: 90.0,
+    ProfessionalCategory.DOCTOR: 250.0,
+}
+
+CATEGORY_PREFIX: dict[ProfessionalCategory, str] = {
+    ProfessionalCategory.PHYSICIAN: "CRM",
+    ProfessionalCategory.PSYCHOLOGIST: "CRP",
+    ProfessionalCategory.NUTRITIONIST: "CRN",
+    ProfessionalCategory.PHYSIOTHERAPIST: "CREFITO",
+    ProfessionalCategory.PERSONAL_TRAINER: "CREF",
+    ProfessionalCategory.OCCUPATIONAL_THERAPY: "CREFITO-TO",
+    ProfessionalCategory.ELDERLY_CARE: "CUID",
+    ProfessionalCategory.DOCTOR: "CRM",
+}
+
+CATEGORY_TAGS: dict[ProfessionalCategory, list[str]] = {
+    ProfessionalCategory.PHYSICIAN: [
+        "Clínica Geral", "Check-up", "Atestados", "Cardiologia", "Dermatologia",
+        "Pediatria", "Ginecologia", "Endocrinologia", "Ortopedia", "Geriatria",
+    ],
+    ProfessionalCategory.PSYCHOLOGIST: [
+        "TCC", "Ansiedade", "Depressão", "Terapia de Casal", "Psicanálise",
+        "Infantil", "TDAH", "Luto", "Autoestima", "Online",
+    ],
+    ProfessionalCategory.NUTRITIONIST: [
+        "Emagrecimento", "Nutrição Esportiva", "Vegetariano", "Diabetes",
+        "Gestantes", "Online", "Reeducação Alimentar",
+    ],
+    ProfessionalCategory.PHYSIOTHERAPIST: [
+        "RPG", "Pilates", "Ortopédica", "Neurológica", "Respiratória",
+        "Domiciliar", "Esportiva",
+    ],
+    ProfessionalCategory.PERSONAL_TRAINER: [
+        "Musculação", "Funcional", "Corrida", "Hipertrofia", "Idosos", "Online",
+    ],
+    ProfessionalCategory.OCCUPATIONAL_THERAPY: [
+        "Autismo", "Integração Sensorial", "Reabilitação", "Infantil",
+    ],
+    ProfessionalCategory.ELDERLY_CARE: [
+        "Cuidador", "Domiciliar", "Alzheimer", "Acompanhante", "Noturno",
+    ],
+    ProfessionalCategory.DOCTOR: ["Clínica Geral", "Telemedicina", "Check-up"],
+}
+
+FIRST_NAMES = [
+    "Ana", "Maria", "João", "José", "Pedro", "Paulo", "Lucas", "Gabriel", "Rafael",
+    "Carlos", "Juliana", "Fernanda", "Mariana", "Beatriz", "Camila", "Larissa",
+    "Bruno", "Felipe", "Gustavo", "Rodrigo", "Patrícia", "Aline", "Letícia",
+    "Vitória", "Roberto", "Marcos", "Eduardo", "Daniela", "Renata", "Tiago",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho",
+    "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa", "Rocha",
+    "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado",
+]
+STREETS = [
+    "Rua das Flores", "Av. Brasil", "Rua São João", "Av. Paulista", "Rua XV de Novembro",
+    "Rua Sete de Setembro", "Av. Getúlio Vargas", "Rua Tiradentes", "Av. Atlântica",
+]
+
+WEEKDAY_PATTERNS: list[tuple[str, int]] = [
+    ("monday,tuesday,wednesday,thursday,friday", 55),
+    ("monday,wednesday,friday", 15),
+    ("tuesday,thursday", 10),
+    ("monday,tuesday,wednesday,thursday,friday,saturday", 15),
+    ("saturday,sunday", 5),
+]
+HOUR_RANGES: list[tuple[str, str, int]] = [
+    ("08:00", "18:00", 45),
+    ("09:00", "17:00", 25),
+    ("13:00", "20:00", 15),
+    ("07:00", "12:00", 15),
+]
+REVIEW_RATINGS: list[tuple[float, int]] = [
+    (5.0, 55), (4.0, 25), (3.0, 10), (2.0, 5), (1.0, 5),
+]
+REVIEW_COMMENTS = [
+    None, None, "Excelente profissional!", "Muito atencioso.", "Recomendo.",
+    "Pontual e educado.", "Atendimento rápido.", "Poderia ser mais pontual.",
+]
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Janela de agendamentos: um ano para trás e dois meses à frente
+HISTORY_DAYS = 365
+FUTURE_DAYS = 60
+SLOT_MINUTES = 60
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileSchedule:
+
+    category: ProfessionalCategory
+    weekdays: set[int]
+    start_hour: int
+    end_hour: int
+
+
+def cpf_from_number(number: int) -> str:
+    """Gera um CPF válido e único a partir de um número sequencial."""
+    digits = [int(d) for d in f"{100_000_000 + number:09d}"[-9:]]
+    for length in (9, 10):
+        total = sum(d * (length + 1 - i) for i, d in enumerate(digits[:length]))
+        check = (total * 10) % 11
+        digits.append(0 if check == 10 else check)
+    return "".join(str(d) for d in digits)
+
+
+def weighted(rng: random.Random, items: Sequence[Any], weights: Sequence[int]) -> Any:
+    return rng.choices(items, weights=weights, k=1)[0]
+
+
+class Generator:
+    """Produz lotes de linhas para cada tabela a partir de um ``random.Random``."""
+
+    def __init__(
+        self,
+        *,
+        seed: int,
+        offsets: dict[str, int],
+        hashed_password: str,
+        now: datetime,
+    ):
+        self.seed = seed
+        self.offsets = offsets
+        self.hashed_password = hashed_password
+        self.now = now.replace(minute=0, second=0, microsecond=0)
+        self.city_weights = [c[3] for c in CITIES]
+        self.categories = list(CATEGORY_WEIGHTS)
+        self.category_weights = list(CATEGORY_WEIGHTS.values())
+        self.schedules: list[ProfileSchedule] = []
+
+    def _rng(self, stream: str) -> random.Random:
+        # Um gerador por tabela mantém cada fluxo estável mesmo que outro mude de tamanho
+        return random.Random(f"{self.seed}:{stream}")
+
+    def _user_row(
+        self, rng: random.Random, user_id: int, role: Role
+    ) -> tuple[Any, ...]:
+        city, uf, cep_prefix, _ = weighted(rng, CITIES, self.city_weights)
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+        cep = f"{cep_prefix}{rng.randint(0, 999):03d}-{rng.randint(0, 999):03d}"
+        created_at = self.now - timedelta(days=rng.randint(HISTORY_DAYS, 3 * HISTORY_DAYS))
+        latitude, longitude = geocode_cep(cep) or (None, None)
+        return (
+            user_id,
+            name,
+            f"{role.value}{user_id}@{EMAIL_DOMAIN}",
+            self.hashed_password,
+            role.value,
+            cpf_from_number(user_id),
+            f"{rng.randint(11, 99)}9{rng.randint(10_000_000, 99_999_999)}",
+            cep,
+            uf,
+            city,
+            f"{rng.choice(STREETS)}, {rng.randint(1, 3000)}",
+            latitude,
+            longitude,
+            created_at,
+            created_at,
+        )
+
+    def users(
+        self, *, patients: int, professionals: int
+    ) -> Iterator[tuple[Any, ...]]:
+        rng = self._rng("users")
+        first_id = self.offsets["users"] + 1
+        for i in range(patients + professionals):
+            role = Role.PATIENT if i < patients else Role.PROFESSIONAL
+            yield self._user_row(rng, first_id + i, role)
+
+    def profiles(
+        self, *, first_user_id: int, count: int
+    ) -> Iterator[tuple[Any, ...]]:
+        rng = self._rng("profiles")
+        first_id = self.offsets["professional_profiles"] + 1
+        for i in range(count):
+            profile_id = first_id + i
+            category = weighted(rng, self.categories, self.category_weights)
+            modality = rng.random()
+            days = weighted(rng, *zip(*WEEKDAY_PATTERNS, strict=True))
+            start_hour, end_hour, _ = weighted(rng, HOUR_RANGES, [h[2] for h in HOUR_RANGES])
+            price = round(rng.lognormvariate(0, 0.35) * CATEGORY_PRICE[category] / 10) * 10
+            created_at = self.now - timedelta(days=rng.randint(HISTORY_DAYS, 2 * HISTORY_DAYS))
+            # Guardado para que tags e agendamentos sigam a categoria e a agenda do perfil
+            self.schedules.append(
+                ProfileSchedule(
+                    category=category,
+                    weekdays={WEEKDAYS.index(d) for d in days.split(",")},
+                    start_hour=int(start_hour[:2]),
+                    end_hour=int(end_hour[:2]),
+                )
+            )
+            yield (
+                profile_id,
+                first_user_id + i,
+                f"Profissional de saúde com {rng.randint(1, 35)} anos de experiência",
+                category.value,
+                f"{CATEGORY_PREFIX[category]}-{profile_id:08d}",
+                ", ".join(rng.sample(CATEGORY_TAGS[category], k=2)),
+                float(max(price, 50)),
+                modality < 0.2,
+                0.2 <= modality < 0.45,
+                0.0,
+                0,
+                days,
+                start_hour,
+                end_hour,
+                created_at,
+                created_at,
+            )
+
+    def tags(
+        self, *, first_profile_id: int, tag_ids: dict[str, int]
+    ) -> Iterator[tuple[Any, ...]]:
+        rng = self._rng("tags")
+        row_id = self.offsets["profile_tags"]
+        for i, schedule in enumerate(self.schedules):
+            vocabulary = CATEGORY_TAGS[schedule.category]
+            for name in rng.sample(vocabulary, k=rng.randint(1, min(5, len(vocabulary)))):
+                row_id += 1
+                yield (row_id, first_profile_id + i, name, tag_ids[normalize_tag(name)])
+
+    def appointments_and_reviews(
+        self,
+        *,
+        total: int,
+        review_ratio: float,
+        first_patient_id: int,
+        patients: int,
+        first_profile_id: int,
+    ) -> Iterator[tuple[str, tuple[Any, ...]]]:
+        """Distribui ``total`` agendamentos entre profissionais com popularidade Pareto.
+
+        Cada profissional recebe horários distintos dentro da sua agenda, então não há
+        conflitos entre os agendamentos gerados aqui.
+        """
+        rng = self._rng("appointments")
+        popularity = [rng.paretovariate(1.2) for _ in self.schedules]
+        scale = total / sum(popularity)
+        window_start = self.now.replace(hour=0) - timedelta(days=HISTORY_DAYS)
+        window = [window_start + timedelta(days=d) for d in range(HISTORY_DAYS + FUTURE_DAYS)]
+
+        appointment_id = self.offsets["appointments"]
+        review_id = self.offsets["reviews"]
+        for index, (weight, schedule) in enumerate(
+            zip(popularity, self.schedules, strict=True)
+        ):
+            profile_id = first_profile_id + index
+            days = [day for day in window if day.weekday() in schedule.weekdays]
+            slots_per_day = schedule.end_hour - schedule.start_hour
+            count = min(len(days) * slots_per_day, round(weight * scale))
+            for slot in sorted(rng.sample(range(len(days) * slots_per_day), k=count)):
+                day, hour = divmod(slot, slots_per_day)
+                start = days[day] + timedelta(hours=schedule.start_hour + hour)
+                end = start + timedelta(minutes=SLOT_MINUTES)
+                patient_id = first_patient_id + rng.randrange(patients)
+                status = self._status(rng, start)
+                created_at = start - timedelta(days=rng.randint(1, 30))
+                appointment_id += 1
+                yield "appointments", (
+                    appointment_id,
+                    patient_id,
+                    profile_id,
+                    start,
+                    end,
+                    status.value,
+                    created_at,
+                    min(end, self.now) if status == AppointmentStatus.COMPLETED else created_at,
+                )
+                if status == AppointmentStatus.COMPLETED and rng.random() < review_ratio:
+                    rating = weighted(rng, *zip(*REVIEW_RATINGS, strict=True))
+                    reviewed_at = end + timedelta(hours=rng.randint(1, 72))
+                    review_id += 1
+                    yield "reviews", (
+                        review_id,
+                        appointment_id,
+                        patient_id,
+                        profile_id,
+                        rating,
+                        rng.choice(REVIEW_COMMENTS),
+                        rng.random() < 0.15,
+                        reviewed_at,
+                        reviewed_at,
+                    )
+
+    def _status(self, rng: random.Random, start: datetime) -> AppointmentStatus:
+        roll = rng.random()
+        if start < self.now:
+            if roll < 0.8:
+                return AppointmentStatus.COMPLETED
+            return AppointmentStatus.CANCELLED
+        if roll < 0.55:
+            return AppointmentStatus.CONFIRMED
+        if roll < 0.9:
+            return AppointmentStatus.PENDING
+        return AppointmentStatus.CANCELLED
+
+
+USER_COLUMNS = [
+    "id", "name", "email", "password", "role", "cpf", "phone", "cep", "uf", "city",
+    "address", "latitude", "longitude", "created_at", "updated_at",
+]
+PROFILE_COLUMNS = [
+    "id", "user_id", "bio", "category", "profissional_identification", "services", "price",
+    "only_online", "only_presential", "rating", "num_reviews", "available_days_of_week",
+    "start_hour", "end_hour", "created_at", "updated_at",
+]
+TAG_COLUMNS = ["id", "profile_id", "name", "tag_id"]
+APPOINTMENT_COLUMNS = [
+    "id", "patient_id", "professional_id", "start_time", "end_time", "status",
+    "created_at", "updated_at",
+]
+REVIEW_COLUMNS = [
+    "id", "appointment_id", "patient_id", "professional_id", "rating", "comment",
+    "is_anonymous", "created_at", "updated_at",
+]
+
+
+class Loader:
+    """Grava lotes usando ``COPY`` do asyncpg ou ``INSERT`` em lote do SQLAlchemy."""
+
+    def __init__(self, conn: AsyncConnection, *, method: str, batch_size: int):
+        self.conn = conn
+        self.method = method
+        self.batch_size = batch_size
+
+    async def load(
+        self, table: Table, columns: list[str], rows: Iterator[tuple[Any, ...]]
+    ) -> int:
+        loaded = 0
+        batch: list[tuple[Any, ...]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                loaded += await self._flush(table, columns, batch)
+                batch = []
+        if batch:
+            loaded += await self._flush(table, columns, batch)
+        return loaded
+
+    async def _flush(
+        self, table: Table, columns: list[str], batch: list[tuple[Any, ...]]
+    ) -> int:
+        if self.method == "copy":
+            raw = await self.conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                table.name, records=batch, columns=columns
+            )
+        else:
+            await self.conn.execute(
+                insert(table), [dict(zip(columns, row, strict=True)) for row in batch]
+            )
+        return len(batch)
+
+
+async def current_offsets(conn: AsyncConnection) -> dict[str, int]:
+    offsets = {}
+    for model in (User, ProfessionalProfile, ProfileTag, Appointment, Review):
+        result = await conn.execute(select(func.coalesce(func.max(model.id), 0)))
+        offsets[model.__tablename__] = result.scalar_one()
+    return offsets
+
+
+async def sync_sequences(conn: AsyncConnection) -> None:
+    for model in (User, ProfessionalProfile, ProfileTag, Appointment, Review):
+        table = model.__tablename__
+        await conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            )
+        )
+
+
+async def refresh_ratings(conn: AsyncConnection, *, first_profile_id: int) -> None:
+    """Recalcula ``rating``/``num_reviews`` dos perfis gerados com um único UPDATE."""
+    await conn.execute(
+        text(
+            """
+            UPDATE professional_profiles AS p
+            SET rating = s.average_rating, num_reviews = s.total_reviews
+            FROM (
+                SELECT professional_id,
+                       ROUND(AVG(rating)::numeric, 1) AS average_rating,
+                       COUNT(*) AS total_reviews
+                FROM reviews
+                WHERE professional_id >= :first_profile_id
+                GROUP BY professional_id
+            ) AS s
+            WHERE p.id = s.professional_id
+            """
+        ),
+        {"first_profile_id": first_profile_id},
+    )
+
+
+async def generate(args: argparse.Namespace) -> None:
+    engine = create_async_engine(str(settings.database_url), echo=False)
+
+    # Hash calculado uma única vez e reutilizado por todos os usuários gerados
+    hashed_password = get_password_hash(args.password)
+
+    try:
+        async with engine.begin() as conn:
+            offsets = await current_offsets(conn)
+            logger.info(f"Appending after existing ids: {offsets}")
+
+            generator = Generator(
+                seed=args.seed,
+                offsets=offsets,
+                hashed_password=hashed_password,
+                now=args.now,
+            )
+            loader = Loader(conn, method=args.method, batch_size=args.batch_size)
+
+            first_patient_id = offsets["users"] + 1
+            first_professional_user_id = first_patient_id + args.patients
+            first_profile_id = offsets["professional_profiles"] + 1
+
+            # Vocabulário registrado no dicionário antes de carregar as tags dos perfis
+            result = await conn.execute(
+                build_upsert_statement(
+                    name for names in CATEGORY_TAGS.values() for name in names
+                )
+            )
+            tag_ids = dict(result.all())
+
+            steps: list[tuple[str, Table, list[str], Iterator[tuple[Any, ...]]]] = [
+                (
+                    "users",
+                    User.__table__,
+                    USER_COLUMNS,
+                    generator.users(patients=args.patients, professionals=args.professionals),
+                ),
+                (
+                    "professional_profiles",
+                    ProfessionalProfile.__table__,
+                    PROFILE_COLUMNS,
+                    generator.profiles(
+                        first_user_id=first_professional_user_id, count=args.professionals
+                    ),
+                ),
+                (
+                    "profile_tags",
+                    ProfileTag.__table__,
+                    TAG_COLUMNS,
+                    generator.tags(first_profile_id=first_profile_id, tag_ids=tag_ids),
+                ),
+            ]
+            for name, table, columns, rows in steps:
+                started = time.perf_counter()
+                loaded = await loader.load(table, columns, rows)
+                logger.info(f"{name}: {loaded} rows in {time.perf_counter() - started:.1f}s")
+
+            if args.appointments and args.patients and args.professionals:
+                started = time.perf_counter()
+                counts = await load_appointments(
+                    loader,
+                    generator.appointments_and_reviews(
+                        total=args.appointments,
+                        review_ratio=args.review_ratio,
+                        first_patient_id=first_patient_id,
+                        patients=args.patients,
+                        first_profile_id=first_profile_id,
+                    ),
+                )
+                logger.info(
+                    f"appointments: {counts['appointments']} rows, reviews: "
+                    f"{counts['reviews']} rows in {time.perf_counter() - started:.1f}s"
+                )
+                await refresh_ratings(conn, first_profile_id=first_profile_id)
+
+            # Um único INSERT ... SELECT recalcula o diretório com os dados gerados
+            await conn.execute(build_refresh_statement())
+
+            await sync_sequences(conn)
+            for model in (
+                User,
+                ProfessionalProfile,
+                ProfileTag,
+                Appointment,
+                Review,
+                ProfessionalDirectory,
+            ):
+                await conn.execute(text(f"ANALYZE {model.__tablename__}"))
+
+        logger.info("✅ Synthetic data generated successfully!")
+        logger.info(f"🔑 Password for all generated users: {args.password}")
+    finally:
+        await engine.dispose()
+
+
+async def load_appointments(
+    loader: Loader, rows: Iterator[tuple[str, tuple[Any, ...]]]
+) -> dict[str, int]:
+    """Carrega agendamentos e avaliações intercalados, respeitando a FK das avaliações."""
+    counts = {"appointments": 0, "reviews": 0}
+    pending: dict[str, list[tuple[Any, ...]]] = {"appointments": [], "reviews": []}
+    targets = {
+        "appointments": (Appointment.__table__, APPOINTMENT_COLUMNS),
+        "reviews": (Review.__table__, REVIEW_COLUMNS),
+    }
+
+    async def flush() -> None:
+        for name in ("appointments", "reviews"):
+            if pending[name]:
+                table, columns = targets[name]
+                counts[name] += await loader.load(table, columns, iter(pending[name]))
+                pending[name] = []
+
+    for name, row in rows:
+        pending[name].append(row)
+        if len(pending["appointments"]) >= loader.batch_size:
+            await flush()
+    await flush()
+    return counts
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate synthetic VittaAqui data.")
+    parser.add_argument("--patients", type=int, default=10_000)
+    parser.add_argument("--professionals", type=int, default=1_000)
+    parser.add_argument("--appointments", type=int, default=50_000)
+    parser.add_argument(
+        "--review-ratio",
+        type=float,
+        default=0.4,
+        help="Fraction of completed appointments that receive a review",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--now",
+        type=datetime.fromisoformat,
+        default=DEFAULT_NOW,
+        help="Reference datetime (ISO 8601) all generated timestamps derive from",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument(
+        "--method",
+        choices=["copy", "insert"],
+        default="copy",
+        help="copy uses PostgreSQL COPY; insert uses batched INSERT statements",
+    )
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(generate(parse_args()))
@@ -0,0 +1,70 @@
+"""Reconstrói o read model ``professional_directory``.
+
+Sem argumentos, recria o diretório inteiro numa única transação (a listagem
+continua vendo a versão anterior até o commit). Com ``--profile-id``, recalcula
+apenas os perfis informados.
+
+Exemplo:
+
+    python scripts/rebuild_directory.py
+    python scripts/rebuild_directory.py --profile-id 10 --profile-id 42
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.crud.directory import directory_crud
+from app.models.directory import ProfessionalDirectory
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profile-id",
+        type=int,
+        action="append",
+        dest="profile_ids",
+        help="recalcular só este perfil (pode repetir)",
+    )
+    return parser.parse_args()
+
+
+async def rebuild(args: argparse.Namespace) -> None:
+    engine = create_async_engine(str(settings.database_url), echo=False)
+    async_session_local = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    started = time.perf_counter()
+    try:
+        async with async_session_local() as session:
+            if args.profile_ids:
+                await directory_crud.refresh(session, profile_ids=args.profile_ids)
+            else:
+                await directory_crud.rebuild(session)
+            await session.commit()
+
+            total = await session.scalar(
+                select(func.count()).select_from(ProfessionalDirectory)
+            )
+    finally:
+        await engine.dispose()
+
+    logger.info(
+        "✅ Diretório atualizado em %.1fs (%d perfis no diretório)",
+        time.perf_counter() - started,
+        total,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild(parse_args()))
@@ -0,0 +1,99 @@
+"""Executa o worker de tarefas da outbox ``jobs`` fora do processo da API.
+
+Junto com o worker rodam o agendador de lembretes de consulta e o encerramento
+de consultas passadas (desligue com ``--no-reminders`` / ``--no-transitions``). Vários processos podem rodar ao mesmo tempo: as reservas
+usam ``SKIP LOCKED`` e cada tarefa é executada por um único worker. Ctrl+C (ou
+SIGTERM) termina as tarefas em andamento antes de sair. Com ``--purge-days``,
+apaga antes as tarefas concluídas há mais dias que o informado e os arquivos
+esquecidos no spool de envios (requisições desfeitas, tarefas que falharam).
+
+Exemplo:
+
+    JOB_WORKER_ENABLED=false REMINDER_SCHEDULER_ENABLED=false \
+        APPOINTMENT_TRANSITION_ENABLED=false uvicorn app.main:app
+    python scripts/run_worker.py --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.crud.job import job_crud
+from app.jobs import AppointmentTransitionScheduler, JobWorker, ReminderScheduler
+from app.services.upload_spool import upload_spool
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=settings.job_concurrency)
+    parser.add_argument("--batch-size", type=int, default=settings.job_batch_size)
+    parser.add_argument(
+        "--poll-interval", type=float, default=settings.job_poll_interval
+    )
+    parser.add_argument(
+        "--no-reminders",
+        action="store_true",
+        help="não rodar o agendador de lembretes neste processo",
+    )
+    parser.add_argument(
+        "--no-transitions",
+        action="store_true",
+        help="não encerrar consultas passadas neste processo",
+    )
+    parser.add_argument(
+        "--purge-days",
+        type=int,
+        help="apagar tarefas concluídas e envios no spool há mais de N dias antes de começar",
+    )
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(str(settings.database_url), echo=False)
+    async_session_local = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        if args.purge_days is not None:
+            async with async_session_local() as session:
+                purged = await job_crud.purge(
+                    session, older_than=timedelta(days=args.purge_days)
+                )
+                await session.commit()
+            logger.info("🧹 %d tarefas concluídas removidas", purged)
+            upload_spool.purge(older_than=timedelta(days=args.purge_days))
+
+        worker = JobWorker(
+            async_session_local,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            poll_interval=args.poll_interval,
+        )
+        background = [worker.run(stop)]
+        if not args.no_reminders:
+            background.append(ReminderScheduler(async_session_local).run(stop))
+        if not args.no_transitions:
+            background.append(
+                AppointmentTransitionScheduler(async_session_local).run(stop)
+            )
+        await asyncio.gather(*background)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(parse_args()))
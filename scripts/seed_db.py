@@ -6,8 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 from app.core.config import settings
 from app.core.security import get_password_hash
+from app.crud.directory import directory_crud
+from app.crud.tag import tag_crud
+from app.crud.user import build_geocode_statement
 from app.models.enums import ProfessionalCategory, Role
-from app.models.professional import ProfessionalProfile, ProfileTag
+from app.models.professional import ProfessionalProfile
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -96,9 +99,9 @@ async def seed_database():
             session.add(profile1)
             await session.flush()
 
-            session.add(ProfileTag(profile_id=profile1.id, name="Clínica Geral"))
-            session.add(ProfileTag(profile_id=profile1.id, name="Check-up"))
-            session.add(ProfileTag(profile_id=profile1.id, name="Atestados"))
+            await tag_crud.add_profile_tags(
+                session, profile_id=profile1.id, names=["Clínica Geral", "Check-up", "Atestados"]
+            )
 
             prof2 = User(
                 name="Dra. Ana Paula",
@@ -133,9 +136,9 @@ async def seed_database():
             session.add(profile2)
             await session.flush()
 
-            session.add(ProfileTag(profile_id=profile2.id, name="Emagrecimento"))
-            session.add(ProfileTag(profile_id=profile2.id, name="Nutrição Esportiva"))
-            session.add(ProfileTag(profile_id=profile2.id, name="Online"))
+            await tag_crud.add_profile_tags(
+                session, profile_id=profile2.id, names=["Emagrecimento", "Nutrição Esportiva", "Online"]
+            )
 
             prof3 = User(
                 name="Dr. Roberto Lima",
@@ -170,11 +173,12 @@ async def seed_database():
             session.add(profile3)
             await session.flush()
 
-            session.add(ProfileTag(profile_id=profile3.id, name="TCC"))
-            session.add(ProfileTag(profile_id=profile3.id, name="Ansiedade"))
-            session.add(ProfileTag(profile_id=profile3.id, name="Depressão"))
-            session.add(ProfileTag(profile_id=profile3.id, name="Terapia de Casal"))
+            await tag_crud.add_profile_tags(
+                session, profile_id=profile3.id, names=["TCC", "Ansiedade", "Depressão", "Terapia de Casal"]
+            )
 
+            await session.execute(build_geocode_statement())
+            await directory_crud.refresh(session)
             await session.commit()
             logger.info("✅ Database seeded successfully!")
             logger.info("📊 Created:")
@@ -0,0 +1,196 @@
+"""Servidor de produção: vários processos uvicorn sobre o mesmo socket (pre-fork).
+
+O processo mestre importa a aplicação uma única vez (rotas, modelos, schemas,
+engines ainda sem conexões), congela os objetos no GC e só então cria os
+workers com ``fork``: eles compartilham essas páginas de memória por
+copy-on-write em vez de cada um importar tudo de novo. Cada worker roda um
+``uvicorn.Server`` com uvloop e httptools no socket aberto pelo mestre.
+
+- ``WEB_CONCURRENCY`` processos (padrão: um por CPU disponível);
+- cada worker é reciclado após ``SERVER_MAX_REQUESTS`` requisições (mais um
+  sorteio de até ``SERVER_MAX_REQUESTS_JITTER``, para não reciclarem juntos) e
+  o mestre sobe outro no lugar; um worker que morre também é substituído;
+- SIGTERM/SIGINT param os workers com desligamento gracioso: param de aceitar
+  conexões e terminam as requisições em andamento em até
+  ``SERVER_GRACEFUL_TIMEOUT`` segundos;
+- com ``DATABASE_CONNECTION_BUDGET`` o pool de cada worker recebe uma fração do
+  teto de conexões (ver ``Settings.database_pool_limits``).
+
+Worker de tarefas e agendadores continuam em cada processo, a menos que sejam
+desligados (``JOB_WORKER_ENABLED`` etc.) e rodados com ``scripts/run_worker.py``;
+as reservas usam ``SKIP LOCKED``, então vários processos não duplicam trabalho.
+O limite de requisições em memória vale por processo: use
+``RATE_LIMIT_BACKEND=redis`` com mais de um worker.
+
+Exemplo:
+
+    WEB_CONCURRENCY=4 python scripts/serve.py --port 8000
+"""
+
+import argparse
+import contextlib
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger("vitta.server")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")  # noqa: S104
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.worker_count)
+    parser.add_argument("--backlog", type=int, default=2048)
+    return parser.parse_args()
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket) -> None:
+    """Corpo do processo filho; nunca retorna."""
+    import uvicorn
+
+    # O mestre trata os sinais dele; no filho quem cuida é o uvicorn
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    random.seed()
+
+    max_requests = None
+    if settings.server_max_requests > 0:
+        max_requests = settings.server_max_requests + random.randint(
+            0, settings.server_max_requests_jitter
+        )
+
+    config = uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        limit_max_requests=max_requests,
+        timeout_keep_alive=settings.server_keep_alive,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        # Atrás de proxy: IP real do cliente para o limite de requisições
+        proxy_headers=True,
+        forwarded_allow_ips=os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1"),
+    )
+    server = uvicorn.Server(config)
+    exit_code = 0
+    try:
+        server.run(sockets=[sock])
+        # Falha no startup do lifespan: o uvicorn retorna sem levantar exceção
+        if not server.started:
+            logger.error("Worker %d failed to start", os.getpid())
+            exit_code = 1
+    except BaseException:
+        logger.exception("Worker %d crashed", os.getpid())
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children: set[int] = set()
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.app, self.sock)
+        self.children.add(pid)
+        logger.info("Booted worker %d", pid)
+
+    def stop(self, signum: int, _frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info(
+            "Received %s; stopping %d workers", signal.Signals(signum).name, len(self.children)
+        )
+        for pid in self.children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.workers):
+            self.spawn()
+
+        deadline = None
+        while self.children:
+            if self.stopping and deadline is None:
+                deadline = time.monotonic() + settings.server_graceful_timeout + 5
+            if deadline is not None and time.monotonic() > deadline:
+                for pid in self.children:
+                    logger.warning("Worker %d did not stop in time; killing it", pid)
+                    os.kill(pid, signal.SIGKILL)
+                deadline = float("inf")
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+
+            self.children.discard(pid)
+            if self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                logger.info("Worker %d exited after max requests; replacing it", pid)
+            else:
+                logger.warning("Worker %d exited with %d; replacing it", pid, code)
+                time.sleep(1)  # não entra em laço apertado se o worker morre ao subir
+            self.spawn()
+        logger.info("All workers stopped")
+
+
+def main() -> None:
+    args = parse_args()
+    # Antes de importar a aplicação: o pool de cada engine divide o orçamento de
+    # conexões por este número (Settings.database_pool_limits)
+    settings.web_concurrency = args.workers
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+
+    from app.main import app  # preload: importado uma vez, compartilhado via fork
+
+    # Objetos já importados saem das coletas do GC, que tocariam nas páginas
+    # compartilhadas e forçariam a cópia em cada worker
+    gc.collect()
+    gc.freeze()
+
+    logger.info(
+        "Listening on http://%s:%d with %d workers (pid %d)",
+        args.host,
+        args.port,
+        args.workers,
+        os.getpid(),
+    )
+    Master(app, sock, args.workers).run()
+    sock.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="[%(process)d] %(levelname)s %(message)s")
+    main()
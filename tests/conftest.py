@@ -0,0 +1,33 @@
+"""Fixtures dos testes de integração.
+
+Os testes rodam contra o PostgreSQL de ``DATABASE_URL`` (mesmo ``.env`` da API),
+com as migrações aplicadas e os dados de ``scripts/seed_db.py``. Sem banco
+acessível eles são pulados.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# Sem limite de requisições: os testes disparam muitas chamadas seguidas
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+from app.core.database import engine as app_engine  # noqa: E402
+
+
+@pytest.fixture
+async def engine():
+    """
+    Engine da aplicação. Cada teste roda no próprio event loop, então o pool é
+    descartado no fim para nenhuma conexão passar para o loop do teste seguinte.
+    """
+    try:
+        async with app_engine.connect() as conn:
+            await conn.execute(text("select 1"))
+    except (OSError, DBAPIError) as exc:
+        await app_engine.dispose()
+        pytest.skip(f"PostgreSQL indisponível em DATABASE_URL: {exc}")
+    yield app_engine
+    await app_engine.dispose()
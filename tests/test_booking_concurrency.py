@@ -0,0 +1,172 @@
+"""Agendamentos concorrentes nunca se sobrepõem e só esperam pela mesma agenda.
+
+Dispara centenas de ``create_appointment`` e ``create_appointment_series``
+simultâneos, cada um na própria sessão (como ``get_db``), espalhados por alguns
+profissionais e dias numa data distante e disputando janelas que se cruzam
+(inícios a cada 30 minutos, uma hora de duração). O advisory lock de
+``BookingCoordinator`` deve serializar verificação e escrita de cada profissional
+e dia: no fim não pode haver duas linhas ativas sobrepostas. Outro teste confere
+que o lock de uma agenda não segura as demais.
+``scripts/benchmarks/booking_concurrency.py`` mede o mesmo cenário em escala.
+"""
+
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.enums import AppointmentStatus, Role
+from app.models.professional import ProfessionalProfile
+from app.models.user import User
+from app.schemas.appointment import AppointmentCreate, AppointmentSeriesCreate
+from app.services import appointment as appointment_service
+from app.services.booking import booking_coordinator
+from app.utils.exceptions import ConflictException
+
+CALLS = 300
+PROFESSIONALS = 5
+DAYS = 3
+STARTS = 6  # 08:00, 08:30, ..., 10:30
+SERIES_OCCURRENCES = 2
+SERIES_INTERVAL_DAYS = 7
+# Conexões suficientes para as reservas de fato disputarem a mesma agenda ao mesmo tempo
+POOL_SIZE = 50
+
+
+@pytest.fixture
+async def session_factory(engine):
+    booking_engine = create_async_engine(
+        str(settings.database_url), pool_size=POOL_SIZE, max_overflow=0
+    )
+    yield async_sessionmaker(booking_engine, class_=AsyncSession, expire_on_commit=False)
+    await booking_engine.dispose()
+
+
+async def book(
+    session_factory: async_sessionmaker[AsyncSession],
+    patient_id: int,
+    request: AppointmentCreate | AppointmentSeriesCreate,
+) -> str:
+    async with session_factory() as db:
+        try:
+            if isinstance(request, AppointmentSeriesCreate):
+                await appointment_service.create_appointment_series(db, patient_id, request)
+            else:
+                await appointment_service.create_appointment(db, patient_id, request)
+        except ConflictException:
+            await db.rollback()
+            return "conflict"
+        return "created"
+
+
+def one_hour_at(professional_id: int, start: datetime) -> AppointmentCreate:
+    return AppointmentCreate(
+        professional_id=professional_id, start_time=start, end_time=start + timedelta(hours=1)
+    )
+
+
+@pytest.fixture
+async def booking_window(session_factory):
+    """Profissionais, pacientes e o início do primeiro dia; limpa a janela antes e depois."""
+    async with session_factory() as db:
+        professional_ids = list(
+            (
+                await db.execute(
+                    select(ProfessionalProfile.id)
+                    .order_by(ProfessionalProfile.id)
+                    .limit(PROFESSIONALS)
+                )
+            ).scalars()
+        )
+        patient_ids = list(
+            (
+                await db.execute(
+                    select(User.id).where(User.role == Role.PATIENT).order_by(User.id).limit(CALLS)
+                )
+            ).scalars()
+        )
+    if len(professional_ids) < 2 or not patient_ids:
+        pytest.skip("Banco sem profissionais ou pacientes (rode scripts/seed_db.py)")
+
+    target = date.today() + timedelta(days=400)  # noqa: DTZ011
+    day_start = datetime.combine(target, datetime.min.time()).replace(hour=8)
+    window = (
+        Appointment.professional_id.in_(professional_ids),
+        Appointment.start_time >= day_start,
+        Appointment.start_time < day_start + timedelta(days=DAYS + SERIES_INTERVAL_DAYS),
+    )
+
+    async def clear() -> None:
+        async with session_factory() as db:
+            await db.execute(delete(Appointment).where(*window))
+            await db.commit()
+
+    await clear()
+    yield session_factory, professional_ids, patient_ids, day_start, window
+    await clear()
+
+
+async def test_concurrent_bookings_never_overlap(booking_window):
+    session_factory, professional_ids, patient_ids, day_start, window = booking_window
+    rng = random.Random(42)
+
+    requests: list[tuple[int, AppointmentCreate | AppointmentSeriesCreate]] = []
+    for i in range(CALLS):
+        start = day_start + timedelta(days=rng.randrange(DAYS), minutes=30 * rng.randrange(STARTS))
+        request = one_hour_at(rng.choice(professional_ids), start)
+        if i % 2:
+            request = AppointmentSeriesCreate(
+                **request.model_dump(exclude_unset=True),
+                occurrences=SERIES_OCCURRENCES,
+                interval_days=SERIES_INTERVAL_DAYS,
+                skip_conflicts=rng.random() < 0.5,
+            )
+        requests.append((patient_ids[i % len(patient_ids)], request))
+
+    results = await asyncio.gather(
+        *(book(session_factory, patient_id, request) for patient_id, request in requests)
+    )
+
+    assert "created" in results
+    async with session_factory() as db:
+        other = aliased(Appointment)
+        overlaps = (
+            await db.execute(
+                select(Appointment.id, other.id)
+                .join(
+                    other,
+                    (other.professional_id == Appointment.professional_id)
+                    & (other.id > Appointment.id)
+                    & (other.start_time < Appointment.end_time)
+                    & (other.end_time > Appointment.start_time)
+                    & (other.status != AppointmentStatus.CANCELLED),
+                )
+                .where(*window, Appointment.status != AppointmentStatus.CANCELLED)
+            )
+        ).all()
+    assert overlaps == []
+
+
+async def test_lock_does_not_block_other_professionals_or_days(booking_window):
+    session_factory, professional_ids, patient_ids, day_start, _ = booking_window
+    busy, other = professional_ids[:2]
+
+    # Uma transação segura a agenda de ``busy`` no primeiro dia até o fim do teste
+    async with session_factory() as holder:
+        await booking_coordinator.lock(
+            holder, professional_id=busy, windows=[(day_start, day_start + timedelta(hours=1))]
+        )
+        other_professional = book(session_factory, patient_ids[0], one_hour_at(other, day_start))
+        other_day = book(
+            session_factory, patient_ids[0], one_hour_at(busy, day_start + timedelta(days=1))
+        )
+        results = await asyncio.wait_for(asyncio.gather(other_professional, other_day), 10)
+        await holder.rollback()
+
+    assert results == ["created", "created"]
@@ -0,0 +1,85 @@
+"""Nenhuma rota segura uma conexão do pool enquanto a resposta é enviada.
+
+Com ``SessionRoute`` as sessões da requisição são finalizadas assim que o endpoint
+retorna, antes da serialização. Cada caso faz a requisição direto no app ASGI e,
+no ``http.response.start``, confere ``pool.checkedout()``: qualquer conexão ainda
+emprestada ali falha o teste. ``scripts/benchmarks/connection_hold.py`` mede, além
+disso, quanto de cada requisição a conexão fica fora do pool.
+"""
+
+from datetime import date, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.main import app
+from app.models.professional import ProfessionalProfile
+
+CREDENTIALS = {"email": "joao@example.com", "password": "senha123"}
+TARGET_DATE = date.today() + timedelta(days=7)  # noqa: DTZ011
+
+ROUTES = [
+    ("POST", "/api/auth/login", {"data": CREDENTIALS}),
+    ("GET", "/api/professionals/?limit=20", {}),
+    ("GET", "/api/professionals/search?limit=20", {}),
+    ("GET", "/api/professionals/facets", {}),
+    ("GET", "/api/professionals/{pid}", {}),
+    ("GET", f"/api/professionals/{{pid}}/available-slots?target_date={TARGET_DATE}", {}),
+    ("GET", "/api/professionals/{pid}/reviews", {}),
+    ("GET", "/api/professionals/{pid}/reviews/stats", {}),
+    ("GET", "/api/users/me", {}),
+    ("GET", "/api/appointments/my", {}),
+    ("GET", "/api/appointments/my/calendar.ics", {}),
+    ("GET", "/api/reviews/my", {}),
+    ("PUT", "/api/users/me", {"json": {}}),
+]
+
+
+@pytest.fixture
+async def probed_client(engine):
+    """Cliente autenticado e a lista de ``checkedout()`` no início de cada resposta."""
+    held_at_response: list[int] = []
+
+    async def probe(scope, receive, send) -> None:
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                held_at_response.append(engine.pool.checkedout())
+            await send(message)
+
+        await app(scope, receive, send_wrapper)
+
+    transport = httpx.ASGITransport(app=probe)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        login = await client.post("/api/auth/login", data=CREDENTIALS)
+        if login.status_code != 200:
+            pytest.skip("Conta de teste ausente (rode scripts/seed_db.py)")
+        client.headers["Authorization"] = f"Bearer {login.json()['token']}"
+        held_at_response.clear()
+        yield client, held_at_response
+
+
+@pytest.fixture
+async def professional_id(engine) -> int:
+    async with AsyncSessionLocal() as db:
+        profile_id = await db.scalar(
+            select(ProfessionalProfile.id).order_by(ProfessionalProfile.id).limit(1)
+        )
+    if profile_id is None:
+        pytest.skip("Banco sem profissionais (rode scripts/seed_db.py)")
+    return profile_id
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "kwargs"), ROUTES, ids=[f"{m} {p.split('?')[0]}" for m, p, _ in ROUTES]
+)
+async def test_connection_released_before_response(
+    probed_client, professional_id, method, path, kwargs
+):
+    client, held_at_response = probed_client
+
+    response = await client.request(method, path.format(pid=professional_id), **kwargs)
+
+    assert response.is_success, response.text
+    assert held_at_response == [0], "connection still checked out when the response started"